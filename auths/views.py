@@ -30,24 +30,15 @@ def _redirect_based_on_role(custom_user):
 
 def _check_courier_approval(request, custom_user):
     """Helper function to check if a courier's upgrade request is approved.
-    Returns True if the user is approved or not a courier, False otherwise."""
-    if custom_user.role == "courier":
-        try:
-            upgrade_request = UpgradeRequest.objects.get(
-                user=custom_user, target_role="courier"
-            )
-            if not upgrade_request.approved:
-                messages.info(
-                    request,
-                    "Your courier application is still pending approval. Please check back later.",
-                )
-                return False
-        except UpgradeRequest.DoesNotExist:
-            messages.warning(
-                request,
-                "Somehow, you are a courier but don't have an upgrade request. Find your nearest developer.",
-            )
-            return False
+    Returns True if the user is approved or not a courier, False otherwise.
+    Approval is recorded on the user when the request is approved, so no extra query is needed.
+    """
+    if custom_user.role == "courier" and custom_user.approved_at is None:
+        messages.info(
+            request,
+            "Your courier application is still pending approval. Please check back later.",
+        )
+        return False
     return True
 
 
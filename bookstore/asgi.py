@@ -3,6 +3,11 @@ ASGI config for bookstore project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the project through this module (for example with ``uvicorn
+bookstore.asgi:application``) to enable the couriers' live deliveries feed,
+which holds its connections open on the event loop. The feed's publish/subscribe
+broker is in-process, so run a single worker process.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
@@ -0,0 +1,52 @@
+"""
+Builds the ``CACHES`` setting from a cache URL.
+
+Supported URLs::
+
+    redis://cache.internal:6379/0             shared Redis cache (use rediss:// for TLS)
+    file:///var/tmp/bookstore-cache           cache shared by workers on one host
+    locmem://                                 per-process memory, for development
+    dummy://                                  no caching
+
+Workers only share cached pages, fragments and counts through Redis or a file
+cache, so use one of those wherever more than one worker process serves requests.
+"""
+
+from urllib.parse import unquote, urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+
+KEY_PREFIX = "bookstore"
+
+
+def cache_from_url(url):
+    """
+    Returns a ``CACHES`` entry for a cache URL.
+
+    :param url: The cache URL.
+    :type url: str
+    :return: The cache configuration.
+    :rtype: dict
+    :raises ImproperlyConfigured: If the URL scheme is not supported.
+    """
+    parsed = urlsplit(url)
+    if parsed.scheme in ("redis", "rediss"):
+        return {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": url,
+            "KEY_PREFIX": KEY_PREFIX,
+        }
+    if parsed.scheme == "file":
+        return {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": unquote(parsed.path),
+            "KEY_PREFIX": KEY_PREFIX,
+        }
+    if parsed.scheme == "locmem":
+        return {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": parsed.netloc,
+        }
+    if parsed.scheme == "dummy":
+        return {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    raise ImproperlyConfigured(f"Unsupported cache URL scheme: {parsed.scheme!r}")
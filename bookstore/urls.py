@@ -20,12 +20,16 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.views import metrics
+
 urlpatterns = [
     path("", include("auths.urls")),
     path("admin/", admin.site.urls, name="admin"),
     path("buyer/", include("buyer.urls")),
     path("seller/", include("seller.urls")),
     path("courier/", include("courier.urls")),
+    path("portal-admin/", include("portal_admin.urls")),
+    path("metrics/", metrics, name="metrics"),
 ]
 
 if settings.DEBUG:
@@ -1,6 +1,8 @@
 from django.contrib.auth.decorators import login_required
-from django.db.models import Avg
+from django.db.models import Avg, Count, Max, OuterRef, Subquery
 from django.shortcuts import get_object_or_404, render, redirect
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 
 from core.models import (
     BookListing,
@@ -9,16 +11,62 @@ from core.models import (
     User,
     Review,
 )
-from core.utils.decorators import allowed_roles
+from core.utils.conditional import page_validators
+from core.utils.decorators import allowed_roles, read_from_replica
+
+
+def _book_state(request, book_id):
+    """
+    Returns the version and last change of a book details page in one query.
+
+    The page shows the listing, its shop's reviews and whether the book is in the
+    user's cart, so the version combines the listing's ``updated_at``, the shop's
+    review count and newest review, and the cart's version counter. The cart has
+    no modification time, so no ``Last-Modified`` is given: a client sending only
+    ``If-Modified-Since`` would otherwise get a stale page after changing its cart.
+
+    :param request: The HTTP request object.
+    :type request: django.http.HttpRequest
+    :param book_id: The unique identifier of the book listing.
+    :type book_id: int
+    :return: The page version and ``None`` for its last change, or ``None`` if
+        the book does not exist.
+    :rtype: tuple | None
+    """
+    shop_reviews = Review.objects.filter(shop=OuterRef("shop")).values("shop")
+    book = (
+        BookListing.objects.filter(id=book_id)
+        .annotate(
+            review_count=Subquery(
+                shop_reviews.annotate(count=Count("id")).values("count")
+            ),
+            latest_review=Subquery(
+                shop_reviews.annotate(latest=Max("created_at")).values("latest")
+            ),
+            cart_version=Subquery(
+                Cart.objects.filter(user=request.custom_user).values("version")[:1]
+            ),
+        )
+        .values("updated_at", "review_count", "latest_review", "cart_version")
+        .first()
+    )
+    if book is None:
+        return None
+    version = ":".join(str(value) for value in book.values())
+    return version, None
 
 
 @login_required
 @allowed_roles(["buyer", "seller"])
+@read_from_replica
+@cache_control(private=True, no_cache=True)
+@condition(**page_validators(_book_state))
 def book_details_page(request, book_id):
     """
     View function to display the book details page. This function manages the display of book
     details, allows users to add the book to their shopping cart, calculates the shop's average
     rating based on user reviews, and prepares data for rendering in the template.
+    Reloads of an unchanged page are answered with ``304 Not Modified``.
 
     :param request: The HTTP request object.
     :type request: django.http.HttpRequest
@@ -36,7 +84,7 @@ def book_details_page(request, book_id):
     book_in_cart = CartItem.objects.filter(cart=cart, book_listing=book).exists()
 
     # Get all reviews for the shop selling this book
-    shop_reviews = Review.objects.filter(shop=book.shop)
+    shop_reviews = Review.objects.filter(shop=book.shop).select_related("user")
 
     # Calculate average rating for the shop
     shop_rating_value = shop_reviews.aggregate(Avg("rating"))["rating__avg"]
@@ -4,6 +4,7 @@ from django.shortcuts import render, redirect, get_object_or_404
 from core.models.cart import Cart
 from core.models.cart_item import CartItem
 from core.utils.decorators import allowed_roles
+from core.utils.pricing import price_cart
 
 
 @login_required
@@ -16,7 +17,9 @@ def cart_page(request):
         - Removes items from the cart if they have been bought.
     **Context Variables:**
         - ``cart_items``: A queryset of the user's cart items.
-        - ``total_price``: The total cost of all items in the cart.
+        - ``subtotal``: The cost of all items in the cart before tax.
+        - ``tax_amount``: The tax charged on the subtotal.
+        - ``total_price``: The total cost of all items in the cart, including tax.
     """
 
     # Get the logged-in user by email
@@ -37,8 +40,8 @@ def cart_page(request):
     if not cart_items.exists():
         cart_items = []
 
-    # Calculate total price
-    total_price = sum(item.book_listing.price * item.quantity for item in cart_items)
+    # Price the cart in one aggregate query (cached per cart version)
+    quote = price_cart(cart)
 
     if request.method == "POST":
         item_id = request.POST.get("item_id")
@@ -56,6 +59,8 @@ def cart_page(request):
 
     context = {
         "cart_items": cart_items,
-        "total_price": total_price,
+        "subtotal": quote.subtotal,
+        "tax_amount": quote.tax_amount,
+        "total_price": quote.total_price,
     }
     return render(request, "buyer/cart.html", context)
@@ -3,11 +3,11 @@ Checkout view for the buyer application.
 """
 
 import re
-from decimal import Decimal
 import uuid
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.shortcuts import render, redirect
 from django.urls import reverse
 
@@ -15,8 +15,11 @@ from core.models.cart import Cart
 from core.models.cart_item import CartItem
 from core.models.order import Order
 from core.models.order_item import OrderItem
+from core.models.platform_monthly_sales import PlatformMonthlySales
+from core.models.shop_daily_sales import ShopDailySales
 from core.models.user import User
 from core.utils.decorators import allowed_roles
+from core.utils.pricing import price_cart
 
 
 @login_required
@@ -45,15 +48,13 @@ def checkout_page(request):
         cart = None
         cart_items = []
 
-    # Calculate subtotal
-    subtotal = Decimal("0.00")
-    for item in cart_items:
-        subtotal += item.book_listing.price * item.quantity
-
-    # We define a simple 6% tax rate to match the bootstrap template
-    tax_rate = Decimal("0.06")
-    tax_amount = (subtotal * tax_rate).quantize(Decimal("0.01"))
-    total_price = (subtotal + tax_amount).quantize(Decimal("0.01"))
+    # Subtotal, 6% tax and total come from the shared pricing engine
+    quote = price_cart(cart)
+    subtotal, tax_amount, total_price = (
+        quote.subtotal,
+        quote.tax_amount,
+        quote.total_price,
+    )
 
     if request.method == "POST":
         # Verify the form token
@@ -131,42 +132,55 @@ def checkout_page(request):
         if not updated_cart_items:
             return redirect(reverse("buyer-checkout"))
 
-        # If any book is already marked as bought, alert the user and stop checkout.
-        for item in updated_cart_items:
-            if item.book_listing.bought:
-                messages.error(
-                    request,
-                    "One or more books in your cart have already been purchased by another user. Please review your cart.",
+        # Place the order in one transaction, so a failure part way through leaves
+        # no half-placed order, sold listings or drifted sales rollups behind
+        with transaction.atomic():
+            # If any book is already marked as bought, alert the user and stop checkout.
+            for item in updated_cart_items:
+                if item.book_listing.bought:
+                    messages.error(
+                        request,
+                        "One or more books in your cart have already been purchased by another user. Please review your cart.",
+                    )
+                    return redirect(reverse("buyer-checkout"))
+
+            # Re-price without the cache so the stored totals match what is being bought
+            placed_quote = price_cart(cart, use_cache=False)
+
+            # Create a new order with the address details included
+            order = Order.objects.create(
+                user=User.objects.get(email=current_user.email),
+                status="pending",
+                subtotal=placed_quote.subtotal,
+                tax_amount=placed_quote.tax_amount,
+                total_price=placed_quote.total_price,
+                address=address,
+                city=city,
+                state=state,
+                postal_code=postal_code,
+                country=country,
+            )
+
+            ## Move cart items to order items and mark books as bought (for harris ocd)
+            for item in updated_cart_items:
+                OrderItem.objects.create(
+                    order=order,
+                    book_listing=item.book_listing,
+                    quantity=item.quantity,
+                    purchase_price=item.book_listing.price,
                 )
-                return redirect(reverse("buyer-checkout"))
-
-        # Create a new order with the address details included
-        order = Order.objects.create(
-            user=User.objects.get(email=current_user.email),
-            status="pending",
-            total_price=total_price,
-            address=address,
-            city=city,
-            state=state,
-            postal_code=postal_code,
-            country=country,
-        )
 
-        ## Move cart items to order items and mark books as bought (for harris ocd)
-        for item in updated_cart_items:
-            OrderItem.objects.create(
-                order=order,
-                book_listing=item.book_listing,
-                quantity=item.quantity,
-                purchase_price=item.book_listing.price,
-            )
+                # Mark book as bought
+                item.book_listing.bought = True
+                item.book_listing.save()
 
-            # Mark book as bought
-            item.book_listing.bought = True
-            item.book_listing.save()
+            # Count the new order in each shop's daily and the platform's monthly rollups
+            ShopDailySales.record_order_placed(order)
+            PlatformMonthlySales.record_order_placed(order)
 
-        # Clear the cart
-        updated_cart_items.delete()
+            # Clear the cart
+            updated_cart_items.delete()
+            Cart.bump_versions(pk=cart.pk)
 
         # Redirect to buyer_orders page
         return redirect(reverse("buyer-orders"))
@@ -1,18 +1,63 @@
 from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Max
 from django.shortcuts import render
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 
 from core.models import User
 from core.models.book_listing import BookListing
-from core.utils.decorators import allowed_roles
+from core.utils.conditional import page_validators
+from core.utils.decorators import allowed_roles, read_from_replica
+
+
+def _available_books(request):
+    """
+    Returns the unsold listings matching the ``q`` search parameter.
+
+    :param request: The HTTP request object.
+    :type request: django.http.HttpRequest
+    :return: The listings shown on the landing page.
+    :rtype: django.db.models.QuerySet
+    """
+    books = BookListing.objects.filter(bought=False)
+    search_query = request.GET.get("q", "").strip()  # Get search term from URL
+    if search_query:
+        books = books.filter(title__icontains=search_query)
+    return books
+
+
+def _catalog_state(request):
+    """
+    Returns the version of the listings on the landing page.
+
+    Every change to a listing (including its shop being renamed) moves its
+    ``updated_at``, and listings that are bought or deleted leave the page and
+    change the count, so one aggregate query tells whether the page has changed.
+    No ``Last-Modified`` is given: a listing leaving the page does not move the
+    newest ``updated_at`` of those still on it.
+
+    :param request: The HTTP request object.
+    :type request: django.http.HttpRequest
+    :return: The catalog version and ``None`` for its last change.
+    :rtype: tuple
+    """
+    catalog = _available_books(request).aggregate(
+        latest=Max("updated_at"), count=Count("id")
+    )
+    return f"{catalog['count']}:{catalog['latest']}", None
 
 
 @login_required
 @allowed_roles(["buyer", "seller"])
+@read_from_replica
+@cache_control(private=True, no_cache=True)
+@condition(**page_validators(_catalog_state))
 def landing_page(request):
     """
     Renders the Buyer Landing Page with all available books.
 
     This view retrieves all books that are not bought and displays them in a grid format.
+    Reloads of an unchanged catalog are answered with ``304 Not Modified``.
 
     :param request: The HTTP request object.
     :type request: django.http.HttpRequest
@@ -24,12 +69,7 @@ def landing_page(request):
 
     authenticated_user = User.objects.get(email=current_user.email)
 
-    search_query = request.GET.get("q", "").strip()  # Get search term from URL
-
     # Filter books to only show those that are NOT bought
-    if search_query:
-        books = BookListing.objects.filter(title__icontains=search_query, bought=False)
-    else:
-        books = BookListing.objects.filter(bought=False)
+    books = _available_books(request).select_related("shop")
 
     return render(request, "buyer/landing.html", {"books": books})
@@ -2,13 +2,13 @@
 Order details view for the buyer application.
 """
 
-from decimal import Decimal
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404
 
 from core.models.order import Order
 from core.models.order_item import OrderItem
-from core.utils.decorators import allowed_roles
+from core.utils.decorators import allowed_roles, read_from_replica
+from core.utils.pricing import price_order
 from core.models.review import Review
 from core.models.shop import Shop
 from core.models.user import User
@@ -16,6 +16,7 @@ from core.models.user import User
 
 @login_required
 @allowed_roles(["buyer", "seller"])
+@read_from_replica
 def order_details_page(request, order_id):
     """
     Displays detailed information about a specific order, including its items
@@ -33,10 +34,8 @@ def order_details_page(request, order_id):
 
     items = OrderItem.objects.filter(order=order)
 
-    # Subtotal, tax, etc.
-    subtotal = sum(item.purchase_price * item.quantity for item in items)
-    tax_rate = Decimal("0.06")
-    tax_amount = (subtotal * tax_rate).quantize(Decimal("0.01"))
+    # Subtotal and tax were stored on the order when it was placed
+    quote = price_order(order)
 
     # Distinct shops in this order
     shops_qs = Shop.objects.filter(book_listings__order_items__order=order).distinct()
@@ -58,7 +57,7 @@ def order_details_page(request, order_id):
         "items": items,
         "shops_with_reviews": shops_with_reviews,
         "rating_range": [1, 2, 3, 4, 5],
-        "subtotal": subtotal,
-        "tax_amount": tax_amount,
+        "subtotal": quote.subtotal,
+        "tax_amount": quote.tax_amount,
     }
     return render(request, "buyer/order_details.html", context)
@@ -7,7 +7,8 @@ from django.shortcuts import render, get_object_or_404
 import uuid
 
 from core.models.order import Order
-from core.utils.decorators import allowed_roles
+from core.models.order_item import OrderItem
+from core.utils.decorators import allowed_roles, read_from_replica
 from core.models.review import Review
 from core.models.shop import Shop
 from core.models.user import User
@@ -15,42 +16,56 @@ from core.models.user import User
 
 @login_required
 @allowed_roles(["buyer", "seller"])
+@read_from_replica
 def orders_page(request):
+    """
+    Lists the user's orders, newest first, with a review form for each seller of a
+    completed order who has not been reviewed yet.
+
+    The shops of every order and the shops already reviewed are loaded up front,
+    so the page runs the same number of queries however many orders there are.
+
+    :param request: The HTTP request object.
+    :type request: django.http.HttpRequest
+    :return: Rendered orders page.
+    :rtype: django.http.HttpResponse
+    """
     current_user = get_object_or_404(User, email=request.user.email)
-    user_orders = Order.objects.filter(user=current_user).order_by("-placed_at")
+    user_orders = list(Order.objects.filter(user=current_user).order_by("-placed_at"))
+
+    order_shop_ids = {}
+    for order_id, shop_id in (
+        OrderItem.objects.filter(order__user=current_user)
+        .values_list("order_id", "book_listing__shop_id")
+        .distinct()
+    ):
+        order_shop_ids.setdefault(order_id, set()).add(shop_id)
+    shops = Shop.objects.in_bulk(
+        set().union(*order_shop_ids.values()) if order_shop_ids else ()
+    )
+    reviewed_shop_ids = set(
+        Review.objects.filter(user=current_user, shop__in=shops).values_list(
+            "shop_id", flat=True
+        )
+    )
+
+    # Generate one token for each unreviewed shop
+    review_tokens = {}
+    for shop_id in shops.keys() - reviewed_shop_ids:
+        token = str(uuid.uuid4())
+        request.session[f"review_token_{shop_id}"] = token
+        review_tokens[shop_id] = token
 
     for order in user_orders:
-        # Gather distinct shops for that order
-        shops_qs = Shop.objects.filter(
-            book_listings__order_items__order=order
-        ).distinct()
-
-        seller_data = []
-        for shop in shops_qs:
-            # Only check by (user, shop)
-            already_reviewed = Review.objects.filter(
-                user=current_user, shop=shop
-            ).exists()
-
-            # Generate a token for each unreviewed shop
-            if not already_reviewed:
-                token = str(uuid.uuid4())
-                request.session[f"review_token_{shop.id}"] = token
-                review_token = token
-            else:
-                review_token = None
-
-            seller_data.append(
-                {
-                    "shop": shop,
-                    "already_reviewed": already_reviewed,
-                    "review_token": review_token,
-                }
-            )
-
-        total_sellers = len(seller_data)
-        reviewed_count = sum(s["already_reviewed"] for s in seller_data)
-        order.all_sellers_reviewed = reviewed_count == total_sellers
+        seller_data = [
+            {
+                "shop": shops[shop_id],
+                "already_reviewed": shop_id in reviewed_shop_ids,
+                "review_token": review_tokens.get(shop_id),
+            }
+            for shop_id in sorted(order_shop_ids.get(order.id, ()))
+        ]
+        order.all_sellers_reviewed = all(s["already_reviewed"] for s in seller_data)
         order.seller_info = seller_data
 
     return render(request, "buyer/orders.html", {"orders": user_orders})
@@ -5,7 +5,6 @@ from django.shortcuts import render, reverse
 from core.models.upgrade_request import UpgradeRequest
 from core.models.user import User as CustomUser
 from core.utils.decorators import allowed_roles
-from core.models.shop import Shop
 
 
 def _handle_seller_upgrade_request(request, custom_user):
@@ -34,35 +33,23 @@ def _handle_seller_upgrade_request(request, custom_user):
 @login_required
 @allowed_roles(["buyer"])
 def upgrade_to_seller(request):
+    """
+    Shows the seller application page and handles new applications.
+
+    Approved applications are provisioned by the admin when they approve them,
+    so a buyer reaching this page either has a pending request or none at all.
+    """
     custom_user = CustomUser.objects.get(email=request.user.email)
 
     if request.method == "GET":
-        try:
-            upgrade_request = UpgradeRequest.objects.get(
-                user=custom_user, target_role="seller"
+        if UpgradeRequest.objects.filter(
+            user=custom_user, target_role="seller"
+        ).exists():
+            messages.info(
+                request,
+                "You already have a pending request to become a seller. Please wait for admin approval.",
             )
-            if upgrade_request.approved:
-                # Update user role to seller if request is approved
-                custom_user.role = "seller"
-                custom_user.save()
-
-                # Create a default shop for the new seller
-                shop_name = f"{custom_user.name}'s Shop"
-                Shop.objects.create(name=shop_name, user=custom_user)
-
-                messages.success(
-                    request,
-                    "Congratulations! Your seller application has been approved. You are now a seller.",
-                )
-                return redirect(reverse("seller-dashboard"))
-            else:
-                messages.info(
-                    request,
-                    "You already have a pending request to become a seller. Please wait for admin approval.",
-                )
-                return redirect(reverse("buyer-landing"))
-        except UpgradeRequest.DoesNotExist:
-            pass
+            return redirect(reverse("buyer-landing"))
 
     if request.method == "POST":
         _handle_seller_upgrade_request(request, custom_user)
@@ -1,49 +1,232 @@
 from django.contrib import admin
+from django.contrib.admin.utils import get_fields_from_path, lookup_spawns_duplicates
+from django.db.models import Count, IntegerField, Q
 from django.utils import timezone
 from admincharts.admin import AdminChartMixin
 from admincharts.utils import months_between_dates
-from decimal import Decimal
 from core.models import *
+from core.utils.pagination import CachedCountPaginator
 
 # Change admin site title
 admin.site.site_header = "booklab administration"
 admin.site.site_title = "booklab administration"
 admin.site.index_title = "booklab administration"
 
-admin.site.register(UpgradeRequest)
-admin.site.register(User)
-admin.site.register(OrderAssignment)
-admin.site.register(Review)
-admin.site.register(Shop)
-admin.site.register(Cart)
-admin.site.register(CartItem)
-admin.site.register(DeliveryIssue)
+admin.site.register(PlatformMonthlySales)
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Base admin for tables that grow with traffic.
+
+    Skips the extra unfiltered ``COUNT(*)`` the changelist runs by default and
+    caches or estimates the paginator's count, so changelists stay fast with
+    millions of rows. Subclasses should also list the relations their
+    ``__str__`` and ``list_display`` follow in ``list_select_related``, and use
+    ``raw_id_fields`` so change forms do not load every related row into a
+    select box.
+
+    Search also avoids the default ``iexact``/``istartswith`` matches, which
+    cast integer keys to text and lower-case columns so no index can serve
+    them. In ``search_fields``, ``=field`` is an exact match, against an integer
+    for integer fields (a term that is not a number matches none of those), and
+    ``^field`` is a case-sensitive prefix match. Unprefixed fields keep the
+    default ``icontains`` and should only be used on small tables.
+    """
+
+    show_full_result_count = False
+    paginator = CachedCountPaginator
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        search_fields = self.get_search_fields(request)
+        if not term or not search_fields:
+            return queryset, False
+
+        condition = Q()
+        may_have_duplicates = False
+        for search_field in search_fields:
+            name = search_field.lstrip("=^@")
+            if search_field.startswith("="):
+                field = get_fields_from_path(self.model, name)[-1]
+                if isinstance(field, IntegerField):
+                    if not (term.isascii() and term.isdigit()) or int(term) >= 2**63:
+                        continue
+                    lookup = {name: int(term)}
+                else:
+                    lookup = {f"{name}__exact": term}
+            elif search_field.startswith("^"):
+                # A case-sensitive LIKE 'term%' can use the column's index
+                lookup = {f"{name}__startswith": term}
+            else:
+                lookup = {f"{name}__icontains": term}
+            condition |= Q(**lookup)
+            may_have_duplicates |= lookup_spawns_duplicates(self.opts, name)
+
+        if not condition:
+            return queryset.none(), False
+        return queryset.filter(condition), may_have_duplicates
+
+
+@admin.register(User)
+class UserAdmin(LargeTableAdmin):
+    list_display = ("email", "name", "role", "approved_at")
+    list_filter = ("role",)
+    search_fields = ("=email",)
+
+
+@admin.register(Shop)
+class ShopAdmin(LargeTableAdmin):
+    list_display = ("name", "user")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    search_fields = ("=user__email",)
+
+
+@admin.register(UpgradeRequest)
+class UpgradeRequestAdmin(LargeTableAdmin):
+    list_display = ("user", "target_role", "requested_at", "approved")
+    list_filter = ("approved", "target_role")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    search_fields = ("=user__email",)
+    actions = ["approve_requests"]
+
+    @admin.action(description="Approve selected upgrade requests")
+    def approve_requests(self, request, queryset):
+        approved = UpgradeRequest.approve(queryset)
+        self.message_user(request, f"Approved {approved} upgrade request(s).")
+
+    def save_model(self, request, obj, form, change):
+        # Ticking "approved" on the change form provisions the role like the action does
+        approving = obj.approved and "approved" in form.changed_data
+        if approving:
+            obj.approved = False
+        super().save_model(request, obj, form, change)
+        if approving:
+            UpgradeRequest.approve(UpgradeRequest.objects.filter(pk=obj.pk))
+            obj.approved = True
+
+
+@admin.register(Cart)
+class CartAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "version")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    search_fields = ("=id", "=user__email")
+
+
+@admin.register(CartItem)
+class CartItemAdmin(LargeTableAdmin):
+    list_display = ("id", "cart", "book_listing", "quantity")
+    list_select_related = ("cart__user", "book_listing")
+    raw_id_fields = ("cart", "book_listing")
+    search_fields = ("=cart__id", "=book_listing__id")
+
+
+@admin.register(OrderAssignment)
+class OrderAssignmentAdmin(LargeTableAdmin):
+    list_display = ("order", "courier", "assigned_at", "updated_at")
+    list_select_related = ("order__user", "courier")
+    raw_id_fields = ("order", "courier")
+    search_fields = ("=order__id", "=courier__email")
+
+
+@admin.register(DeliveryIssue)
+class DeliveryIssueAdmin(LargeTableAdmin):
+    list_display = ("__str__", "order_assignment")
+    list_select_related = ("order_assignment__order__user", "order_assignment__courier")
+    raw_id_fields = ("order_assignment",)
+    search_fields = ("=order_assignment__order__id",)
+
+
+@admin.register(Review)
+class ReviewAdmin(LargeTableAdmin):
+    list_display = ("shop", "user", "rating", "created_at")
+    list_filter = ("rating",)
+    list_select_related = ("shop", "user")
+    raw_id_fields = ("shop", "user")
+    search_fields = ("=user__email",)
+
+
+@admin.register(DeliveryBatch)
+class DeliveryBatchAdmin(LargeTableAdmin):
+    list_display = ("__str__", "courier", "order_count", "total_value", "created_at")
+    list_filter = ("status",)
+    list_select_related = ("courier",)
+    raw_id_fields = ("courier",)
+    search_fields = ("=id", "postal_prefix")
+
+
+@admin.register(ShopDailySales)
+class ShopDailySalesAdmin(LargeTableAdmin):
+    list_display = ("shop", "date", "orders", "pending_orders", "items_sold", "revenue")
+    list_select_related = ("shop",)
+    raw_id_fields = ("shop",)
+    search_fields = ("=shop__id",)
+
+
+def monthly_series(rows, value_key):
+    """
+    Spreads per-month aggregate rows over every month up to now, filling gaps with zero.
+
+    :param rows: Rows ordered by month, each with a ``month`` date and a value.
+    :type rows: list[dict]
+    :param value_key: The key holding each row's value.
+    :type value_key: str
+    :return: The chart labels and the matching values.
+    :rtype: tuple[list[str], list]
+    """
+    by_month = {(row["month"].year, row["month"].month): row[value_key] for row in rows}
+    labels = []
+    values = []
+    for month in months_between_dates(rows[0]["month"], timezone.localdate()):
+        labels.append(month.strftime("%b %Y"))
+        values.append(by_month.get((month.year, month.month), 0))
+    return labels, values
+
+
+class AggregateChartMixin(AdminChartMixin):
+    """
+    Charts the whole filtered changelist rather than just the current page.
+
+    The chart data is computed with grouped aggregate queries, so this stays
+    cheap however many rows match.
+    """
+
+    def get_list_chart_queryset(self, changelist):
+        return changelist.queryset
+
+
+def monthly_sales_rows(*fields):
+    """
+    Reads the platform's monthly sales rollup, oldest month first.
+
+    :param fields: The rollup columns to read besides ``month``.
+    :type fields: str
+    :return: One row per month that has any orders.
+    :rtype: list[dict]
+    """
+    return list(PlatformMonthlySales.objects.order_by("month").values("month", *fields))
 
 
 @admin.register(Order)
-class OrderAdmin(AdminChartMixin, admin.ModelAdmin):
+class OrderAdmin(AdminChartMixin, LargeTableAdmin):
     list_chart_type = "line"
     list_chart_options = {"aspectRatio": 6}
+    list_display = ("id", "user", "status", "total_price", "placed_at")
+    list_filter = ("status",)
+    list_select_related = ("user",)
+    raw_id_fields = ("user", "delivery_batch")
+    search_fields = ("=id", "=user__email")
 
     def get_list_chart_data(self, queryset):
-        if not queryset:
+        # Read from the monthly rollup instead of counting orders
+        rows = monthly_sales_rows("orders")
+        if not rows:
             return {}
 
-        # Get the earliest order date
-        earliest = min(order.placed_at for order in queryset)
-        labels = []
-        order_counts = []
-
-        # Create a label and count for each month between earliest and now
-        for month in months_between_dates(earliest, timezone.now()):
-            labels.append(month.strftime("%b %Y"))
-            monthly_count = sum(
-                1
-                for order in queryset
-                if order.placed_at.year == month.year
-                and order.placed_at.month == month.month
-            )
-            order_counts.append(monthly_count)
+        labels, order_counts = monthly_series(rows, "orders")
 
         return {
             "labels": labels,
@@ -58,28 +241,25 @@ class OrderAdmin(AdminChartMixin, admin.ModelAdmin):
 
 
 @admin.register(OrderItem)
-class OrderItemAdmin(AdminChartMixin, admin.ModelAdmin):
+class OrderItemAdmin(AdminChartMixin, LargeTableAdmin):
     list_chart_type = "bar"
     list_chart_options = {"aspectRatio": 6}
+    list_display = ("__str__", "order", "book_listing", "quantity", "purchase_price")
+    list_select_related = ("order__user", "book_listing")
+    raw_id_fields = ("order", "book_listing")
+    search_fields = ("=order__id", "=book_listing__id")
 
     def get_list_chart_data(self, queryset):
-        if not queryset:
+        # Read from the monthly rollup instead of summing order items
+        rows = monthly_sales_rows("revenue")
+        if not rows:
             return {}
-        # Use the order's placed_at date for aggregation
-        earliest = min(oi.order.placed_at for oi in queryset)
-        labels = []
-        revenue = []
-        for month in months_between_dates(earliest, timezone.now()):
-            labels.append(month.strftime("%b %Y"))
-            monthly_revenue = sum(
-                (
-                    oi.purchase_price * oi.quantity * Decimal("0.20")
-                )  # Taking 20% of the total purchase price
-                for oi in queryset
-                if oi.order.placed_at.year == month.year
-                and oi.order.placed_at.month == month.month
-            )
-            revenue.append(float(monthly_revenue))
+        labels, sales = monthly_series(rows, "revenue")
+        # Taking 20% of the total purchase price
+        revenue = [
+            float(monthly_sales * PlatformMonthlySales.PLATFORM_SHARE)
+            for monthly_sales in sales
+        ]
         return {
             "labels": labels,
             "datasets": [
@@ -93,19 +273,25 @@ class OrderItemAdmin(AdminChartMixin, admin.ModelAdmin):
 
 
 @admin.register(BookListing)
-class BookListingAdmin(AdminChartMixin, admin.ModelAdmin):
+class BookListingAdmin(AggregateChartMixin, LargeTableAdmin):
     list_chart_type = "pie"
     list_chart_options = {"aspectRatio": 6}
+    list_display = ("title", "author", "shop", "condition", "price", "bought")
+    list_filter = ("condition", "bought")
+    list_select_related = ("shop",)
+    raw_id_fields = ("shop",)
+    search_fields = ("=id", "^title")
 
     def get_list_chart_data(self, queryset):
-        if not queryset:
+        rows = list(
+            queryset.values("condition")
+            .annotate(listing_count=Count("id"))
+            .order_by("condition")
+        )
+        if not rows:
             return {}
-        condition_counts = {}
-        for listing in queryset:
-            condition = listing.condition
-            condition_counts[condition] = condition_counts.get(condition, 0) + 1
-        labels = list(condition_counts.keys())
-        counts = list(condition_counts.values())
+        labels = [row["condition"] for row in rows]
+        counts = [row["listing_count"] for row in rows]
         colors = ["#FF6384", "#36A2EB", "#FFCE56", "#4BC0C0", "#9966FF"]
         return {
             "labels": labels,
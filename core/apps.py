@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        from core.utils.metrics import install_query_timer
+        from core.utils.sqlite import configure_sqlite_connection
+
+        # Tune every new SQLite connection with settings.SQLITE_PRAGMAS
+        connection_created.connect(
+            configure_sqlite_connection, dispatch_uid="core_sqlite_pragmas"
+        )
+        # Count and time each request's queries for core.middleware.RequestMetricsMiddleware
+        connection_created.connect(install_query_timer, dispatch_uid="core_query_timer")
@@ -7,6 +7,7 @@ Definitions:
 - ROLE_CHOICES: User roles within the system (e.g., Buyer, Seller).
 - CONDITION_CHOICES: Represents item conditions (e.g., Brand New, Used).
 - STATUS_CHOICES: Indicates process states (e.g., Pending, Completed).
+- BATCH_STATUS_CHOICES: States of a courier delivery batch (e.g., Open, Claimed).
 
 These choices are typically used in Django model fields via the `choices` argument to enforce valid inputs.
 """
@@ -35,4 +36,9 @@ STATUS_CHOICES = [
     ("cancelled", "Cancelled"),
 ]
 
+BATCH_STATUS_CHOICES = [
+    ("open", "Open"),
+    ("claimed", "Claimed"),
+]
+
 RATING_CHOICES = [(i, str(i)) for i in range(1, 6)]  # 1 to 5 rating scaler
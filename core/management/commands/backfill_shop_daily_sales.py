@@ -0,0 +1,95 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Q, Sum
+from django.db.models.functions import TruncDate
+
+from core.models.order_item import OrderItem
+from core.models.shop_daily_sales import ShopDailySales
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the ``ShopDailySales`` rollup from the raw order tables.
+
+    The rollup is normally maintained incrementally as orders are placed and
+    change status. Run this once after deploying the rollup, or whenever it is
+    suspected to have drifted, to recompute it with grouped queries.
+
+    Example::
+
+        python manage.py backfill_shop_daily_sales
+        python manage.py backfill_shop_daily_sales --shop 3 --shop 7
+    """
+
+    help = "Rebuilds the per-shop daily sales rollup used by the seller dashboard."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--shop",
+            type=int,
+            action="append",
+            dest="shop_ids",
+            help="Only rebuild the given shop id. May be repeated.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rollup rows inserted per query.",
+        )
+
+    def handle(self, *args, **options):
+        shop_ids = options["shop_ids"]
+        batch_size = options["batch_size"]
+
+        items = OrderItem.objects.all()
+        rollups = ShopDailySales.objects.all()
+        if shop_ids:
+            items = items.filter(book_listing__shop_id__in=shop_ids)
+            rollups = rollups.filter(shop_id__in=shop_ids)
+
+        completed = Q(order__status="completed")
+        grouped = (
+            items.annotate(day=TruncDate("order__placed_at"))
+            .values("book_listing__shop", "day")
+            .annotate(
+                orders=Count("order", distinct=True),
+                pending_orders=Count(
+                    "order", distinct=True, filter=Q(order__status="pending")
+                ),
+                items_sold=Sum("quantity", filter=completed),
+                revenue=Sum(
+                    F("purchase_price") * F("quantity"),
+                    filter=completed,
+                    output_field=DecimalField(max_digits=12, decimal_places=2),
+                ),
+            )
+            .order_by()
+        )
+
+        with transaction.atomic():
+            rollups.delete()
+            batch = []
+            created = 0
+            for row in grouped.iterator(chunk_size=batch_size):
+                batch.append(
+                    ShopDailySales(
+                        shop_id=row["book_listing__shop"],
+                        date=row["day"],
+                        orders=row["orders"],
+                        pending_orders=row["pending_orders"],
+                        items_sold=row["items_sold"] or 0,
+                        revenue=row["revenue"] or 0,
+                    )
+                )
+                if len(batch) >= batch_size:
+                    ShopDailySales.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+            if batch:
+                ShopDailySales.objects.bulk_create(batch)
+                created += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {created} shop daily sales rows.")
+        )
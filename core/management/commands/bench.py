@@ -0,0 +1,203 @@
+import io
+import json
+import os
+import platform
+import tempfile
+
+import django
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+)
+from django.utils import timezone
+
+from core.utils.bench import (
+    BENCH_PASSWORD,
+    ENDPOINTS,
+    SCALES,
+    BenchData,
+    compare_results,
+    run_endpoint,
+)
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks every buyer, seller, courier and auth endpoint at several data scales.
+
+    For each scale a fresh test database is created next to the project's own,
+    which is never touched, and filled with ``seed_marketplace`` using a fixed
+    seed. Every endpoint in ``core.utils.bench.ENDPOINTS`` is then requested
+    through the Django test client, with ``DEBUG`` off. The report holds the
+    p50/p95/p99 latency, query count, response size and status of each endpoint
+    as JSON, written to standard output or ``--output``, with a summary table on
+    standard error. SQLite test databases are kept on disk rather than in memory,
+    as the real database is.
+
+    With ``--baseline`` the run is compared with an earlier report, and the
+    command fails if an endpoint now errors, runs more queries, or got slower
+    at p95 by more than ``--threshold``.
+
+    Example::
+
+        python manage.py bench --output bench-baseline.json
+        python manage.py bench --baseline bench-baseline.json --threshold 0.25
+        python manage.py bench --scale large --endpoint buyer-landing
+    """
+
+    help = "Benchmarks every endpoint against seeded data and compares with a baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            action="append",
+            dest="scales",
+            choices=SCALES,
+            help="Data scale to run at. May be repeated; defaults to small and medium.",
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpoints",
+            help="Only run endpoints whose URL name contains this. May be repeated.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=20,
+            help="Measured requests per endpoint.",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=2,
+            help="Unmeasured requests sent to each endpoint first.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output", default="-", help="Where to write the JSON report."
+        )
+        parser.add_argument("--baseline", help="A previous report to compare with.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed p95 slowdown against the baseline, as a fraction.",
+        )
+        parser.add_argument(
+            "--min-delta-ms",
+            type=float,
+            default=1.0,
+            help="Slowdowns smaller than this are ignored as noise.",
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1.")
+        baseline = None
+        if options["baseline"]:
+            try:
+                with open(options["baseline"]) as file:
+                    baseline = json.load(file)["scales"]
+            except (OSError, ValueError, KeyError) as exc:
+                raise CommandError(f"Could not read the baseline: {exc}")
+
+        endpoints = [
+            endpoint
+            for endpoint in ENDPOINTS
+            if not options["endpoints"]
+            or any(name in endpoint.url_name for name in options["endpoints"])
+        ]
+        scales = options["scales"] or ["small", "medium"]
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "environment": {
+                "database": connections[DEFAULT_DB_ALIAS].vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+            },
+            "requests": options["requests"],
+            "seed": options["seed"],
+            "scales": {},
+        }
+        setup_test_environment()
+        with override_settings(DEBUG=False):
+            for scale in scales:
+                report["scales"][scale] = self._run_scale(scale, endpoints, options)
+
+        output = json.dumps(report, indent=2) + "\n"
+        if options["output"] == "-":
+            self.stdout.write(output, ending="")
+        else:
+            with open(options["output"], "w") as file:
+                file.write(output)
+            self.stderr.write(f"Wrote the report to {options['output']}.")
+
+        if baseline is not None:
+            regressions = compare_results(
+                report["scales"],
+                baseline,
+                options["threshold"],
+                options["min_delta_ms"],
+            )
+            if regressions:
+                for regression in regressions:
+                    self.stderr.write(self.style.ERROR(regression))
+                raise CommandError(
+                    f"{len(regressions)} regressions against {options['baseline']}."
+                )
+            self.stderr.write(
+                self.style.SUCCESS("No regressions against the baseline.")
+            )
+
+    def _run_scale(self, scale, endpoints, options):
+        """
+        Seeds a fresh test database at one scale and benchmarks the endpoints on it.
+
+        :return: The results keyed by endpoint label.
+        :rtype: dict
+        """
+        settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+        with tempfile.TemporaryDirectory() as directory:
+            if connections[DEFAULT_DB_ALIAS].vendor == "sqlite":
+                settings_dict["TEST"]["NAME"] = os.path.join(directory, "bench.sqlite3")
+            old_config = setup_databases(verbosity=0, interactive=False)
+            try:
+                self.stderr.write(f"Seeding the {scale} marketplace...")
+                call_command(
+                    "seed_marketplace",
+                    seed=options["seed"],
+                    password=BENCH_PASSWORD,
+                    stdout=io.StringIO(),
+                    **SCALES[scale],
+                )
+                bench = BenchData()
+                results = {}
+                for endpoint in endpoints:
+                    result = run_endpoint(
+                        endpoint, bench, options["requests"], options["warmup"]
+                    )
+                    results[endpoint.label] = result
+                    self._summarise(scale, endpoint.label, result)
+            finally:
+                teardown_databases(old_config, verbosity=0)
+        return results
+
+    def _summarise(self, scale, label, result):
+        if "skipped" in result:
+            line = f"skipped: {result['skipped']}"
+        elif "error" in result:
+            line = self.style.ERROR(result["error"])
+        else:
+            line = (
+                f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                f"{result['p99_ms']:>8.1f} ms {result['queries']:>4} queries "
+                f"{result['bytes']:>8} bytes {result['status']}"
+            )
+        self.stderr.write(f"{scale:<7} {label:<34} {line}")
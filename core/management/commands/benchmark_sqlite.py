@@ -0,0 +1,166 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.utils.sqlite import apply_pragmas
+
+SEED_ROWS = 10_000
+
+
+def seed_database(path):
+    """
+    Creates a small listings table to run the benchmark against.
+
+    :param path: Path of the SQLite file to create.
+    :type path: str
+    """
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE listing (id INTEGER PRIMARY KEY, title TEXT, price INTEGER)"
+    )
+    db.executemany(
+        "INSERT INTO listing (title, price) VALUES (?, ?)",
+        ((f"Book {i}", i % 100) for i in range(SEED_ROWS)),
+    )
+    db.commit()
+    db.close()
+
+
+def run_workload(path, pragmas, begin, readers, writers, seconds):
+    """
+    Runs concurrent reader and writer threads against the database for a while.
+
+    Readers run a small indexed range scan. Writers mimic a Django atomic block
+    that reads a row and then updates it.
+
+    :param path: Path of the seeded SQLite file.
+    :type path: str
+    :param pragmas: Pragmas applied to each thread's connection.
+    :type pragmas: dict
+    :param begin: The statement that opens each write transaction.
+    :type begin: str
+    :param readers: Number of reader threads.
+    :type readers: int
+    :param writers: Number of writer threads.
+    :type writers: int
+    :param seconds: How long to run for.
+    :type seconds: float
+    :return: Counts of completed reads, writes and lock errors, and the worst
+        read latency in milliseconds.
+    :rtype: dict
+    """
+    stop = time.monotonic() + seconds
+    lock = threading.Lock()
+    totals = {"reads": 0, "writes": 0, "errors": 0, "max_read_ms": 0.0}
+
+    def record(**deltas):
+        with lock:
+            for key, value in deltas.items():
+                if key == "max_read_ms":
+                    totals[key] = max(totals[key], value)
+                else:
+                    totals[key] += value
+
+    def reader():
+        # Django's default connection timeout is five seconds
+        db = sqlite3.connect(path, timeout=5, isolation_level=None)
+        apply_pragmas(db, pragmas)
+        while time.monotonic() < stop:
+            started = time.monotonic()
+            try:
+                db.execute(
+                    "SELECT id, title, price FROM listing WHERE id BETWEEN ? AND ?",
+                    (100, 150),
+                ).fetchall()
+                record(reads=1, max_read_ms=(time.monotonic() - started) * 1000)
+            except sqlite3.OperationalError:
+                record(errors=1)
+        db.close()
+
+    def writer(offset):
+        db = sqlite3.connect(path, timeout=5, isolation_level=None)
+        apply_pragmas(db, pragmas)
+        row_id = offset
+        while time.monotonic() < stop:
+            row_id = row_id % SEED_ROWS + 1
+            try:
+                db.execute(begin)
+                price = db.execute(
+                    "SELECT price FROM listing WHERE id = ?", (row_id,)
+                ).fetchone()[0]
+                db.execute(
+                    "UPDATE listing SET price = ? WHERE id = ?", (price + 1, row_id)
+                )
+                db.execute("COMMIT")
+                record(writes=1)
+            except sqlite3.OperationalError:
+                if db.in_transaction:
+                    db.execute("ROLLBACK")
+                record(errors=1)
+        db.close()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [
+        threading.Thread(target=writer, args=(i * 997,)) for i in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return totals
+
+
+class Command(BaseCommand):
+    """
+    Compares SQLite read/write concurrency with stock settings and with ``SQLITE_PRAGMAS``.
+
+    Each run uses a fresh temporary database, so the project's own data is never
+    touched. The stock run uses SQLite's defaults and deferred transactions, as
+    Django did before tuning. The tuned run applies ``settings.SQLITE_PRAGMAS``
+    and ``BEGIN IMMEDIATE`` transactions.
+
+    Example::
+
+        python manage.py benchmark_sqlite
+        python manage.py benchmark_sqlite --readers 8 --writers 4 --seconds 10
+    """
+
+    help = "Benchmarks concurrent SQLite reads and writes before and after tuning."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--writers", type=int, default=4)
+        parser.add_argument("--seconds", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        configurations = [
+            ("stock", {}, "BEGIN"),
+            ("tuned", getattr(settings, "SQLITE_PRAGMAS", {}), "BEGIN IMMEDIATE"),
+        ]
+        self.stdout.write(
+            f"{options['readers']} readers, {options['writers']} writers, "
+            f"{options['seconds']:g}s per run"
+        )
+        for label, pragmas, begin in configurations:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "benchmark.sqlite3")
+                seed_database(path)
+                totals = run_workload(
+                    path,
+                    pragmas,
+                    begin,
+                    options["readers"],
+                    options["writers"],
+                    options["seconds"],
+                )
+            self.stdout.write(
+                f"{label:>6}: {totals['reads'] / options['seconds']:>9.0f} reads/s "
+                f"{totals['writes'] / options['seconds']:>7.0f} writes/s "
+                f"{totals['errors']:>5} locked errors "
+                f"{totals['max_read_ms']:>8.1f} ms worst read"
+            )
@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models.shop import Shop
+from core.utils.listing_import import IMPORT_FORMATS, detect_format, import_listings
+
+
+class Command(BaseCommand):
+    """
+    Bulk imports book listings into a shop from a CSV or JSONL file.
+
+    The file is streamed row by row and inserted in ``bulk_create`` batches, so
+    very large catalogues can be loaded with constant memory. Rejected rows are
+    reported with their line numbers and do not stop the import.
+
+    Example::
+
+        python manage.py import_book_listings 3 listings.csv --images covers.zip
+        python manage.py import_book_listings 3 listings.jsonl --batch-size 5000
+    """
+
+    help = "Imports book listings into a shop from a CSV or JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("shop_id", type=int, help="Id of the receiving shop.")
+        parser.add_argument("path", help="Path to the CSV or JSONL file.")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="File format. Detected from the file extension if omitted.",
+        )
+        parser.add_argument(
+            "--images", help="Path to a zip archive holding the cover images."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of listings inserted per query.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            shop = Shop.objects.get(pk=options["shop_id"])
+        except Shop.DoesNotExist:
+            raise CommandError(f"Shop {options['shop_id']} does not exist.")
+
+        fmt = options["format"] or detect_format(options["path"])
+        if fmt is None:
+            raise CommandError("Could not detect the file format; pass --format.")
+
+        images_file = open(options["images"], "rb") if options["images"] else None
+        try:
+            with open(options["path"], "rb") as stream:
+                result = import_listings(
+                    shop, stream, fmt, images_file, options["batch_size"]
+                )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+        finally:
+            if images_file is not None:
+                images_file.close()
+
+        for line_number, message in result.errors:
+            self.stderr.write(f"Line {line_number}: {message}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(
+                f"... and {result.error_count - len(result.errors)} more rejected rows."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.created} listings into {shop.name}; "
+                f"{result.error_count} rows rejected."
+            )
+        )
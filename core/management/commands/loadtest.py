@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.utils.loadtest import ROLES, Recorder, build_report, run_user
+
+
+class Command(BaseCommand):
+    """
+    Drives a running server with concurrent buyer, seller and courier journeys.
+
+    Virtual users log in as the accounts ``seed_marketplace`` created, so seed
+    the database the server uses first, with the same ``--prefix`` and
+    ``--password``. The first ``--buyers`` buyer accounts are used, and so on.
+    Users start evenly over ``--ramp-up`` seconds and repeat their journey until
+    ``--duration`` seconds have passed. See :mod:`core.utils.loadtest` for the
+    journeys.
+
+    The report holds the throughput, error rate and latency percentiles of the
+    whole run, of each journey step and of each ``--interval`` seconds, and the
+    journey outcomes per role. It is written as JSON to standard output or
+    ``--output``, with a timeline on standard error as the run goes.
+
+    Example::
+
+        python manage.py seed_marketplace --buyers 200 --sellers 20 --couriers 10
+        python manage.py runserver --noreload
+        python manage.py loadtest --buyers 40 --sellers 5 --couriers 5 --duration 120
+    """
+
+    help = "Load tests a running server with concurrent buyer, seller and courier journeys."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url", default="http://127.0.0.1:8000", help="The server to test."
+        )
+        parser.add_argument("--buyers", type=int, default=8)
+        parser.add_argument("--sellers", type=int, default=2)
+        parser.add_argument("--couriers", type=int, default=2)
+        parser.add_argument(
+            "--duration", type=float, default=60.0, help="Seconds to run for."
+        )
+        parser.add_argument(
+            "--ramp-up",
+            type=float,
+            default=0.0,
+            help="Seconds over which the users start.",
+        )
+        parser.add_argument(
+            "--think-time",
+            type=float,
+            default=0.0,
+            help="Mean seconds each user pauses between journeys.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds per timeline window.",
+        )
+        parser.add_argument("--prefix", default="seed")
+        parser.add_argument("--password", default="marketplace")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output", default="-", help="Where to write the JSON report."
+        )
+
+    def handle(self, *args, **options):
+        users = [(role, n) for role in ROLES for n in range(1, options[f"{role}s"] + 1)]
+        if min(options[f"{role}s"] for role in ROLES) < 0 or not users:
+            raise CommandError("Give at least one buyer, seller or courier.")
+        if options["duration"] <= 0 or options["interval"] <= 0:
+            raise CommandError("--duration and --interval must be positive.")
+
+        recorder = Recorder()
+        threads = []
+        for index, (role, n) in enumerate(users):
+            delay = options["ramp_up"] * index / len(users)
+            thread = threading.Timer(
+                delay,
+                run_user,
+                args=(
+                    role,
+                    f"{options['prefix']}.{role}{n}@example.com",
+                    options["password"],
+                    options["url"],
+                    recorder,
+                    options["duration"],
+                    options["think_time"],
+                    options["seed"] * 100003 + index,
+                ),
+            )
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+
+        reported = 0
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(0.2)
+            finished = int(recorder.elapsed() // options["interval"])
+            if finished > reported:
+                timeline = build_report(
+                    recorder, finished * options["interval"], options["interval"]
+                )["timeline"]
+                self._write_timeline(timeline[reported:finished])
+                reported = finished
+        duration = max(recorder.elapsed(), options["duration"])
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "url": options["url"],
+            "users": {role: options[f"{role}s"] for role in ROLES},
+            "duration_s": round(duration, 3),
+            **build_report(recorder, duration, options["interval"]),
+        }
+        self._write_timeline(report["timeline"][reported:])
+        output = json.dumps(report, indent=2) + "\n"
+        if options["output"] == "-":
+            self.stdout.write(output, ending="")
+        else:
+            with open(options["output"], "w") as file:
+                file.write(output)
+            self.stderr.write(f"Wrote the report to {options['output']}.")
+
+        total = report["total"]
+        if total["errors"] == total["requests"]:
+            raise CommandError(f"No request to {options['url']} succeeded.")
+        self.stderr.write(
+            f"{total['requests']} requests, {total['throughput_rps']} per second, "
+            f"{total['error_rate']:.1%} errors, p95 {total.get('p95_ms', 0):.1f} ms."
+        )
+
+    def _write_timeline(self, windows):
+        for window in windows:
+            self.stderr.write(
+                f"{window['start_s']:>8.1f}s {window['throughput_rps']:>8.1f} req/s "
+                f"{window['error_rate']:>6.1%} errors "
+                f"p50 {window.get('p50_ms', 0):>7.1f} ms "
+                f"p95 {window.get('p95_ms', 0):>7.1f} ms"
+            )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core.utils.batching import rebuild_batches
+
+
+class Command(BaseCommand):
+    """
+    Regroups every unassigned ready-to-ship order into fresh delivery batches.
+
+    Batches are normally maintained incrementally as orders become ready. Run
+    this once after deploying batching, or after changing the batch caps.
+
+    Example::
+
+        python manage.py rebuild_delivery_batches
+    """
+
+    help = "Rebuilds the open courier delivery batches from ready-to-ship orders."
+
+    def handle(self, *args, **options):
+        count = rebuild_batches()
+        self.stdout.write(self.style.SUCCESS(f"Batched {count} ready-to-ship orders."))
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from core.models.order import Order
+from core.models.platform_monthly_sales import (
+    PlatformMonthlySales,
+    month_start,
+    next_month_start,
+)
+
+
+def parse_month(value):
+    """
+    Parses a ``YYYY-MM`` argument into the first day of that month.
+
+    :param value: The raw argument.
+    :type value: str
+    :return: The first day of the month.
+    :rtype: datetime.date
+    :raises CommandError: If the value is not a valid month.
+    """
+    try:
+        return date.fromisoformat(f"{value}-01")
+    except ValueError:
+        raise CommandError(f"Invalid month {value!r}; use YYYY-MM.")
+
+
+class Command(BaseCommand):
+    """
+    Recomputes closed months of the ``PlatformMonthlySales`` rollup from the raw order tables.
+
+    The rollup is normally maintained incrementally as orders are placed. Each
+    month is rebuilt by replacing its row, so the command is safe to re-run. By
+    default it rebuilds last month, which suits a monthly cron job; the current
+    month is only rebuilt on request because orders may still be coming in.
+
+    Example::
+
+        python manage.py rebuild_platform_monthly_sales
+        python manage.py rebuild_platform_monthly_sales --month 2025-01 --month 2025-02
+        python manage.py rebuild_platform_monthly_sales --all --include-current
+    """
+
+    help = "Rebuilds closed months of the platform monthly sales rollup."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--month",
+            action="append",
+            dest="months",
+            type=parse_month,
+            help="Month to rebuild, as YYYY-MM. May be repeated.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild every closed month since the first order.",
+        )
+        parser.add_argument(
+            "--include-current",
+            action="store_true",
+            help="Also rebuild the current month, e.g. when first deploying the rollup.",
+        )
+
+    def handle(self, *args, **options):
+        current = month_start(timezone.localdate())
+
+        if options["all"]:
+            first_order = Order.objects.aggregate(first=Min("placed_at"))["first"]
+            months = []
+            if first_order is not None:
+                month = month_start(timezone.localdate(first_order))
+                while month < current:
+                    months.append(month)
+                    month = next_month_start(month)
+        elif options["months"]:
+            months = sorted(set(options["months"]))
+        else:
+            last_month = month_start(current - timedelta(days=1))
+            months = [last_month]
+
+        if options["include_current"] and current not in months:
+            months.append(current)
+
+        for month in months:
+            if month > current:
+                raise CommandError(f"{month:%Y-%m} is in the future.")
+            if month == current and not options["include_current"]:
+                raise CommandError(
+                    f"{month:%Y-%m} is still open; pass --include-current to rebuild it."
+                )
+
+        for month in months:
+            rollup = PlatformMonthlySales.rebuild(month)
+            self.stdout.write(
+                f"{month:%Y-%m}: {rollup.orders} orders, RM{rollup.revenue} gross"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {len(months)} platform monthly sales rows.")
+        )
@@ -0,0 +1,657 @@
+import random
+import time
+from array import array
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User as AuthUser
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.models.book_listing import BookListing
+from core.models.cart import Cart
+from core.models.cart_item import CartItem
+from core.models.delivery_issue import DeliveryIssue
+from core.models.order import Order
+from core.models.order_assignment import OrderAssignment
+from core.models.order_item import OrderItem
+from core.models.review import Review
+from core.models.shop import Shop
+from core.models.user import User
+from core.utils.pricing import build_breakdown
+
+# Share of listings in each condition, and the price factor applied to a new copy
+CONDITIONS = {
+    "brand_new": (15, 1.0),
+    "like_new": (25, 0.8),
+    "used": (35, 0.6),
+    "well_used": (17, 0.45),
+    "tattered": (8, 0.3),
+}
+# New-copy prices are log-normal around RM40, so most books are cheap with a long tail
+PRICE_MEDIAN = 40.0
+PRICE_SIGMA = 0.6
+# Number of items in an order, and how often each size occurs
+ORDER_SIZES = {1: 60, 2: 25, 3: 10, 4: 5}
+# Orders older than this have been delivered or cancelled
+SETTLED_AFTER_DAYS = 14
+RECENT_STATUSES = {
+    "pending": 30,
+    "ready_to_ship": 20,
+    "shipped": 20,
+    "completed": 20,
+    "cancelled": 10,
+}
+SETTLED_STATUSES = {"completed": 88, "cancelled": 12}
+ASSIGNED_STATUSES = ("shipped", "completed")
+RATINGS = {1: 5, 2: 7, 3: 15, 4: 33, 5: 40}
+
+FIRST_NAMES = [
+    "Aisyah",
+    "Wei Ling",
+    "Arjun",
+    "Nurul",
+    "Jason",
+    "Mei",
+    "Hafiz",
+    "Priya",
+    "Daniel",
+    "Siti",
+    "Kumar",
+    "Li Ting",
+    "Amir",
+    "Sarah",
+    "Ravi",
+    "Farah",
+]
+LAST_NAMES = [
+    "Tan",
+    "Abdullah",
+    "Lim",
+    "Raj",
+    "Wong",
+    "Ismail",
+    "Lee",
+    "Nair",
+    "Chong",
+    "Hassan",
+    "Ng",
+    "Pillai",
+    "Teoh",
+    "Rahman",
+    "Goh",
+    "Yusof",
+]
+TITLE_WORDS = [
+    "Silent",
+    "River",
+    "Garden",
+    "Shadow",
+    "Empire",
+    "Monsoon",
+    "Harbour",
+    "Lantern",
+    "Island",
+    "Winter",
+    "Market",
+    "Forest",
+    "Letters",
+    "Storm",
+    "Kingdom",
+    "Orchard",
+    "Atlas",
+    "Mirror",
+    "Journey",
+    "Night",
+]
+SUBJECTS = [
+    "Calculus",
+    "Data Structures",
+    "Organic Chemistry",
+    "Microeconomics",
+    "Linear Algebra",
+    "Operating Systems",
+    "Statistics",
+    "Marketing",
+]
+CITIES = [
+    ("Cyberjaya", "Selangor", "63"),
+    ("Petaling Jaya", "Selangor", "46"),
+    ("Shah Alam", "Selangor", "40"),
+    ("Kuala Lumpur", "Wilayah Persekutuan", "50"),
+    ("George Town", "Penang", "10"),
+    ("Johor Bahru", "Johor", "80"),
+    ("Ipoh", "Perak", "30"),
+    ("Melaka", "Melaka", "75"),
+]
+COMMENTS = {
+    1: "Book was not as described.",
+    2: "Slow to ship and the cover was damaged.",
+    3: "Okay, does the job.",
+    4: "Good condition and arrived quickly.",
+    5: "Exactly as described, great seller!",
+}
+ISSUES = [
+    "Recipient was not at the address.",
+    "Parcel was damaged in transit.",
+    "Address could not be found.",
+    "Buyer refused the delivery.",
+]
+
+
+def weighted(rng, weights, k):
+    """
+    Draws ``k`` keys of a ``{key: weight}`` mapping with replacement.
+
+    :param rng: The seeded random generator.
+    :type rng: random.Random
+    :param weights: Keys mapped to their relative weights.
+    :type weights: dict
+    :param k: Number of draws.
+    :type k: int
+    :rtype: list
+    """
+    return rng.choices(list(weights), weights=list(weights.values()), k=k)
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """
+    Turns off ``auto_now`` and ``auto_now_add`` on the given models' fields.
+
+    ``bulk_create`` would otherwise stamp every generated row with the current
+    time, instead of the history the rows were generated with.
+
+    :param models: The models whose timestamps are set explicitly.
+    """
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def insert_batches(model, objects, batch_size):
+    """
+    Inserts generated instances with one ``bulk_create`` per batch.
+
+    :param model: The model to insert into.
+    :param objects: An iterable producing unsaved instances.
+    :param batch_size: Number of rows per ``INSERT``.
+    :type batch_size: int
+    :return: The primary keys of the inserted rows, in order.
+    :rtype: array.array
+    """
+    pks = array("q")
+    objects = iter(objects)
+    while batch := list(islice(objects, batch_size)):
+        model.objects.bulk_create(batch)
+        pks.extend(obj.pk for obj in batch)
+    return pks
+
+
+class Command(BaseCommand):
+    """
+    Fills the database with a synthetic marketplace for scale and load testing.
+
+    Generates buyers, sellers and approved couriers (each with a login), shops,
+    listings, carts, orders with their items, courier assignments, reviews and
+    delivery issues. Listing conditions, prices, order sizes, order statuses and
+    ratings follow fixed distributions, and the same ``--seed`` always produces
+    the same data. Rows are inserted in ``bulk_create`` batches inside one
+    transaction, so a failed run leaves nothing behind. The sales rollups and
+    delivery batches are rebuilt afterwards.
+
+    Every account shares the ``--password`` and has an e-mail address like
+    ``seed.buyer42@example.com`` and the username ``seed.buyer42``. Use a different
+    ``--prefix`` to add a second data set to the same database.
+
+    Orders older than two weeks are completed or cancelled, recent ones can be
+    in any status, and every shipped or completed order has a courier
+    assignment. Each listing is a single copy, so the orders need at least as
+    many listings as they have items.
+
+    Example::
+
+        python manage.py seed_marketplace
+        python manage.py seed_marketplace --listings 2000000 --orders 500000 --seed 7
+    """
+
+    help = "Generates a reproducible synthetic marketplace for scale testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--buyers", type=int, default=1000)
+        parser.add_argument("--sellers", type=int, default=100)
+        parser.add_argument("--couriers", type=int, default=20)
+        parser.add_argument("--listings", type=int, default=20000)
+        parser.add_argument(
+            "--carts", type=int, default=300, help="Number of buyers with a cart."
+        )
+        parser.add_argument("--orders", type=int, default=5000)
+        parser.add_argument("--reviews", type=int, default=2000)
+        parser.add_argument(
+            "--delivery-issues",
+            type=int,
+            default=100,
+            help="Number of courier assignments with a reported issue.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="How far back the generated history goes.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--prefix",
+            default="seed",
+            help="Prefix of the generated e-mail addresses and usernames.",
+        )
+        parser.add_argument("--password", default="marketplace")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows inserted per query.",
+        )
+        parser.add_argument(
+            "--skip-rollups",
+            action="store_true",
+            help="Do not rebuild the sales rollups and delivery batches.",
+        )
+
+    def handle(self, *args, **options):
+        for name in ("buyers", "sellers", "couriers", "listings", "days"):
+            if options[name] < 1:
+                raise CommandError(f"--{name} must be at least 1.")
+        prefix = options["prefix"]
+        if User.objects.filter(email__startswith=f"{prefix}.").exists():
+            raise CommandError(
+                f"Accounts with the prefix {prefix!r} already exist; "
+                "pass a different --prefix."
+            )
+
+        self.rng = random.Random(options["seed"])
+        self.now = timezone.now()
+        self.options = options
+        self.batch_size = options["batch_size"]
+
+        # Decide which listings the orders buy before anything is inserted, so
+        # listings can be written with their final ``bought`` flag in one pass
+        order_sizes = weighted(self.rng, ORDER_SIZES, options["orders"])
+        sold_count = sum(order_sizes)
+        if sold_count > options["listings"]:
+            raise CommandError(
+                f"{options['orders']} orders need {sold_count} listings; "
+                f"pass --listings {sold_count} or more."
+            )
+        sold = self.rng.sample(range(options["listings"]), sold_count)
+        sold_set = set(sold)
+
+        started = time.perf_counter()
+        with transaction.atomic(), explicit_timestamps(
+            BookListing, Cart, Order, OrderAssignment, Review, DeliveryIssue
+        ):
+            buyers = self._create_users("buyer", options["buyers"])
+            sellers = self._create_users("seller", options["sellers"])
+            couriers = self._create_users("courier", options["couriers"])
+            shops = self._create_shops(sellers)
+            listings, prices, listing_shops = self._create_listings(
+                shops, options["listings"], sold_set
+            )
+            self._create_carts(buyers, listings, listing_shops, sold_set)
+            completed_items, assignments = self._create_orders(
+                buyers, couriers, order_sizes, sold, listings, prices
+            )
+            self._create_reviews(
+                buyers, shops, completed_items, listing_shops, listings
+            )
+            self._create_delivery_issues(assignments)
+
+            if not options["skip_rollups"]:
+                call_command("backfill_shop_daily_sales", stdout=self.stdout)
+                call_command(
+                    "rebuild_platform_monthly_sales",
+                    all=True,
+                    include_current=True,
+                    stdout=self.stdout,
+                )
+                call_command("rebuild_delivery_batches", stdout=self.stdout)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded the marketplace in {time.perf_counter() - started:.1f}s. "
+                f"Sign in as {prefix}.buyer1@example.com with the password "
+                f"{options['password']!r}."
+            )
+        )
+
+    def _report(self, label, count):
+        self.stdout.write(f"{count:>10} {label}")
+
+    def _moment(self, days=None):
+        """Returns a random time within the last ``days`` (default ``--days``) days."""
+        days = self.options["days"] if days is None else days
+        return self.now - timedelta(seconds=self.rng.random() * days * 86400)
+
+    def _create_users(self, role, count):
+        """
+        Creates ``count`` accounts with the given role, each with a Django login.
+
+        :return: The primary keys of the created ``core.User`` rows.
+        :rtype: array.array
+        """
+        prefix = self.options["prefix"]
+        password = make_password(self.options["password"])
+        names = [
+            f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+            for _ in range(count)
+        ]
+        local_parts = [f"{prefix}.{role}{n}" for n in range(1, count + 1)]
+        approved_at = self.now if role == "courier" else None
+
+        insert_batches(
+            AuthUser,
+            (
+                AuthUser(
+                    username=local_part,
+                    email=f"{local_part}@example.com",
+                    password=password,
+                    first_name=name.split(" ", 1)[0],
+                    last_name=name.rsplit(" ", 1)[-1],
+                )
+                for local_part, name in zip(local_parts, names)
+            ),
+            self.batch_size,
+        )
+        pks = insert_batches(
+            User,
+            (
+                User(
+                    email=f"{local_part}@example.com",
+                    name=name,
+                    role=role,
+                    approved_at=approved_at,
+                )
+                for local_part, name in zip(local_parts, names)
+            ),
+            self.batch_size,
+        )
+        self._report(f"{role}s", count)
+        return pks
+
+    def _create_shops(self, sellers):
+        """
+        Creates one shop per seller, as the seller pages expect.
+
+        :return: The primary keys of the created shops.
+        :rtype: array.array
+        """
+        pks = insert_batches(
+            Shop,
+            (
+                Shop(
+                    name=f"{self.rng.choice(LAST_NAMES)}'s "
+                    f"{self.rng.choice(TITLE_WORDS)} Books",
+                    user_id=owner,
+                )
+                for owner in sellers
+            ),
+            self.batch_size,
+        )
+        self._report("shops", len(pks))
+        return pks
+
+    def _create_listings(self, shops, count, sold):
+        """
+        Creates the listings, spreading them over the shops with a long tail.
+
+        A few large shops hold many listings and most shops hold a handful.
+
+        :return: The listings' primary keys, prices in cents and shop indexes.
+        :rtype: tuple[array.array, array.array, array.array]
+        """
+        shop_weights = [self.rng.paretovariate(1.2) for _ in shops]
+        listing_shops = array(
+            "l", self.rng.choices(range(len(shops)), weights=shop_weights, k=count)
+        )
+        prices = array("l")
+        conditions = {name: factor for name, (_, factor) in CONDITIONS.items()}
+        condition_weights = {name: weight for name, (weight, _) in CONDITIONS.items()}
+
+        def generate():
+            for n in range(count):
+                condition = weighted(self.rng, condition_weights, 1)[0]
+                new_price = self.rng.lognormvariate(0, PRICE_SIGMA) * PRICE_MEDIAN
+                cents = max(100, round(new_price * conditions[condition] * 100))
+                prices.append(cents)
+                if self.rng.random() < 0.2:
+                    title = f"{self.rng.choice(SUBJECTS)}, Edition {self.rng.randint(2, 12)}"
+                else:
+                    title = f"The {self.rng.choice(TITLE_WORDS)} {self.rng.choice(TITLE_WORDS)}"
+                yield BookListing(
+                    shop_id=shops[listing_shops[n]],
+                    title=title,
+                    author=f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
+                    condition=condition,
+                    price=Decimal(cents).scaleb(-2),
+                    bought=n in sold,
+                    descriptions=f"{condition.replace('_', ' ').capitalize()} copy.",
+                    updated_at=self._moment(),
+                )
+
+        pks = insert_batches(BookListing, generate(), self.batch_size)
+        self._report("listings", count)
+        return pks, prices, listing_shops
+
+    def _create_carts(self, buyers, listings, listing_shops, sold):
+        """
+        Gives ``--carts`` random buyers a recent cart of one to four unsold listings.
+
+        Buyers can only add books from one shop to their cart, so each cart's
+        listings come from a single shop.
+        """
+        count = min(self.options["carts"], len(buyers))
+        if count < 1 or len(sold) == len(listings):
+            return
+        stock = defaultdict(list)
+        for n, shop in enumerate(listing_shops):
+            if n not in sold:
+                stock[shop].append(n)
+        stocked_shops = sorted(stock)
+        owners = self.rng.sample(range(len(buyers)), count)
+        carts = insert_batches(
+            Cart,
+            (Cart(user_id=buyers[n], created_at=self._moment(30)) for n in owners),
+            self.batch_size,
+        )
+
+        def generate():
+            for cart in carts:
+                shop_stock = stock[self.rng.choice(stocked_shops)]
+                size = min(self.rng.randint(1, 4), len(shop_stock))
+                for n in self.rng.sample(shop_stock, size):
+                    yield CartItem(cart_id=cart, book_listing_id=listings[n])
+
+        items = insert_batches(CartItem, generate(), self.batch_size)
+        self._report("carts", count)
+        self._report("cart items", len(items))
+
+    def _create_orders(self, buyers, couriers, order_sizes, sold, listings, prices):
+        """
+        Creates the orders, their items and the courier assignments of shipped ones.
+
+        Orders are inserted oldest first and buy the listings in ``sold`` in turn.
+
+        :return: The buyer and listing index of every item in a completed order,
+            and the assigned orders' assignment primary keys and times.
+        :rtype: tuple[list[tuple[int, int]], list[tuple[int, datetime.datetime]]]
+        """
+        placed = sorted(self._moment() for _ in order_sizes)
+        settled_before = self.now - timedelta(days=SETTLED_AFTER_DAYS)
+        plans = []
+        position = 0
+        for placed_at, size in zip(placed, order_sizes):
+            statuses = (
+                SETTLED_STATUSES if placed_at < settled_before else RECENT_STATUSES
+            )
+            items = sold[position : position + size]
+            position += size
+            plans.append(
+                (
+                    self.rng.randrange(len(buyers)),
+                    placed_at,
+                    weighted(self.rng, statuses, 1)[0],
+                    items,
+                    self.rng.choice(CITIES),
+                )
+            )
+
+        def generate_orders():
+            for buyer, placed_at, status, items, (city, state, postal) in plans:
+                breakdown = build_breakdown(
+                    Decimal(sum(prices[n] for n in items)).scaleb(-2), len(items)
+                )
+                yield Order(
+                    user_id=buyers[buyer],
+                    status=status,
+                    placed_at=placed_at,
+                    subtotal=breakdown.subtotal,
+                    tax_amount=breakdown.tax_amount,
+                    total_price=breakdown.total_price,
+                    address=f"{self.rng.randint(1, 200)}, Jalan {self.rng.choice(TITLE_WORDS)}",
+                    city=city,
+                    state=state,
+                    postal_code=f"{postal}{self.rng.randint(0, 999):03d}",
+                    country="Malaysia",
+                )
+
+        orders = insert_batches(Order, generate_orders(), self.batch_size)
+
+        def generate_items():
+            for order, (_, _, _, items, _) in zip(orders, plans):
+                for n in items:
+                    yield OrderItem(
+                        order_id=order,
+                        book_listing_id=listings[n],
+                        quantity=1,
+                        purchase_price=Decimal(prices[n]).scaleb(-2),
+                    )
+
+        item_count = len(insert_batches(OrderItem, generate_items(), self.batch_size))
+
+        assigned = [
+            (order, placed_at)
+            for order, (_, placed_at, status, _, _) in zip(orders, plans)
+            if status in ASSIGNED_STATUSES
+        ]
+        assigned_times = [
+            min(self.now, placed_at + timedelta(hours=self.rng.uniform(2, 48)))
+            for _, placed_at in assigned
+        ]
+        assignment_pks = insert_batches(
+            OrderAssignment,
+            (
+                OrderAssignment(
+                    order_id=order,
+                    courier_id=self.rng.choice(couriers),
+                    assigned_at=assigned_at,
+                    updated_at=min(
+                        self.now,
+                        assigned_at + timedelta(hours=self.rng.uniform(1, 72)),
+                    ),
+                )
+                for (order, _), assigned_at in zip(assigned, assigned_times)
+            ),
+            self.batch_size,
+        )
+
+        completed_items = [
+            (buyer, n)
+            for buyer, _, status, items, _ in plans
+            if status == "completed"
+            for n in items
+        ]
+        self._report("orders", len(orders))
+        self._report("order items", item_count)
+        self._report("courier assignments", len(assignment_pks))
+        return completed_items, list(zip(assignment_pks, assigned_times))
+
+    def _create_reviews(self, buyers, shops, completed_items, listing_shops, listings):
+        """
+        Creates up to ``--reviews`` shop reviews, each by a buyer of a completed item.
+
+        Without completed orders, reviews go to random shops from random buyers.
+        Like the review form, each buyer reviews a shop at most once; duplicate
+        draws are redrawn, so fewer reviews are made when there are not enough
+        distinct buyer and shop pairs.
+        """
+        count = self.options["reviews"]
+        if count < 1:
+            return
+        reviewed = set()
+
+        def generate():
+            # Give up after many duplicates rather than spin when pairs run out
+            for _ in range(count * 10):
+                if len(reviewed) == count:
+                    return
+                if completed_items:
+                    buyer, n = self.rng.choice(completed_items)
+                    shop = shops[listing_shops[n]]
+                else:
+                    buyer = self.rng.randrange(len(buyers))
+                    shop = self.rng.choice(shops)
+                if (buyer, shop) in reviewed:
+                    continue
+                reviewed.add((buyer, shop))
+                rating = weighted(self.rng, RATINGS, 1)[0]
+                yield Review(
+                    shop_id=shop,
+                    user_id=buyers[buyer],
+                    rating=rating,
+                    comment=COMMENTS[rating],
+                    created_at=self._moment(),
+                )
+
+        insert_batches(Review, generate(), self.batch_size)
+        self._report("reviews", len(reviewed))
+
+    def _create_delivery_issues(self, assignments):
+        """
+        Reports an issue on ``--delivery-issues`` distinct courier assignments.
+        """
+        count = min(self.options["delivery_issues"], len(assignments))
+        if count < 1:
+            return
+        insert_batches(
+            DeliveryIssue,
+            (
+                DeliveryIssue(
+                    order_assignment_id=assignment,
+                    issue_description=self.rng.choice(ISSUES),
+                    reported_at=min(
+                        self.now,
+                        assigned_at + timedelta(hours=self.rng.uniform(1, 24)),
+                    ),
+                )
+                for assignment, assigned_at in self.rng.sample(assignments, count)
+            ),
+            self.batch_size,
+        )
+        self._report("delivery issues", count)
@@ -0,0 +1,59 @@
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.models.book_listing import BookListing
+from core.utils.book_cards import render_book_cards
+
+CARD_TEMPLATES = ("buyer/book_card.html", "seller/book_card.html")
+
+
+class Command(BaseCommand):
+    """
+    Renders the book card of every unsold listing into the shared cache.
+
+    Run it after a deploy that changes a card template, since the new template
+    invalidates every cached card, or after flushing the cache, so the first
+    visitors to the catalog get cache hits. Cards that are already cached are
+    left alone, so running it again is cheap.
+
+    Example::
+
+        python manage.py warm_book_card_cache
+        python manage.py warm_book_card_cache --batch-size 1000
+    """
+
+    help = "Pre-renders book cards for the landing and seller listings pages."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if "locmem" in settings.CACHES["default"]["BACKEND"]:
+            self.stderr.write(
+                self.style.WARNING(
+                    "The cache is local to this process, so warming it has no "
+                    "effect on the web workers. Set CACHE_URL to a shared cache."
+                )
+            )
+
+        listings = (
+            BookListing.objects.filter(bought=False)
+            .select_related("shop")
+            .order_by("pk")
+            .iterator(chunk_size=options["batch_size"])
+        )
+        total = rendered = 0
+        while batch := list(islice(listings, options["batch_size"])):
+            for template_name in CARD_TEMPLATES:
+                _, missed = render_book_cards(batch, template_name)
+                rendered += missed
+            total += len(batch) * len(CARD_TEMPLATES)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rendered {rendered} of {total} book cards "
+                f"({total - rendered} were already cached)."
+            )
+        )
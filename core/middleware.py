@@ -0,0 +1,120 @@
+import logging
+import time
+
+from django.conf import settings
+
+from core.routers import track_primary_writes
+from core.utils.metrics import UNRESOLVED_VIEW, QueryTimer, record_request
+from core.utils.profiling import profile_call, requested_mode, save_profile
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_PIN_COOKIE = "primary_pin"
+
+# Other methods are counted together, so clients cannot create unbounded label values
+KNOWN_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+
+class PrimaryPinningMiddleware:
+    """
+    Pins a client to the primary database for a short while after it writes.
+
+    Read replicas lag slightly behind the primary. When a request writes anything,
+    such as placing an order, the response sets a short-lived cookie, and views
+    that normally read from a replica read from the primary while it is present.
+    The client therefore always sees its own changes.
+
+    Place this after the session and authentication middleware, so only the
+    view's own writes count, not session bookkeeping.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with track_primary_writes() as wrote:
+            response = self.get_response(request)
+            if wrote():
+                response.set_cookie(
+                    PRIMARY_PIN_COOKIE,
+                    "1",
+                    max_age=getattr(settings, "REPLICA_PIN_SECONDS", 10),
+                    httponly=True,
+                    samesite="Lax",
+                )
+        return response
+
+
+class RequestMetricsMiddleware:
+    """
+    Records per-view request, latency and database metrics for Prometheus.
+
+    Every request is labelled with its resolved URL name, such as
+    ``buyer-landing``. The response gets a ``Server-Timing`` header with the
+    total and database time, which browser developer tools show per request.
+    The metrics are served by :func:`core.views.metrics`.
+
+    Place this first, so the time spent in the other middleware is included.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with QueryTimer() as timer:
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = request.resolver_match
+        record_request(
+            match.view_name if match else UNRESOLVED_VIEW,
+            request.method if request.method in KNOWN_METHODS else "other",
+            response.status_code,
+            duration,
+            timer,
+        )
+        timing = (
+            f"app;dur={duration * 1000:.1f}, "
+            f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries"'
+        )
+        if response.has_header("Server-Timing"):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response["Server-Timing"] = timing
+        return response
+
+
+class RequestProfilingMiddleware:
+    """
+    Profiles requests on demand and saves the results for staff to download.
+
+    Staff users profile a request by sending an ``X-Profile`` header or a
+    ``_profile`` query parameter, and ``PROFILING_SAMPLE_RATE`` profiles a share of
+    all requests with the low-overhead stack sampler (see
+    :mod:`core.utils.profiling`). Requests that are not profiled only pay for a
+    header lookup.
+
+    Place this last, after the authentication middleware, so the profile covers
+    the view rather than the rest of the middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = requested_mode(request)
+        if mode is None:
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        response, mode, profile = profile_call(mode, self.get_response, request)
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        try:
+            save_profile(
+                mode, profile, match.view_name if match else UNRESOLVED_VIEW, duration
+            )
+        except OSError:
+            # A full or read-only disk must not fail the request being profiled
+            logger.exception("Could not save the request profile")
+        return response
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.5 on 2026-10-19 01:46
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import DecimalField, F, Sum
+
+
+def backfill_order_totals(apps, schema_editor):
+    """Stores the subtotal and tax of orders placed before they were persisted."""
+    Order = apps.get_model("core", "Order")
+    cents = Decimal("0.01")
+    orders = Order.objects.annotate(
+        items_subtotal=Sum(
+            F("order_items__purchase_price") * F("order_items__quantity"),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        )
+    )
+    batch = []
+    for order in orders.iterator(chunk_size=1000):
+        order.subtotal = (order.items_subtotal or Decimal("0.00")).quantize(cents)
+        order.tax_amount = (order.subtotal * Decimal("0.06")).quantize(cents)
+        batch.append(order)
+        if len(batch) >= 1000:
+            Order.objects.bulk_update(batch, ["subtotal", "tax_amount"])
+            batch = []
+    if batch:
+        Order.objects.bulk_update(batch, ["subtotal", "tax_amount"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_upgraderequest_approved_alter_order_status_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cart",
+            name="version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="subtotal",
+            field=models.DecimalField(
+                decimal_places=2, default=Decimal("0.00"), max_digits=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="tax_amount",
+            field=models.DecimalField(
+                decimal_places=2, default=Decimal("0.00"), max_digits=10
+            ),
+        ),
+        migrations.RunPython(backfill_order_totals, migrations.RunPython.noop),
+    ]
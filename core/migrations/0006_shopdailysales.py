@@ -0,0 +1,54 @@
+# Generated by Django 5.1.5 on 2026-10-19 01:48
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_cart_version_order_subtotal_tax"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ShopDailySales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("orders", models.PositiveIntegerField(default=0)),
+                ("pending_orders", models.PositiveIntegerField(default=0)),
+                ("items_sold", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0.00"), max_digits=12
+                    ),
+                ),
+                (
+                    "shop",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_sales",
+                        to="core.shop",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("shop", "date"), name="unique_shop_daily_sales"
+                    )
+                ],
+            },
+        ),
+    ]
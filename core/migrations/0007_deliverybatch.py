@@ -0,0 +1,76 @@
+# Generated by Django 5.1.5 on 2026-10-19 01:55
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_shopdailysales"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeliveryBatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("postal_prefix", models.CharField(max_length=20)),
+                ("city", models.CharField(max_length=100)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("open", "Open"), ("claimed", "Claimed")],
+                        default="open",
+                        max_length=10,
+                    ),
+                ),
+                ("order_count", models.PositiveIntegerField(default=0)),
+                (
+                    "total_value",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0.00"), max_digits=12
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "courier",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="delivery_batches",
+                        to="core.user",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="delivery_batch",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="orders",
+                to="core.deliverybatch",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deliverybatch",
+            index=models.Index(
+                fields=["status", "postal_prefix", "city"],
+                name="delivery_batch_lookup_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-19 01:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_deliverybatch"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="orderassignment",
+            index=models.Index(
+                fields=["courier", "-updated_at"], name="assignment_history_idx"
+            ),
+        ),
+    ]
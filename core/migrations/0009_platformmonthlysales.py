@@ -0,0 +1,37 @@
+# Generated by Django 5.1.5 on 2026-10-19 02:02
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_orderassignment_history_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlatformMonthlySales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField(unique=True)),
+                ("orders", models.PositiveIntegerField(default=0)),
+                ("items_sold", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0.00"), max_digits=14
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_platformmonthlysales"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="booklisting",
+            name="title",
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+    ]
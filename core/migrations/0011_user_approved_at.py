@@ -0,0 +1,46 @@
+# Generated by Django 5.1.5 on 2026-10-19 02:05
+
+from django.db import migrations, models
+
+
+def provision_approved_requests(apps, schema_editor):
+    """
+    Applies upgrade requests that were approved before approval became eager.
+
+    Approved couriers get ``approved_at`` so they can keep signing in, and approved
+    sellers who never revisited the upgrade page get their role and default shop.
+    """
+    UpgradeRequest = apps.get_model("core", "UpgradeRequest")
+    User = apps.get_model("core", "User")
+    Shop = apps.get_model("core", "Shop")
+
+    for upgrade_request in UpgradeRequest.objects.filter(approved=True).select_related(
+        "user"
+    ):
+        user = upgrade_request.user
+        if user.approved_at is not None:
+            continue
+        if upgrade_request.target_role == "seller" and user.role == "buyer":
+            user.role = "seller"
+            if not Shop.objects.filter(user=user).exists():
+                Shop.objects.create(name=f"{user.name}'s Shop", user=user)
+        if user.role == upgrade_request.target_role:
+            User.objects.filter(pk=user.pk).update(
+                role=user.role, approved_at=upgrade_request.requested_at
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_booklisting_title_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="approved_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(provision_approved_requests, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_user_approved_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="booklisting",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
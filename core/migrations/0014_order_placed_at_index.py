@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 03:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_alter_order_status"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="order",
+            name="placed_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
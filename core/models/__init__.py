@@ -1,11 +1,14 @@
 from .book_listing import BookListing
 from .cart import Cart
 from .cart_item import CartItem
+from .delivery_batch import DeliveryBatch
 from .delivery_issue import DeliveryIssue
 from .order import Order
 from .order_assignment import OrderAssignment
 from .order_item import OrderItem
+from .platform_monthly_sales import PlatformMonthlySales
 from .review import Review
 from .shop import Shop
+from .shop_daily_sales import ShopDailySales
 from .upgrade_request import UpgradeRequest
 from .user import User
@@ -1,6 +1,7 @@
 from django.db import models
 
 from core.constants import CONDITION_CHOICES
+from core.models.cart import Cart
 from core.models.shop import Shop
 
 
@@ -15,18 +16,46 @@ class BookListing(models.Model):
     :ivar price: Price of the book listing.
     :ivar image: ImageField for storing raw image files.
     :ivar bought: Boolean indicating whether the book has been purchased.
+    :ivar updated_at: When the listing last changed. Cached book cards are keyed
+        on it, so queryset ``update()`` calls must set it explicitly.
     """
 
     shop = models.ForeignKey(
         Shop, on_delete=models.CASCADE, related_name="book_listings"
     )
-    title = models.CharField(max_length=255)
+    title = models.CharField(max_length=255, db_index=True)
     author = models.CharField(max_length=255)
     condition = models.CharField(max_length=50, choices=CONDITION_CHOICES)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     image = models.ImageField(upload_to="book_images/", null=True, blank=True)
     bought = models.BooleanField(default=False)
     descriptions = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the listing and bumps the version of every cart holding it.
+
+        A listing's price or ``bought`` flag feeds into cart totals, so any
+        cached cart quote containing this listing must be invalidated.
+
+        :param args: Positional arguments passed to the parent `save` method.
+        :param kwargs: Keyword arguments passed to the parent `save` method.
+        """
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            Cart.bump_versions(cart_items__book_listing=self)
+
+    def delete(self, *args, **kwargs):
+        """
+        Bumps the version of every cart holding this listing, then deletes it.
+
+        :param args: Positional arguments passed to the parent `delete` method.
+        :param kwargs: Keyword arguments passed to the parent `delete` method.
+        """
+        Cart.bump_versions(cart_items__book_listing=self)
+        return super().delete(*args, **kwargs)
 
     def __str__(self):
         return self.title
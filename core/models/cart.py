@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 
 from core.models.user import User
 
@@ -12,10 +13,27 @@ class Cart(models.Model):
 
     :ivar user: ForeignKey linking the cart to a user.
     :ivar created_at: The timestamp indicating when the cart was created.
+    :ivar version: Counter bumped whenever the cart's priced contents change.
+        Cached price quotes are keyed on it.
     """
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="carts")
     created_at = models.DateTimeField(auto_now_add=True)
+    version = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    def bump_versions(cls, **filters):
+        """
+        Atomically increments the version of every cart matching the given filters.
+
+        This is done with a single ``UPDATE`` so it is safe to call from
+        concurrent requests and never loads the carts into memory.
+
+        :param filters: Keyword lookups selecting the carts to bump.
+        :return: The number of carts whose version was bumped.
+        :rtype: int
+        """
+        return cls.objects.filter(**filters).update(version=F("version") + 1)
 
     def __str__(self):
         return f"Cart {self.id} for {self.user.email}"
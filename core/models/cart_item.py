@@ -40,12 +40,26 @@ class CartItem(models.Model):
         This method overrides the default save behavior to ensure data integrity
         by calling the `clean` method before saving. It ensures that all
         validation checks are enforced before persisting the instance to the database.
+        The owning cart's version is bumped afterwards so cached quotes expire.
 
         :param args: Positional arguments passed to the parent `save` method.
         :param kwargs: Keyword arguments passed to the parent `save` method.
         """
         self.clean()
         super().save(*args, **kwargs)
+        Cart.bump_versions(pk=self.cart_id)
+
+    def delete(self, *args, **kwargs):
+        """
+        Deletes the cart item and bumps its cart's version so cached quotes expire.
+
+        :param args: Positional arguments passed to the parent `delete` method.
+        :param kwargs: Keyword arguments passed to the parent `delete` method.
+        """
+        cart_id = self.cart_id
+        result = super().delete(*args, **kwargs)
+        Cart.bump_versions(pk=cart_id)
+        return result
 
     def __str__(self):
-        return f"{self.quantity}x {self.book_listing.title} in Cart {self.cart.id}"
+        return f"{self.quantity}x {self.book_listing.title} in Cart {self.cart_id}"
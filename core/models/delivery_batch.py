@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+from django.db import models
+
+from core.constants import BATCH_STATUS_CHOICES
+from core.models.user import User
+
+
+class DeliveryBatch(models.Model):
+    """
+    Represents a group of ready-to-ship orders that one courier can deliver in a single trip.
+
+    Orders are grouped by the first digits of their postal code and their city,
+    and a batch stops accepting orders once it reaches its size or value cap.
+    Couriers claim a whole open batch at once.
+
+    :ivar postal_prefix: Leading characters of the postal codes in the batch.
+    :ivar city: Normalised (lower-case) city shared by the orders in the batch.
+    :ivar status: Whether the batch is still open or has been claimed.
+    :ivar courier: ForeignKey linking a claimed batch to its courier.
+    :ivar order_count: Number of orders currently in the batch.
+    :ivar total_value: Sum of the total prices of the orders in the batch.
+    :ivar created_at: The timestamp indicating when the batch was started.
+    :ivar updated_at: The timestamp indicating when the batch was last changed.
+    """
+
+    postal_prefix = models.CharField(max_length=20)
+    city = models.CharField(max_length=100)
+    status = models.CharField(
+        max_length=10, choices=BATCH_STATUS_CHOICES, default="open"
+    )
+    courier = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="delivery_batches",
+    )
+    order_count = models.PositiveIntegerField(default=0)
+    total_value = models.DecimalField(
+        max_digits=12, decimal_places=2, default=Decimal("0.00")
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "postal_prefix", "city"],
+                name="delivery_batch_lookup_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"Batch {self.id} ({self.postal_prefix}*, {self.city}) - {self.status}"
@@ -22,4 +22,4 @@ class DeliveryIssue(models.Model):
     reported_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self) -> str:
-        return f"Issue for Order {self.order_assignment.order.id}: {self.issue_description[:50]}..."
+        return f"Issue for Order {self.order_assignment.order_id}: {self.issue_description[:50]}..."
@@ -1,6 +1,10 @@
+from decimal import Decimal
+
 from django.db import models
 
 from core.constants import STATUS_CHOICES
+from core.models.delivery_batch import DeliveryBatch
+from core.models.shop_daily_sales import ShopDailySales
 from core.models.user import User
 
 
@@ -14,18 +18,29 @@ class Order(models.Model):
 
     :ivar user: ForeignKey linking the order to a user.
     :ivar status: The status of the order (Pending, Completed, Cancelled).
-    :ivar placed_at: The timestamp indicating when the order was placed.
+    :ivar placed_at: The timestamp indicating when the order was placed, indexed for
+        date-range queries such as the sales export.
+    :ivar subtotal: The pre-tax amount for the order, stored at placement.
+    :ivar tax_amount: The tax charged on the order, stored at placement.
     :ivar total_price: The total amount for the order.
     :ivar address: The street address for shipping.
     :ivar city: The city where the order is being shipped.
     :ivar state: The state or region for the shipping address.
     :ivar postal_code: The postal/zip code for shipping.
     :ivar country: The country where the order is being shipped.
+    :ivar delivery_batch: ForeignKey linking a ready-to-ship order to the delivery
+        batch it was grouped into, if any.
     """
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="orders")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
-    placed_at = models.DateTimeField(auto_now_add=True)
+    placed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    subtotal = models.DecimalField(
+        max_digits=10, decimal_places=2, default=Decimal("0.00")
+    )
+    tax_amount = models.DecimalField(
+        max_digits=10, decimal_places=2, default=Decimal("0.00")
+    )
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
 
     # Address details
@@ -35,5 +50,38 @@ class Order(models.Model):
     postal_code = models.CharField(max_length=20, default="000000")
     country = models.CharField(max_length=100, default="Not Provided")
 
+    delivery_batch = models.ForeignKey(
+        DeliveryBatch,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="orders",
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remembers the status an order was loaded with so changes can be detected on save.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the order and keeps the shops' daily sales rollups in step with status changes.
+
+        New orders are not counted here because their items do not exist yet; the
+        checkout calls :meth:`ShopDailySales.record_order_placed` once they do.
+
+        :param args: Positional arguments passed to the parent `save` method.
+        :param kwargs: Keyword arguments passed to the parent `save` method.
+        """
+        old_status = getattr(self, "_loaded_status", None)
+        super().save(*args, **kwargs)
+        if old_status is not None and old_status != self.status:
+            ShopDailySales.record_status_change(self, old_status, self.status)
+        self._loaded_status = self.status
+
     def __str__(self):
         return f"Order {self.id} for {self.user.email} - {self.status}"
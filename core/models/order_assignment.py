@@ -27,5 +27,13 @@ class OrderAssignment(models.Model):
 
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Serves the courier's delivery history, paged newest first
+            models.Index(
+                fields=["courier", "-updated_at"], name="assignment_history_idx"
+            ),
+        ]
+
     def __str__(self) -> str:
-        return f"Order {self.order.id} assigned to {self.courier.email} on {self.assigned_at}"
+        return f"Order {self.order_id} assigned to {self.courier.email} on {self.assigned_at}"
@@ -63,4 +63,4 @@ class OrderItem(models.Model):
         super().save(*args, **kwargs)
 
     def __str__(self) -> str:
-        return f"{self.quantity}x {self.book_listing.title} in Order {self.order.id} - ${self.purchase_price}"
+        return f"{self.quantity}x {self.book_listing.title} in Order {self.order_id} - ${self.purchase_price}"
@@ -0,0 +1,129 @@
+from datetime import datetime, time
+from decimal import Decimal
+
+from django.db import models
+from django.db.models import DecimalField, F, Sum
+from django.utils import timezone
+
+from core.models.order import Order
+from core.models.order_item import OrderItem
+
+
+def month_start(day):
+    """
+    Returns the first day of the month containing ``day``.
+
+    :param day: Any date in the month.
+    :type day: datetime.date
+    :return: The first day of that month.
+    :rtype: datetime.date
+    """
+    return day.replace(day=1)
+
+
+def next_month_start(month):
+    """
+    Returns the first day of the month after ``month``.
+
+    :param month: The first day of a month.
+    :type month: datetime.date
+    :return: The first day of the following month.
+    :rtype: datetime.date
+    """
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+class PlatformMonthlySales(models.Model):
+    """
+    Platform-wide, per-month rollup of order figures used by the admin charts.
+
+    Each row covers the orders placed in one calendar month (in the project's
+    time zone). Rows are updated incrementally as orders are placed, so the
+    admin analytics read a few dozen rows instead of scanning every order and
+    order item. Closed months can be recomputed from the raw tables with the
+    ``rebuild_platform_monthly_sales`` management command.
+
+    :ivar month: The first day of the month the counted orders were placed in.
+    :ivar orders: Number of orders placed in the month.
+    :ivar items_sold: Total quantity of items in those orders.
+    :ivar revenue: Gross value of the items in those orders.
+    """
+
+    # Share of each sale the platform keeps; sellers receive the rest
+    PLATFORM_SHARE = Decimal("0.20")
+
+    month = models.DateField(unique=True)
+    orders = models.PositiveIntegerField(default=0)
+    items_sold = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal("0.00")
+    )
+
+    @property
+    def platform_revenue(self):
+        """The platform's share of the month's gross revenue."""
+        return self.revenue * self.PLATFORM_SHARE
+
+    @classmethod
+    def record_order_placed(cls, order):
+        """
+        Counts a newly placed order. Call this once its order items exist.
+
+        :param order: The order that was just placed.
+        :type order: core.models.order.Order
+        """
+        totals = order.order_items.aggregate(
+            total_quantity=Sum("quantity"),
+            total_sales=Sum(
+                F("purchase_price") * F("quantity"),
+                output_field=DecimalField(max_digits=14, decimal_places=2),
+            ),
+        )
+        month = month_start(timezone.localdate(order.placed_at))
+        rollup, _ = cls.objects.get_or_create(month=month)
+        cls.objects.filter(pk=rollup.pk).update(
+            orders=F("orders") + 1,
+            items_sold=F("items_sold") + (totals["total_quantity"] or 0),
+            revenue=F("revenue") + (totals["total_sales"] or 0),
+        )
+
+    @classmethod
+    def rebuild(cls, month):
+        """
+        Recomputes one month's row from the raw order tables, replacing any existing row.
+
+        Running it twice gives the same result. Only rebuild months that are over,
+        since orders placed while it runs could otherwise be missed.
+
+        :param month: The first day of the month to rebuild.
+        :type month: datetime.date
+        :return: The rebuilt row.
+        :rtype: PlatformMonthlySales
+        """
+        start = timezone.make_aware(datetime.combine(month, time.min))
+        end = timezone.make_aware(datetime.combine(next_month_start(month), time.min))
+        placed = {"placed_at__gte": start, "placed_at__lt": end}
+
+        totals = OrderItem.objects.filter(
+            order__placed_at__gte=start, order__placed_at__lt=end
+        ).aggregate(
+            total_quantity=Sum("quantity"),
+            total_sales=Sum(
+                F("purchase_price") * F("quantity"),
+                output_field=DecimalField(max_digits=14, decimal_places=2),
+            ),
+        )
+        rollup, _ = cls.objects.update_or_create(
+            month=month,
+            defaults={
+                "orders": Order.objects.filter(**placed).count(),
+                "items_sold": totals["total_quantity"] or 0,
+                "revenue": totals["total_sales"] or Decimal("0.00"),
+            },
+        )
+        return rollup
+
+    def __str__(self):
+        return f"Platform sales for {self.month:%b %Y}"
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 from core.models.user import User
 
@@ -17,5 +18,20 @@ class Shop(models.Model):
     name = models.CharField(max_length=255, null=False, blank=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="shops")
 
+    def save(self, *args, **kwargs):
+        """
+        Saves the shop and marks its listings as updated.
+
+        Book cards show the shop name, so touching ``updated_at`` on the shop's
+        listings expires their cached cards when the shop is renamed.
+
+        :param args: Positional arguments passed to the parent `save` method.
+        :param kwargs: Keyword arguments passed to the parent `save` method.
+        """
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            self.book_listings.update(updated_at=timezone.now())
+
     def __str__(self):
         return self.name
@@ -0,0 +1,112 @@
+from decimal import Decimal
+
+from django.db import models
+from django.db.models import DecimalField, F, Sum
+from django.utils import timezone
+
+from core.models.shop import Shop
+
+
+class ShopDailySales(models.Model):
+    """
+    Per-shop, per-day rollup of sales figures used by the seller dashboard.
+
+    Each row covers the orders placed on one calendar day (in the project's time
+    zone) that contain at least one item from the shop. Rows are updated
+    incrementally when orders are placed or change status, so the dashboard only
+    has to sum a handful of rows instead of scanning the shop's whole history.
+
+    :ivar shop: ForeignKey linking the rollup row to a shop.
+    :ivar date: The day on which the counted orders were placed.
+    :ivar orders: Number of orders containing the shop's items.
+    :ivar pending_orders: Number of those orders that are currently pending.
+    :ivar items_sold: Quantity of the shop's items in completed orders.
+    :ivar revenue: Gross value of the shop's items in completed orders.
+    """
+
+    shop = models.ForeignKey(Shop, on_delete=models.CASCADE, related_name="daily_sales")
+    date = models.DateField()
+    orders = models.PositiveIntegerField(default=0)
+    pending_orders = models.PositiveIntegerField(default=0)
+    items_sold = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(
+        max_digits=12, decimal_places=2, default=Decimal("0.00")
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["shop", "date"], name="unique_shop_daily_sales"
+            )
+        ]
+
+    @classmethod
+    def _apply(cls, order, orders=0, pending=0, sold_sign=0):
+        """
+        Adds one order's contribution to the rollup rows of every shop in it.
+
+        :param order: The order whose items should be counted.
+        :type order: core.models.order.Order
+        :param orders: Delta applied to ``orders`` for each shop.
+        :type orders: int
+        :param pending: Delta applied to ``pending_orders`` for each shop.
+        :type pending: int
+        :param sold_sign: ``1`` to add the order's items to ``items_sold`` and
+            ``revenue``, ``-1`` to remove them, ``0`` to leave them alone.
+        :type sold_sign: int
+        """
+        day = timezone.localdate(order.placed_at)
+        per_shop = order.order_items.values("book_listing__shop").annotate(
+            shop_quantity=Sum("quantity"),
+            shop_sales=Sum(
+                F("purchase_price") * F("quantity"),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+        )
+        for row in per_shop:
+            rollup, _ = cls.objects.get_or_create(
+                shop_id=row["book_listing__shop"], date=day
+            )
+            cls.objects.filter(pk=rollup.pk).update(
+                orders=F("orders") + orders,
+                pending_orders=F("pending_orders") + pending,
+                items_sold=F("items_sold") + sold_sign * row["shop_quantity"],
+                revenue=F("revenue") + sold_sign * row["shop_sales"],
+            )
+
+    @classmethod
+    def record_order_placed(cls, order):
+        """
+        Counts a newly placed order. Call this once its order items exist.
+
+        :param order: The order that was just placed.
+        :type order: core.models.order.Order
+        """
+        cls._apply(
+            order,
+            orders=1,
+            pending=int(order.status == "pending"),
+            sold_sign=int(order.status == "completed"),
+        )
+
+    @classmethod
+    def record_status_change(cls, order, old_status, new_status):
+        """
+        Moves an order between the pending and completed buckets after a status change.
+
+        :param order: The order whose status changed.
+        :type order: core.models.order.Order
+        :param old_status: The status the order had before the change.
+        :type old_status: str
+        :param new_status: The status the order has now.
+        :type new_status: str
+        """
+        if old_status == new_status:
+            return
+        pending = int(new_status == "pending") - int(old_status == "pending")
+        sold_sign = int(new_status == "completed") - int(old_status == "completed")
+        if pending or sold_sign:
+            cls._apply(order, pending=pending, sold_sign=sold_sign)
+
+    def __str__(self):
+        return f"Sales for {self.shop.name} on {self.date}"
@@ -1,5 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
+from core.models.shop import Shop
 from core.models.user import ROLE_CHOICES
 from core.models.user import User
 
@@ -25,5 +27,55 @@ class UpgradeRequest(models.Model):
     requested_at = models.DateTimeField(auto_now_add=True)
     approved = models.BooleanField(default=False)
 
+    @classmethod
+    def approve(cls, requests):
+        """
+        Approves upgrade requests in bulk and provisions the new roles straight away.
+
+        In one transaction, each user is moved to their requested role and stamped
+        with ``approved_at``, and new sellers without a shop get a default one via
+        ``bulk_create``. Signing in and opening the seller pages then need no
+        further checks or set-up. Requests that are already approved are skipped.
+
+        :param requests: The upgrade requests to approve.
+        :type requests: django.db.models.QuerySet
+        :return: The number of requests approved.
+        :rtype: int
+        """
+        with transaction.atomic():
+            pending = list(
+                requests.filter(approved=False)
+                .select_related("user")
+                .select_for_update(of=("self",))
+            )
+            if not pending:
+                return 0
+
+            now = timezone.now()
+            users_by_role = {}
+            for upgrade_request in pending:
+                users_by_role.setdefault(upgrade_request.target_role, {})[
+                    upgrade_request.user_id
+                ] = upgrade_request.user
+            for role, users in users_by_role.items():
+                User.objects.filter(pk__in=users).update(role=role, approved_at=now)
+
+            sellers = users_by_role.get("seller", {})
+            has_shop = set(
+                Shop.objects.filter(user_id__in=sellers).values_list(
+                    "user_id", flat=True
+                )
+            )
+            Shop.objects.bulk_create(
+                [
+                    Shop(name=f"{user.name}'s Shop", user=user)
+                    for user_id, user in sellers.items()
+                    if user_id not in has_shop
+                ]
+            )
+
+            cls.objects.filter(pk__in=[r.pk for r in pending]).update(approved=True)
+        return len(pending)
+
     def __str__(self):
         return f"Upgrade Request by {self.user.email} to {self.target_role}"
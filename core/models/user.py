@@ -14,11 +14,14 @@ class User(models.Model):
     :ivar email: A unique email address used for authentication and identification.
     :ivar name: The full name of the user.
     :ivar role: The role of the user within the system, chosen from predefined options
+    :ivar approved_at: When an admin last approved an upgrade request for this user.
+        Couriers may only sign in once this is set.
     """
 
     email = models.EmailField(unique=True, null=False, blank=False)
     name = models.CharField(max_length=255)
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default="buyer")
+    approved_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return self.email
@@ -0,0 +1,89 @@
+"""
+Database routing between the primary database and read replicas.
+
+All writes go to the primary (``default``). Reads go to the primary too, unless
+the current view has opted in with :func:`core.utils.decorators.read_from_replica`,
+in which case they are spread over the aliases in ``settings.DATABASE_REPLICAS``.
+
+Replicas lag behind the primary, so a client that has just written is pinned to
+the primary for a short while (see :class:`core.middleware.PrimaryPinningMiddleware`),
+and once a request has written anything its remaining reads use the primary.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+PRIMARY_DB = "default"
+
+_replica_reads = ContextVar("replica_reads", default=False)
+_wrote_to_primary = ContextVar("wrote_to_primary", default=False)
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+@contextmanager
+def replica_reads():
+    """
+    Sends reads made inside the block to a replica, if any are configured.
+    """
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def _record_writes(execute, sql, params, many, context):
+    """
+    ``execute_wrapper`` flagging statements that modify data on the primary.
+    """
+    if sql.lstrip().upper().startswith(WRITE_STATEMENTS):
+        _wrote_to_primary.set(True)
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def track_primary_writes():
+    """
+    Tracks whether anything is written to the primary inside the block.
+
+    Writes are detected from the statements run on the primary connection rather
+    than from routing decisions, because ``get_or_create`` and similar calls ask
+    for the write database even when they end up only reading.
+
+    :return: A callable returning ``True`` once a write has run.
+    :rtype: collections.abc.Iterator[collections.abc.Callable[[], bool]]
+    """
+    token = _wrote_to_primary.set(False)
+    try:
+        with connections[PRIMARY_DB].execute_wrapper(_record_writes):
+            yield _wrote_to_primary.get
+    finally:
+        _wrote_to_primary.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Routes writes to the primary and opted-in reads to a random replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = getattr(settings, "DATABASE_REPLICAS", [])
+        if not replicas or not _replica_reads.get() or _wrote_to_primary.get():
+            return PRIMARY_DB
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication
+        return db == PRIMARY_DB
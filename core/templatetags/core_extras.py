@@ -1,4 +1,7 @@
 from django import template
+from django.utils.safestring import mark_safe
+
+from core.utils.book_cards import render_book_cards
 
 register = template.Library()
 
@@ -14,3 +17,10 @@ def bootstrap_alert_class(message_tag):
         "error": "danger",
     }
     return f"alert-{tag_map.get(message_tag, 'info')}"
+
+
+@register.simple_tag
+def book_cards(books, template_name):
+    """Renders a card per listing, served from the fragment cache where possible"""
+    cards, _ = render_book_cards(books, template_name)
+    return mark_safe("".join(cards))
@@ -0,0 +1,184 @@
+"""
+Groups ready-to-ship orders into delivery batches by postal-code prefix and city.
+
+Batches are maintained incrementally: an order joins a batch when it becomes
+ready to ship and leaves it when it is unmarked or claimed on its own. Each
+batch is capped by order count and total value so a single trip stays
+manageable. Couriers claim a whole batch with one conditional ``UPDATE``,
+which also assigns every order still in it.
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+
+from core.models.delivery_batch import DeliveryBatch
+from core.models.order import Order
+from core.models.order_assignment import OrderAssignment
+from core.utils.pagination import keyset_paginate
+
+POSTAL_PREFIX_LENGTH = 3
+MAX_BATCH_ORDERS = 10
+MAX_BATCH_VALUE = Decimal("2000.00")
+OPEN_BATCHES_PAGE_SIZE = 20
+
+
+def batch_key(order):
+    """
+    Returns the ``(postal_prefix, city)`` pair an order is grouped by.
+
+    :param order: The order to group.
+    :type order: core.models.order.Order
+    :return: The postal-code prefix and normalised city.
+    :rtype: tuple[str, str]
+    """
+    postal_prefix = order.postal_code.strip().replace(" ", "")[:POSTAL_PREFIX_LENGTH]
+    return postal_prefix, order.city.strip().lower()
+
+
+def add_to_batch(order):
+    """
+    Puts a ready-to-ship order into an open batch for its area, starting one if needed.
+
+    Joining a batch is a conditional ``UPDATE`` that re-checks the caps, so two
+    orders racing for the last slot cannot overfill it.
+
+    :param order: The order that just became ready to ship.
+    :type order: core.models.order.Order
+    :return: The batch the order joined.
+    :rtype: core.models.delivery_batch.DeliveryBatch
+    """
+    postal_prefix, city = batch_key(order)
+    price = order.total_price
+    with transaction.atomic():
+        candidates = DeliveryBatch.objects.filter(
+            status="open",
+            postal_prefix=postal_prefix,
+            city=city,
+            order_count__lt=MAX_BATCH_ORDERS,
+            total_value__lte=MAX_BATCH_VALUE - price,
+        ).order_by("created_at", "pk")
+        for batch in candidates[:3]:
+            joined = DeliveryBatch.objects.filter(
+                pk=batch.pk,
+                status="open",
+                order_count__lt=MAX_BATCH_ORDERS,
+                total_value__lte=MAX_BATCH_VALUE - price,
+            ).update(
+                order_count=F("order_count") + 1, total_value=F("total_value") + price
+            )
+            if joined:
+                break
+        else:
+            batch = DeliveryBatch.objects.create(
+                postal_prefix=postal_prefix,
+                city=city,
+                order_count=1,
+                total_value=price,
+            )
+        Order.objects.filter(pk=order.pk).update(delivery_batch=batch)
+    order.delivery_batch = batch
+    return batch
+
+
+def remove_from_batch(order):
+    """
+    Takes an order out of its open batch, deleting the batch if it becomes empty.
+
+    Orders in claimed batches are left alone, as the batch records the trip.
+
+    :param order: The order leaving its batch.
+    :type order: core.models.order.Order
+    """
+    batch_id = order.delivery_batch_id
+    if batch_id is None:
+        return
+    with transaction.atomic():
+        left = DeliveryBatch.objects.filter(pk=batch_id, status="open").update(
+            order_count=F("order_count") - 1,
+            total_value=F("total_value") - order.total_price,
+        )
+        if not left:
+            return
+        Order.objects.filter(pk=order.pk).update(delivery_batch=None)
+        DeliveryBatch.objects.filter(pk=batch_id, order_count=0).delete()
+    order.delivery_batch = None
+
+
+def open_batches_page(cursor=None, page_size=OPEN_BATCHES_PAGE_SIZE):
+    """
+    Returns one page of open batches, oldest first.
+
+    :param cursor: The ``next_cursor`` of the previous page, if any.
+    :type cursor: str | None
+    :param page_size: Maximum number of batches on the page.
+    :type page_size: int
+    :return: The page of batches and the cursor for the next one.
+    :rtype: core.utils.pagination.KeysetPage
+    """
+    batches = DeliveryBatch.objects.filter(status="open", order_count__gt=0)
+    return keyset_paginate(batches, "created_at", cursor, page_size)
+
+
+def claim_batch(batch_id, courier):
+    """
+    Atomically claims an open batch and assigns every claimable order in it to the courier.
+
+    :param batch_id: Id of the batch to claim.
+    :type batch_id: int
+    :param courier: The courier claiming the batch.
+    :type courier: core.models.user.User
+    :return: Ids of the orders assigned, or ``None`` if the batch was not open.
+    :rtype: list[int] | None
+    """
+    with transaction.atomic():
+        # Only one concurrent caller can move the batch out of "open"
+        claimed = DeliveryBatch.objects.filter(pk=batch_id, status="open").update(
+            status="claimed", courier=courier
+        )
+        if not claimed:
+            return None
+
+        order_ids = list(
+            Order.objects.select_for_update(skip_locked=True, of=("self",))
+            .filter(
+                delivery_batch_id=batch_id,
+                status="ready_to_ship",
+                order_assignment__isnull=True,
+            )
+            .values_list("id", flat=True)
+        )
+        Order.objects.filter(id__in=order_ids, status="ready_to_ship").update(
+            status="shipped"
+        )
+        OrderAssignment.objects.bulk_create(
+            [
+                OrderAssignment(order_id=order_id, courier=courier)
+                for order_id in order_ids
+            ]
+        )
+    return order_ids
+
+
+def rebuild_batches():
+    """
+    Discards all open batches and regroups every unassigned ready-to-ship order.
+
+    Used to backfill batches for orders that became ready before batching existed,
+    or to repack batches after the caps change.
+
+    :return: The number of orders placed into batches.
+    :rtype: int
+    """
+    with transaction.atomic():
+        DeliveryBatch.objects.filter(status="open").delete()
+        orders = Order.objects.filter(
+            status="ready_to_ship", order_assignment__isnull=True
+        ).order_by("placed_at", "pk")
+        count = 0
+        for order in orders.iterator(chunk_size=1000):
+            order.delivery_batch_id = None
+            add_to_batch(order)
+            count += 1
+    return count
@@ -0,0 +1,558 @@
+"""
+Per-endpoint latency benchmarks, run by the ``bench`` management command.
+
+Every named URL of the buyer, seller, courier and auth apps has at least one
+:class:`Endpoint`: a page is requested with ``GET``, and a form or action is
+submitted with the ``POST`` the page itself would send. Each request runs
+through the Django test client in a transaction that is rolled back
+afterwards, so actions such as checkout or accepting an order can be measured
+repeatedly against the same data. Before each request the client is signed in
+afresh as the endpoint's role and is given any one-time form tokens the view
+expects.
+
+Results hold the latency percentiles of the measured requests, the number of
+queries and the response size, and can be compared with a saved baseline.
+"""
+
+import math
+import time
+from contextlib import ExitStack
+from importlib import import_module
+from typing import Callable, NamedTuple
+
+from django.contrib.auth.models import User as AuthUser
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models.book_listing import BookListing
+from core.models.cart_item import CartItem
+from core.models.delivery_batch import DeliveryBatch
+from core.models.order import Order
+from core.models.order_assignment import OrderAssignment
+from core.models.shop import Shop
+from core.models.user import User
+
+BENCH_APPS = ("auths", "buyer", "seller", "courier")
+BENCH_PASSWORD = "marketplace"
+FORM_TOKEN = "bench-form-token"
+
+# ``seed_marketplace`` options for each data scale
+SCALES = {
+    "small": {
+        "buyers": 50,
+        "sellers": 10,
+        "couriers": 5,
+        "listings": 1000,
+        "carts": 20,
+        "orders": 300,
+        "reviews": 100,
+        "delivery_issues": 10,
+    },
+    "medium": {
+        "buyers": 500,
+        "sellers": 50,
+        "couriers": 20,
+        "listings": 20000,
+        "carts": 200,
+        "orders": 5000,
+        "reviews": 2000,
+        "delivery_issues": 100,
+    },
+    "large": {
+        "buyers": 5000,
+        "sellers": 300,
+        "couriers": 100,
+        "listings": 200000,
+        "carts": 2000,
+        "orders": 50000,
+        "reviews": 20000,
+        "delivery_issues": 1000,
+    },
+}
+
+
+class Endpoint(NamedTuple):
+    """
+    One request to benchmark.
+
+    :ivar url_name: The URL pattern name.
+    :ivar role: The role of the signed-in user, or ``None`` to stay anonymous.
+    :ivar method: ``"GET"`` or ``"POST"``.
+    :ivar args: Returns the URL arguments from a :class:`BenchData`.
+    :ivar data: Returns the query string or form data from a :class:`BenchData`.
+    :ivar session: Returns session values to set before each request, such as
+        the one-time form token the view checks.
+    :ivar skip: Why the endpoint is not benchmarked, if it is not.
+    """
+
+    url_name: str
+    role: str | None
+    method: str = "GET"
+    args: Callable | None = None
+    data: Callable | None = None
+    session: Callable | None = None
+    skip: str | None = None
+
+    @property
+    def label(self):
+        return f"{self.method} {self.url_name}"
+
+
+def _form_token(key):
+    return lambda bench: {key: FORM_TOKEN}
+
+
+def _listing_csv(bench):
+    rows = "".join(
+        f"Bench Book {n},Bench Author,used,{n % 50 + 5}\n" for n in range(100)
+    )
+    return {
+        "form_token": FORM_TOKEN,
+        "format": "csv",
+        "listings_file": SimpleUploadedFile(
+            "listings.csv", f"title,author,condition,price\n{rows}".encode()
+        ),
+    }
+
+
+_LISTING_FORM = {
+    "form_token": FORM_TOKEN,
+    "title": "Bench Book",
+    "author": "Bench Author",
+    "condition": "used",
+    "price": "12.50",
+    "descriptions": "Added by the benchmark.",
+}
+_NEW_PASSWORD = "Bench-pass-2!"
+
+ENDPOINTS = [
+    # Auth
+    Endpoint("login", None),
+    Endpoint(
+        "login",
+        None,
+        "POST",
+        data=lambda bench: {"email": bench.buyer.email, "password": BENCH_PASSWORD},
+    ),
+    Endpoint("register", None),
+    Endpoint(
+        "register",
+        None,
+        "POST",
+        data=lambda bench: {
+            "form_token": FORM_TOKEN,
+            "name": "Bench Buyer",
+            "email": "bench.new@example.com",
+            "password": _NEW_PASSWORD,
+            "confirm_password": _NEW_PASSWORD,
+            "role": "buyer",
+        },
+        session=_form_token("register_form_token"),
+    ),
+    Endpoint("logout", "buyer"),
+    Endpoint(
+        "update_email",
+        "buyer",
+        "POST",
+        data=lambda bench: {"new_email": "bench.changed@example.com"},
+    ),
+    Endpoint(
+        "change_password",
+        "buyer",
+        "POST",
+        data=lambda bench: {
+            "current_password": BENCH_PASSWORD,
+            "new_password": _NEW_PASSWORD,
+            "confirm_password": _NEW_PASSWORD,
+        },
+    ),
+    # Buyer
+    Endpoint("buyer-landing", "buyer"),
+    Endpoint("buyer-book-details", "buyer", args=lambda bench: [bench.book_id]),
+    Endpoint("buyer-book-details", "buyer", "POST", args=lambda bench: [bench.book_id]),
+    Endpoint("buyer-cart", "buyer"),
+    Endpoint(
+        "buyer-cart",
+        "buyer",
+        "POST",
+        data=lambda bench: {"item_id": bench.cart_item_id, "action": "remove"},
+    ),
+    Endpoint("buyer-checkout", "buyer"),
+    Endpoint(
+        "buyer-checkout",
+        "buyer",
+        "POST",
+        data=lambda bench: {
+            "form_token": FORM_TOKEN,
+            "address": "1, Jalan Bench",
+            "city": "Cyberjaya",
+            "state": "Selangor",
+            "postal_code": "63000",
+            "country": "Malaysia",
+            "card_number": "4111 1111 1111 1111",
+            "expiry_date": "12/30",
+            "cvv": "123",
+        },
+        session=_form_token("checkout_form_token"),
+    ),
+    Endpoint("buyer-orders", "buyer"),
+    Endpoint("buyer-order-details", "buyer", args=lambda bench: [bench.order_id]),
+    Endpoint("buyer-profile", "buyer"),
+    Endpoint(
+        "buyer-review",
+        "buyer",
+        "POST",
+        args=lambda bench: [bench.review_shop_id],
+        data=lambda bench: {
+            "form_token": FORM_TOKEN,
+            "rating": "5",
+            "comment": "Benchmark review.",
+        },
+        session=lambda bench: {f"review_token_{bench.review_shop_id}": FORM_TOKEN},
+    ),
+    Endpoint("buyer-upgrade-to-seller", "buyer"),
+    Endpoint("buyer-upgrade-to-seller", "buyer", "POST"),
+    # Seller
+    Endpoint("seller-book-listings", "seller"),
+    Endpoint("seller-add-book", "seller"),
+    Endpoint(
+        "seller-add-book",
+        "seller",
+        "POST",
+        data=lambda bench: _LISTING_FORM,
+        session=_form_token("add_book_form_token"),
+    ),
+    Endpoint("seller-import-books", "seller"),
+    Endpoint(
+        "seller-import-books",
+        "seller",
+        "POST",
+        data=_listing_csv,
+        session=_form_token("import_books_form_token"),
+    ),
+    Endpoint(
+        "seller-bulk-update-books",
+        "seller",
+        "POST",
+        data=lambda bench: {"action": "discount", "value": "10", "apply_to": "filter"},
+    ),
+    Endpoint(
+        "seller-delete-book", "seller", "POST", args=lambda bench: [bench.listing_id]
+    ),
+    Endpoint("seller-edit-book", "seller", args=lambda bench: [bench.listing_id]),
+    Endpoint(
+        "seller-edit-book",
+        "seller",
+        "POST",
+        args=lambda bench: [bench.listing_id],
+        data=lambda bench: _LISTING_FORM,
+        session=_form_token("edit_book_form_token"),
+    ),
+    Endpoint("seller-profile", "seller"),
+    Endpoint(
+        "update-shop-name",
+        "seller",
+        "POST",
+        data=lambda bench: {"new_shop_name": "Bench Books"},
+    ),
+    Endpoint("seller-orders", "seller"),
+    Endpoint("seller-export-sales", "seller"),
+    Endpoint(
+        "mark-order-ready",
+        "seller",
+        "POST",
+        args=lambda bench: [bench.pending_order_id],
+    ),
+    Endpoint("seller-dashboard", "seller"),
+    # Courier
+    Endpoint("courier-deliveries", "courier"),
+    Endpoint(
+        "courier-delivery-events",
+        "courier",
+        skip="Server-sent event stream that only ends when the client disconnects.",
+    ),
+    Endpoint(
+        "courier-accept-order",
+        "courier",
+        "POST",
+        args=lambda bench: [bench.ready_order_id],
+    ),
+    Endpoint(
+        "courier-accept-batch", "courier", "POST", args=lambda bench: [bench.batch_id]
+    ),
+    Endpoint(
+        "courier-update-assignment",
+        "courier",
+        "POST",
+        args=lambda bench: [bench.assignment_id],
+        data=lambda bench: {"action": "complete"},
+    ),
+    Endpoint(
+        "courier-report-issue", "courier", args=lambda bench: [bench.assignment_id]
+    ),
+    Endpoint(
+        "courier-report-issue",
+        "courier",
+        "POST",
+        args=lambda bench: [bench.assignment_id],
+        data=lambda bench: {
+            "form_token": FORM_TOKEN,
+            "issue_description": "Benchmark issue.",
+        },
+        session=lambda bench: {f"report_issue_token_{bench.assignment_id}": FORM_TOKEN},
+    ),
+    Endpoint("courier-profile", "courier"),
+]
+
+
+def bench_url_names():
+    """
+    Returns the names of every URL pattern in the benchmarked apps.
+
+    :rtype: set[str]
+    """
+    return {
+        pattern.name
+        for app in BENCH_APPS
+        for pattern in import_module(f"{app}.urls").urlpatterns
+        if pattern.name
+    }
+
+
+def _first_pk(queryset):
+    return queryset.values_list("pk", flat=True).first()
+
+
+class BenchData:
+    """
+    The users and objects the benchmarked requests act on, picked from seeded data.
+
+    The busiest buyer, seller and courier are chosen so each page shows as much
+    as the data allows. Any id is ``None`` if the data has no suitable object,
+    and endpoints needing it are then skipped.
+    """
+
+    def __init__(self):
+        self.buyer = (
+            User.objects.filter(role="buyer")
+            .annotate(
+                cart_items=Count("carts__cart_items", distinct=True),
+                order_count=Count("orders", distinct=True),
+            )
+            .order_by("-cart_items", "-order_count", "pk")
+            .first()
+        )
+        self.seller = (
+            User.objects.filter(role="seller", shops__isnull=False)
+            .annotate(listing_count=Count("shops__book_listings"))
+            .order_by("-listing_count", "pk")
+            .first()
+        )
+        self.courier = (
+            User.objects.filter(role="courier")
+            .annotate(assignment_count=Count("assigned_orders"))
+            .order_by("-assignment_count", "pk")
+            .first()
+        )
+        self.users = {
+            "buyer": self.buyer,
+            "seller": self.seller,
+            "courier": self.courier,
+        }
+        self.logins = {
+            role: AuthUser.objects.get(email=user.email)
+            for role, user in self.users.items()
+            if user is not None
+        }
+
+        # Buyer: a book from the same shop as the cart, so adding it succeeds
+        cart_listings = BookListing.objects.filter(cart_items__cart__user=self.buyer)
+        self.cart_item_id = _first_pk(
+            CartItem.objects.filter(cart__user=self.buyer).order_by("pk")
+        )
+        unsold = BookListing.objects.filter(bought=False)
+        cart_shop = cart_listings.values("shop").first()
+        self.book_id = _first_pk(
+            unsold.filter(**({"shop": cart_shop["shop"]} if cart_shop else {}))
+            .exclude(pk__in=cart_listings.values("pk"))
+            .order_by("pk")
+        ) or _first_pk(unsold.order_by("pk"))
+        self.order_id = _first_pk(self.buyer.orders.order_by("-placed_at"))
+        self.review_shop_id = _first_pk(
+            Shop.objects.filter(
+                book_listings__order_items__order__user=self.buyer,
+                book_listings__order_items__order__status="completed",
+            )
+            .exclude(reviews__user=self.buyer)
+            .order_by("pk")
+        ) or _first_pk(Shop.objects.order_by("pk"))
+
+        # Seller: one of their unsold listings and a pending order for their shop
+        shop = self.seller.shops.get() if self.seller else None
+        self.listing_id = _first_pk(unsold.filter(shop=shop).order_by("pk"))
+        self.pending_order_id = _first_pk(
+            Order.objects.filter(
+                status="pending", order_items__book_listing__shop=shop
+            ).order_by("pk")
+        )
+
+        # Courier: an unclaimed order and batch, and one of their open deliveries
+        self.ready_order_id = _first_pk(
+            Order.objects.filter(
+                status="ready_to_ship", order_assignment__isnull=True
+            ).order_by("pk")
+        )
+        self.batch_id = _first_pk(DeliveryBatch.objects.filter(status="open"))
+        assignments = OrderAssignment.objects.filter(courier=self.courier)
+        self.assignment_id = _first_pk(
+            assignments.filter(order__status="shipped").order_by("pk")
+        ) or _first_pk(assignments.order_by("pk"))
+
+
+def percentile(values, pct):
+    """
+    Returns a percentile of some values, interpolating between the nearest ranks.
+
+    :param values: The measured values.
+    :type values: list[float]
+    :param pct: The percentile, from 0 to 100.
+    :type pct: float
+    :rtype: float
+    """
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def send_request(client, endpoint, bench):
+    """
+    Signs the client in, sends one request and reads the whole response.
+
+    :return: The response, its size in bytes, its duration in seconds and the
+        queries it ran, as captured by ``CaptureQueriesContext``.
+    :rtype: tuple[django.http.HttpResponse, int, float, list[dict]]
+    """
+    client.cookies.clear()
+    if endpoint.role:
+        client.force_login(bench.logins[endpoint.role])
+    if endpoint.session:
+        session = client.session
+        session.update(endpoint.session(bench))
+        session.save()
+    url = reverse(
+        endpoint.url_name, args=endpoint.args(bench) if endpoint.args else None
+    )
+    data = endpoint.data(bench) if endpoint.data else None
+    send = client.post if endpoint.method == "POST" else client.get
+
+    with ExitStack() as stack:
+        stack.enter_context(transaction.atomic(using=DEFAULT_DB_ALIAS))
+        captures = [
+            stack.enter_context(CaptureQueriesContext(connections[alias]))
+            for alias in connections
+        ]
+        started = time.perf_counter()
+        response = send(url, data)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        duration = time.perf_counter() - started
+        transaction.set_rollback(True, using=DEFAULT_DB_ALIAS)
+    queries = [query for capture in captures for query in capture.captured_queries]
+    return response, size, duration, queries
+
+
+def run_endpoint(endpoint, bench, requests, warmup):
+    """
+    Benchmarks one endpoint.
+
+    :param endpoint: The endpoint to request.
+    :type endpoint: Endpoint
+    :param bench: The users and objects to request it with.
+    :type bench: BenchData
+    :param requests: Number of measured requests.
+    :type requests: int
+    :param warmup: Number of unmeasured requests sent first.
+    :type warmup: int
+    :return: Latency percentiles in milliseconds, the query count and response
+        size of the last request and its status code; or the reason the
+        endpoint was skipped or the error it raised.
+    :rtype: dict
+    """
+    if endpoint.skip:
+        return {"skipped": endpoint.skip}
+    if endpoint.role and endpoint.role not in bench.logins:
+        return {"skipped": f"No {endpoint.role} in the data."}
+    if endpoint.args and None in endpoint.args(bench):
+        return {"skipped": "No suitable object in the data."}
+
+    client = Client()
+    durations = []
+    try:
+        for n in range(warmup + requests):
+            response, size, duration, queries = send_request(client, endpoint, bench)
+            if n >= warmup:
+                durations.append(duration * 1000)
+    except Exception as exc:
+        return {"error": f"{type(exc).__name__}: {exc}"}
+    return {
+        "p50_ms": round(percentile(durations, 50), 3),
+        "p95_ms": round(percentile(durations, 95), 3),
+        "p99_ms": round(percentile(durations, 99), 3),
+        "queries": len(queries),
+        "bytes": size,
+        "status": response.status_code,
+    }
+
+
+def compare_results(results, baseline, threshold, min_delta_ms):
+    """
+    Lists the regressions of a benchmark run against a baseline run.
+
+    An endpoint regresses when it now fails, runs more queries, or its p95
+    latency grew by more than ``threshold`` (a fraction) and by more than
+    ``min_delta_ms``. Endpoints or scales missing from either run are ignored.
+
+    :param results: The ``scales`` of this run's report.
+    :type results: dict
+    :param baseline: The ``scales`` of the baseline report.
+    :type baseline: dict
+    :param threshold: The allowed relative p95 increase, e.g. ``0.2`` for 20%.
+    :type threshold: float
+    :param min_delta_ms: Increases smaller than this are treated as noise.
+    :type min_delta_ms: float
+    :return: One message per regression.
+    :rtype: list[str]
+    """
+    regressions = []
+    for scale, endpoints in results.items():
+        for label, result in endpoints.items():
+            before = baseline.get(scale, {}).get(label)
+            if not before or "skipped" in result or "skipped" in before:
+                continue
+            name = f"{scale} {label}"
+            if "error" in result:
+                if "error" not in before:
+                    regressions.append(f"{name}: now fails with {result['error']}")
+                continue
+            if "error" in before:
+                continue
+            if result["queries"] > before["queries"]:
+                regressions.append(
+                    f"{name}: {before['queries']} -> {result['queries']} queries"
+                )
+            limit = before["p95_ms"] * (1 + threshold)
+            delta = result["p95_ms"] - before["p95_ms"]
+            if result["p95_ms"] > limit and delta > min_delta_ms:
+                regressions.append(
+                    f"{name}: p95 {before['p95_ms']:.1f} -> {result['p95_ms']:.1f} ms "
+                    f"(+{delta / before['p95_ms']:.0%})"
+                )
+    return regressions
@@ -0,0 +1,87 @@
+"""
+Fragment caching for book cards.
+
+The buyer landing page and the seller listings page render one card per
+listing. Each rendered card is cached under a key built from the card template,
+the listing id and the listing's ``updated_at``. Editing a listing, or renaming
+its shop, therefore moves it to a new key, and the stale entry simply expires.
+
+A page fetches all of its cards with a single ``get_many`` and renders only
+the misses, so a warm grid costs one cache round trip however many books it
+shows. Card templates are rendered without a request, so they must not contain
+per-request output such as ``{% csrf_token %}``.
+"""
+
+import hashlib
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.template.loader import get_template
+
+# Keys change whenever a card's content can change, so this only bounds memory use
+BOOK_CARD_TIMEOUT = 24 * 60 * 60
+
+
+@lru_cache(maxsize=None)
+def _template_digest(template_name):
+    """
+    Returns a short digest of a card template's source.
+
+    Including it in the keys means a deploy that changes the markup never serves
+    cards rendered by the old template.
+
+    :param template_name: The card template.
+    :type template_name: str
+    :return: The first eight hex digits of the source's MD5.
+    :rtype: str
+    """
+    source = get_template(template_name).template.source
+    return hashlib.md5(source.encode()).hexdigest()[:8]
+
+
+def book_card_key(template_name, book):
+    """
+    Builds the cache key of one rendered book card.
+
+    :param template_name: The card template.
+    :type template_name: str
+    :param book: The listing shown on the card.
+    :type book: core.models.BookListing
+    :return: The cache key.
+    :rtype: str
+    """
+    return (
+        f"book-card:{_template_digest(template_name)}:"
+        f"{book.pk}:{book.updated_at.isoformat()}"
+    )
+
+
+def render_book_cards(books, template_name):
+    """
+    Renders a card per listing, reusing cached cards where possible.
+
+    Cards missing from the cache are rendered with ``book`` in the context and
+    stored with one ``set_many``.
+
+    :param books: The listings to render, in display order. Select the related
+        shop up front, since cards show its name.
+    :type books: collections.abc.Iterable[core.models.BookListing]
+    :param template_name: The card template.
+    :type template_name: str
+    :return: The rendered cards, in the same order, and how many were rendered
+        rather than read from the cache.
+    :rtype: tuple[list[str], int]
+    """
+    books = list(books)
+    keys = [book_card_key(template_name, book) for book in books]
+    cards = cache.get_many(keys)
+    template = get_template(template_name)
+    rendered = {
+        key: template.render({"book": book})
+        for key, book in zip(keys, books)
+        if key not in cards
+    }
+    if rendered:
+        cache.set_many(rendered, BOOK_CARD_TIMEOUT)
+        cards.update(rendered)
+    return [cards[key] for key in keys], len(rendered)
@@ -0,0 +1,88 @@
+"""
+Validators for conditional GET on personalised pages.
+
+Pages such as the catalog are cheap to validate but expensive to render. With
+``django.views.decorators.http.condition`` a browser that sends back the page's
+``ETag`` gets a bodiless ``304 Not Modified`` before the view runs any of its
+own queries or renders a template.
+
+These pages are personalised, though: the navigation depends on the user's
+role, forms embed a CSRF token, and flashed messages are shown once. The ETag
+therefore hashes the page's content version together with the user, their role
+and their CSRF cookie. While messages are waiting to be shown, no validators are
+sent, so the page always renders. ``Last-Modified`` carries the newest content
+timestamp; browsers send the ETag alongside it, and the ETag takes precedence.
+Pages whose content includes state without a timestamp (such as the user's
+cart) must not send ``Last-Modified``, since a client that only sends
+``If-Modified-Since`` would miss changes to that state.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.contrib import messages
+
+_STATE_ATTR = "_conditional_page_state"
+
+
+def page_etag(request, version):
+    """
+    Builds the ETag of a personalised page.
+
+    :param request: The HTTP request object, after ``allowed_roles`` has run.
+    :type request: django.http.HttpRequest
+    :param version: Anything whose string form changes whenever the page's
+        content does.
+    :return: The ETag, or ``None`` while flashed messages are pending.
+    :rtype: str | None
+    """
+    if len(messages.get_messages(request)):
+        return None
+    custom_user = getattr(request, "custom_user", None)
+    parts = (
+        request.user.pk,
+        custom_user.role if custom_user else "",
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        version,
+    )
+    return hashlib.md5("|".join(map(str, parts)).encode()).hexdigest()
+
+
+def page_validators(state_func):
+    """
+    Builds the keyword arguments of ``condition`` from one page state function.
+
+    ``state_func`` takes the view's arguments and returns ``(version,
+    last_modified)``, or ``None`` when the page cannot be validated (for example
+    when the object does not exist, so the view should answer with a 404).
+    ``last_modified`` may be ``None`` to send only the ETag. The function runs at
+    most once per request, however many validators use it.
+
+    :param state_func: The page state function.
+    :type state_func: collections.abc.Callable
+    :return: ``etag_func`` and ``last_modified_func`` for ``condition``.
+    :rtype: dict
+
+    Example::
+
+        @condition(**page_validators(catalog_state))
+        def landing_page(request):
+            pass
+    """
+
+    def state(request, *args, **kwargs):
+        if not hasattr(request, _STATE_ATTR):
+            setattr(request, _STATE_ATTR, state_func(request, *args, **kwargs))
+        return getattr(request, _STATE_ATTR)
+
+    def etag_func(request, *args, **kwargs):
+        page_state = state(request, *args, **kwargs)
+        return page_etag(request, page_state[0]) if page_state else None
+
+    def last_modified_func(request, *args, **kwargs):
+        page_state = state(request, *args, **kwargs)
+        if not page_state or len(messages.get_messages(request)):
+            return None
+        return page_state[1]
+
+    return {"etag_func": etag_func, "last_modified_func": last_modified_func}
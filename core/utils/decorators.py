@@ -1,7 +1,11 @@
+from asyncio import iscoroutinefunction
+
 from django.http import HttpResponseForbidden
 from functools import wraps
 from core.constants import ROLE_CHOICES
+from core.middleware import PRIMARY_PIN_COOKIE
 from core.models.user import User as CustomUser
+from core.routers import replica_reads
 
 
 def allowed_roles(roles):
@@ -17,6 +21,11 @@ def allowed_roles(roles):
     :raises: HttpResponseForbidden if the user is not authenticated or doesn't have the required role
     :raises: ValueError if any of the specified roles are not valid according to ROLE_CHOICES
 
+    Async views are supported too; the role lookup then uses the async ORM so the
+    event loop is never blocked.
+
+    The looked-up user is kept on ``request.custom_user`` for the view to reuse.
+
     Example::
 
         @allowed_roles(['seller', 'admin'])
@@ -33,7 +42,40 @@ def allowed_roles(roles):
                 f"Invalid role: {role}. Valid roles are: {', '.join(valid_roles)}"
             )
 
+    def check_role(custom_user):
+        if custom_user.role not in roles:
+            allowed_roles_str = ", ".join(roles)
+            return HttpResponseForbidden(
+                f"Access denied. This page requires one of the following roles: {allowed_roles_str}. "
+                f"Your current role is: {custom_user.role}"
+            )
+        return None
+
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                user = await request.auser()
+                if not user.is_authenticated:
+                    return HttpResponseForbidden(
+                        "You must be logged in to access this page."
+                    )
+
+                try:
+                    custom_user = await CustomUser.objects.aget(email=user.email)
+                except CustomUser.DoesNotExist:
+                    return HttpResponseForbidden(
+                        "Custom user not found. This is a system error - please contact support."
+                    )
+                denied = check_role(custom_user)
+                if denied is not None:
+                    return denied
+                request.custom_user = custom_user
+                return await view_func(request, *args, **kwargs)
+
+            return async_wrapper
+
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
             if not request.user.is_authenticated:
@@ -43,12 +85,10 @@ def allowed_roles(roles):
 
             try:
                 custom_user = CustomUser.objects.get(email=request.user.email)
-                if custom_user.role not in roles:
-                    allowed_roles_str = ", ".join(roles)
-                    return HttpResponseForbidden(
-                        f"Access denied. This page requires one of the following roles: {allowed_roles_str}. "
-                        f"Your current role is: {custom_user.role}"
-                    )
+                denied = check_role(custom_user)
+                if denied is not None:
+                    return denied
+                request.custom_user = custom_user
                 return view_func(request, *args, **kwargs)
             except CustomUser.DoesNotExist:
                 return HttpResponseForbidden(
@@ -58,3 +98,38 @@ def allowed_roles(roles):
         return wrapper
 
     return decorator
+
+
+def read_from_replica(view_func):
+    """
+    Serves a read-heavy view's queries from a read replica.
+
+    Only ``GET`` and ``HEAD`` requests are routed to a replica, and only while the
+    client is not pinned to the primary after a recent write (see
+    :class:`core.middleware.PrimaryPinningMiddleware`). Writes made by the view,
+    including ``get_or_create``, always go to the primary, and any reads after the
+    first write in the same request do too.
+
+    :param view_func: The view to decorate.
+    :return: The decorated view.
+
+    Example::
+
+        @login_required
+        @allowed_roles(["buyer"])
+        @read_from_replica
+        def landing_page(request):
+            pass
+    """
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if (
+            request.method not in ("GET", "HEAD")
+            or PRIMARY_PIN_COOKIE in request.COOKIES
+        ):
+            return view_func(request, *args, **kwargs)
+        with replica_reads():
+            return view_func(request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,100 @@
+"""
+Courier dispatch: listing claimable orders and claiming or releasing them atomically.
+
+Claims are decided by a single conditional ``UPDATE`` on the order's own status
+row, with no join, so when several couriers try to accept the same order at
+once exactly one of them wins and the others are told it is gone, without
+read-then-write races. This only holds because every writer of an order's
+status (sellers marking it ready, couriers completing it) changes it with an
+``UPDATE`` conditional on the status it expects, never a read-then-save.
+Listing available orders is a plain read with keyset pagination and takes no
+locks.
+"""
+
+from django.db import transaction
+
+from core.models.order import Order
+from core.models.order_assignment import OrderAssignment
+from core.utils.batching import add_to_batch, remove_from_batch
+from core.utils.pagination import keyset_paginate
+
+AVAILABLE_ORDERS_PAGE_SIZE = 20
+
+
+def available_orders():
+    """
+    Returns the orders couriers may claim, oldest first so none are starved.
+
+    :return: Ready-to-ship orders that have no courier assignment.
+    :rtype: django.db.models.QuerySet
+    """
+    return Order.objects.filter(
+        status="ready_to_ship", order_assignment__isnull=True
+    ).order_by("placed_at", "pk")
+
+
+def available_orders_page(cursor=None, page_size=AVAILABLE_ORDERS_PAGE_SIZE):
+    """
+    Returns one page of claimable orders in first-come, first-served order.
+
+    :param cursor: The ``next_cursor`` of the previous page, if any.
+    :type cursor: str | None
+    :param page_size: Maximum number of orders on the page.
+    :type page_size: int
+    :return: The page of orders and the cursor for the next one.
+    :rtype: core.utils.pagination.KeysetPage
+    """
+    return keyset_paginate(available_orders(), "placed_at", cursor, page_size)
+
+
+def claim_order(order_id, courier):
+    """
+    Atomically assigns a ready-to-ship order to a courier and marks it shipped.
+
+    If the order was waiting in an open delivery batch it is taken out of it.
+
+    :param order_id: Id of the order to claim.
+    :type order_id: int
+    :param courier: The courier claiming the order.
+    :type courier: core.models.user.User
+    :return: The new assignment, or ``None`` if the order was not claimable
+        (already taken, not ready, or missing).
+    :rtype: core.models.order_assignment.OrderAssignment | None
+    :raises django.db.IntegrityError: If a ready-to-ship order somehow already
+        has an assignment; the status change is rolled back.
+    """
+    with transaction.atomic():
+        # Only one concurrent caller can move the order out of ready_to_ship, and
+        # ready orders have no assignment, so the status alone decides the claim.
+        # Neither status counts towards the sales rollup, so no rollup update is needed.
+        claimed = Order.objects.filter(pk=order_id, status="ready_to_ship").update(
+            status="shipped"
+        )
+        if not claimed:
+            return None
+        assignment = OrderAssignment.objects.create(order_id=order_id, courier=courier)
+        remove_from_batch(assignment.order)
+        return assignment
+
+
+def release_order(assignment):
+    """
+    Atomically hands a shipped order back to the pool of available orders
+    and puts it into a delivery batch again.
+
+    :param assignment: The courier's assignment for the order.
+    :type assignment: core.models.order_assignment.OrderAssignment
+    :return: ``True`` if the order was released, ``False`` if it was no longer shipped.
+    :rtype: bool
+    """
+    with transaction.atomic():
+        released = Order.objects.filter(
+            pk=assignment.order_id, status="shipped"
+        ).update(status="ready_to_ship")
+        if not released:
+            return False
+        order = assignment.order
+        assignment.delete()
+        order.delivery_batch = None
+        add_to_batch(order)
+        return True
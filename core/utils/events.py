@@ -0,0 +1,144 @@
+"""
+In-process publish/subscribe for live courier updates.
+
+Views publish small events when an order becomes available to couriers or is
+taken off the board, and each open server-sent events connection holds a
+subscription that receives them. Subscribers are ``asyncio`` queues owned by
+the ASGI event loop, while publishers are usually sync views running in worker
+threads, so delivery hops onto the subscriber's loop with
+``call_soon_threadsafe``.
+
+The broker lives in process memory: every connected courier must be served by
+the same ASGI process that handles the publishing request. Run a single ASGI
+worker (threads are fine) or replace the broker with an external one before
+scaling out to several processes.
+"""
+
+import asyncio
+import json
+import threading
+
+from django.db import transaction
+
+ORDER_AVAILABLE = "order-available"
+ORDER_CLAIMED = "order-claimed"
+ORDER_WITHDRAWN = "order-withdrawn"
+
+# Events queued for a subscriber that stops reading are dropped beyond this
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class EventBroker:
+    """
+    Fans published events out to every current subscriber.
+
+    :ivar _subscribers: Maps each subscriber queue to the event loop that owns it.
+    :ivar _lock: Guards ``_subscribers`` against concurrent publishers.
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """
+        Registers a new subscriber on the running event loop.
+
+        :return: The queue that will receive ``(event, data)`` pairs.
+        :rtype: asyncio.Queue
+        """
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue):
+        """
+        Removes a subscriber. Unknown queues are ignored.
+
+        :param queue: A queue returned by :meth:`subscribe`.
+        :type queue: asyncio.Queue
+        """
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def publish(self, event, data):
+        """
+        Sends an event to every subscriber. Safe to call from any thread.
+
+        :param event: The event name, such as :data:`ORDER_AVAILABLE`.
+        :type event: str
+        :param data: A JSON-serialisable payload.
+        :type data: dict
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, (event, data))
+            except RuntimeError:
+                # The loop has been closed; the subscriber is gone
+                self.unsubscribe(queue)
+
+    @property
+    def subscriber_count(self):
+        """Number of currently connected subscribers."""
+        with self._lock:
+            return len(self._subscribers)
+
+
+def _offer(queue, item):
+    """Queues an event unless the subscriber has fallen too far behind."""
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        pass
+
+
+broker = EventBroker()
+
+
+def publish_on_commit(event, data):
+    """
+    Publishes an event once the current transaction commits, or immediately outside one.
+
+    Subscribers therefore never hear about changes that were rolled back.
+
+    :param event: The event name.
+    :type event: str
+    :param data: A JSON-serialisable payload.
+    :type data: dict
+    """
+    transaction.on_commit(lambda: broker.publish(event, data))
+
+
+def order_event_data(order):
+    """
+    Builds the payload describing an order on the couriers' board.
+
+    :param order: The order the event is about.
+    :type order: core.models.order.Order
+    :return: The order's id, placement time, total and destination.
+    :rtype: dict
+    """
+    return {
+        "order_id": order.id,
+        "placed_at": order.placed_at.isoformat(),
+        "total_price": str(order.total_price),
+        "city": order.city,
+        "postal_code": order.postal_code,
+    }
+
+
+def format_sse(event, data):
+    """
+    Encodes one event in the ``text/event-stream`` wire format.
+
+    :param event: The event name.
+    :type event: str
+    :param data: A JSON-serialisable payload.
+    :type data: dict
+    :return: The encoded event, terminated by a blank line.
+    :rtype: str
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
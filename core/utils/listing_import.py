@@ -0,0 +1,282 @@
+"""
+Streaming bulk import of book listings from CSV or JSONL files.
+
+Rows are parsed one at a time from the uploaded stream, validated against the
+same rules as the single-listing form, and inserted with ``bulk_create`` in
+fixed-size batches, so memory use stays flat however large the file is. Cover
+images can be supplied as a zip archive whose member names are referenced by
+each row's ``image`` column.
+"""
+
+import csv
+import io
+import json
+import os
+import uuid
+import zipfile
+from decimal import Decimal, InvalidOperation
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from core.constants import CONDITION_CHOICES
+from core.models.book_listing import BookListing
+
+IMPORT_FORMATS = ("csv", "jsonl")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+MAX_PRICE = Decimal("99999999.99")  # Largest value BookListing.price can hold
+MAX_REPORTED_ERRORS = 200
+
+_VALID_CONDITIONS = {value for value, _ in CONDITION_CHOICES}
+_CONDITION_LABELS = {label.lower(): value for value, label in CONDITION_CHOICES}
+
+
+class ListingImportResult:
+    """
+    Outcome of a bulk listing import.
+
+    Only the first :data:`MAX_REPORTED_ERRORS` row errors are kept so a file full
+    of bad rows cannot exhaust memory; ``error_count`` still counts all of them.
+
+    :ivar created: Number of listings inserted.
+    :ivar error_count: Number of rows rejected.
+    :ivar errors: ``(line_number, message)`` pairs for the first rejected rows.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line_number, message):
+        """
+        Records a rejected row.
+
+        :param line_number: The 1-based line number of the row in the file.
+        :type line_number: int
+        :param message: Why the row was rejected.
+        :type message: str
+        """
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_number, message))
+
+
+def detect_format(filename):
+    """
+    Guesses the import format from a file name.
+
+    :param filename: Name of the uploaded or local file.
+    :type filename: str
+    :return: ``"csv"`` or ``"jsonl"``, or ``None`` if the extension is unknown.
+    :rtype: str | None
+    """
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return None
+
+
+def iter_rows(stream, fmt):
+    """
+    Yields ``(line_number, row)`` pairs from a binary stream without reading it all.
+
+    :param stream: A binary file-like object.
+    :param fmt: Either ``"csv"`` or ``"jsonl"``.
+    :type fmt: str
+    :return: A generator of line numbers and row dictionaries. A row that cannot
+        be decoded is yielded as an ``Exception`` instead of a dictionary.
+    :rtype: collections.abc.Iterator[tuple[int, dict | Exception]]
+    :raises ValueError: If ``fmt`` is not a supported format.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield line_number, exc
+                continue
+            if not isinstance(row, dict):
+                yield line_number, ValueError("Each line must be a JSON object.")
+                continue
+            yield line_number, row
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+    text.detach()  # Leave the caller's stream open
+
+
+def _clean_text(row, field):
+    """Returns a row value as a stripped string, treating missing values as empty."""
+    value = row.get(field)
+    return "" if value is None else str(value).strip()
+
+
+def _clean_condition(value):
+    """Accepts either a condition key (``like_new``) or its label (``Like New``)."""
+    if value in _VALID_CONDITIONS:
+        return value
+    return _CONDITION_LABELS.get(value.lower())
+
+
+def clean_price(value):
+    """
+    Parses a price using the same rules as the add listing form.
+
+    :param value: The submitted price.
+    :type value: str
+    :return: The price, rounded to cents.
+    :rtype: decimal.Decimal
+    :raises ValueError: If the price is not a number, is negative or does not
+        fit in ``BookListing.price``.
+    """
+    try:
+        price = Decimal(value)
+    except (InvalidOperation, ValueError):
+        raise ValueError("Price must be a valid number.")
+    if not price.is_finite():
+        raise ValueError("Price must be a valid number.")
+    if price < 0:
+        raise ValueError("Price cannot be negative.")
+    # Checked before rounding too, as huge values cannot be quantized to cents
+    if price > MAX_PRICE or price.quantize(Decimal("0.01")) > MAX_PRICE:
+        raise ValueError("Price is too large.")
+    return price.quantize(Decimal("0.01"))
+
+
+def _store_image(images, name):
+    """
+    Copies a cover image out of the images archive into media storage.
+
+    :param images: The open images archive.
+    :type images: zipfile.ZipFile
+    :param name: Member name referenced by the row.
+    :type name: str
+    :return: The storage path to assign to ``BookListing.image``.
+    :rtype: str
+    :raises ValueError: If the member is missing or is not a JPG/PNG file.
+    """
+    ext = os.path.splitext(name)[1].lower()
+    if ext not in IMAGE_EXTENSIONS:
+        raise ValueError("Please upload only JPG or PNG image files.")
+    try:
+        data = images.read(name)
+    except KeyError:
+        raise ValueError(f"Image '{name}' was not found in the images archive.")
+    return default_storage.save(
+        f"book_images/{uuid.uuid4().hex}{ext}", ContentFile(data)
+    )
+
+
+def build_listing(shop, row, images=None):
+    """
+    Validates one import row and builds an unsaved :class:`BookListing` from it.
+
+    :param shop: The shop the listing will belong to.
+    :type shop: core.models.shop.Shop
+    :param row: The parsed row. Recognised keys are ``title``, ``author``,
+        ``condition``, ``price``, ``descriptions`` and ``image``.
+    :type row: dict
+    :param images: Optional archive of cover images.
+    :type images: zipfile.ZipFile | None
+    :return: The unsaved listing.
+    :rtype: core.models.book_listing.BookListing
+    :raises ValueError: If the row is invalid.
+    """
+    title = _clean_text(row, "title")
+    author = _clean_text(row, "author")
+    condition = _clean_text(row, "condition")
+    price = _clean_text(row, "price")
+    if not (title and author and condition and price):
+        raise ValueError("Please fill in all required fields.")
+    if len(title) > 255 or len(author) > 255:
+        raise ValueError("Title and author must be at most 255 characters.")
+
+    condition_value = _clean_condition(condition)
+    if condition_value is None:
+        raise ValueError(f"Invalid condition: {condition}.")
+
+    listing = BookListing(
+        shop=shop,
+        title=title,
+        author=author,
+        condition=condition_value,
+        price=clean_price(price),
+        descriptions=_clean_text(row, "descriptions"),
+    )
+
+    image_name = _clean_text(row, "image")
+    if image_name:
+        if images is None:
+            raise ValueError("Row references an image but no images archive was given.")
+        listing.image = _store_image(images, image_name)
+    return listing
+
+
+def import_listings(shop, stream, fmt, images_file=None, batch_size=1000):
+    """
+    Imports book listings for a shop from a CSV or JSONL stream.
+
+    Valid rows are inserted in ``bulk_create`` batches of ``batch_size``, each
+    batch in its own transaction. Invalid rows are skipped and reported in the
+    result; they never abort the rest of the import.
+
+    :param shop: The shop the listings will belong to.
+    :type shop: core.models.shop.Shop
+    :param stream: A binary file-like object containing the rows.
+    :param fmt: Either ``"csv"`` or ``"jsonl"``.
+    :type fmt: str
+    :param images_file: Optional seekable binary file holding a zip of cover images.
+    :param batch_size: Number of listings inserted per query.
+    :type batch_size: int
+    :return: How many listings were created and which rows were rejected.
+    :rtype: ListingImportResult
+    :raises ValueError: If ``fmt`` is unsupported or ``images_file`` is not a zip archive.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    result = ListingImportResult()
+    images = None
+    if images_file is not None:
+        try:
+            images = zipfile.ZipFile(images_file)
+        except zipfile.BadZipFile:
+            raise ValueError("Images must be uploaded as a .zip archive.")
+
+    def flush(batch):
+        with transaction.atomic():
+            BookListing.objects.bulk_create(batch, batch_size=batch_size)
+        result.created += len(batch)
+
+    batch = []
+    try:
+        for line_number, row in iter_rows(stream, fmt):
+            if isinstance(row, Exception):
+                result.add_error(line_number, f"Could not parse row: {row}")
+                continue
+            try:
+                batch.append(build_listing(shop, row, images))
+            except ValueError as exc:
+                result.add_error(line_number, str(exc))
+                continue
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        result.add_error(0, f"Stopped reading the file: {exc}")
+    finally:
+        if images is not None:
+            images.close()
+    return result
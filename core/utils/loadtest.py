@@ -0,0 +1,477 @@
+"""
+Concurrent load tests against a running server, run by the ``loadtest`` management command.
+
+Where ``bench`` times one request at a time in-process, a load test sends many
+at once over HTTP, so lock contention, connection limits and saturated workers
+show up. It drives any server on the given address, for example::
+
+    python manage.py runserver --noreload
+    gunicorn bookstore.wsgi --workers 4 --threads 4
+    uvicorn bookstore.asgi:application --workers 4
+
+Each virtual user is a thread with its own keep-alive connection and cookies.
+It logs in as one of the accounts created by ``seed_marketplace`` and repeats
+its role's journey until the run ends, as a browser would: pages are fetched,
+forms are read from the HTML and posted back with their CSRF token.
+
+- Buyers browse the catalogue, open a book, add it to the cart and check out.
+- Sellers mark their newest pending order as ready to ship.
+- Couriers accept one of the available orders and complete a delivery.
+
+Every request is recorded with its step, status and latency. Requests that fail
+or return a ``4xx`` or ``5xx`` status count as errors. A journey the site turns
+away, such as a checkout of a book someone else just bought, or an order
+another courier claimed first, counts as rejected rather than as an error.
+"""
+
+import http.client
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from http.cookies import SimpleCookie
+from typing import NamedTuple
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.shortcuts import resolve_url
+from django.urls import reverse
+
+from core.utils.bench import percentile
+
+ROLES = ("buyer", "seller", "courier")
+# Seconds a user with nothing to do waits before looking again
+IDLE_WAIT = 1.0
+_ID = 987654321
+
+
+class Sample(NamedTuple):
+    """
+    One request sent during a load test.
+
+    :ivar started: Seconds from the start of the run to the request.
+    :ivar step: The journey step that sent it, such as ``"buyer checkout"``.
+    :ivar duration: Seconds until the whole response was read.
+    :ivar status: The response status, or ``None`` if no response came.
+    :ivar error: The exception raised, if the request failed.
+    """
+
+    started: float
+    step: str
+    duration: float
+    status: int | None
+    error: str | None = None
+
+    @property
+    def failed(self):
+        return self.status is None or self.status >= 400
+
+
+class JourneyRejected(Exception):
+    """
+    Raised when the site turns a journey away, such as an order already claimed.
+    """
+
+
+class Idle(JourneyRejected):
+    """
+    Raised when there is nothing for a seller or courier to do yet.
+    """
+
+
+class LoggedOut(Exception):
+    """
+    Raised when the site sends a virtual user back to the login page.
+    """
+
+
+def _url_ids(html, url_name):
+    """
+    Returns the ids in every link or form action to a URL pattern found in a page.
+
+    :param html: The page.
+    :type html: str
+    :param url_name: A URL pattern name taking one integer argument.
+    :type url_name: str
+    :return: The ids, in page order, without repeats.
+    :rtype: list[int]
+    """
+    pattern = re.escape(reverse(url_name, args=[_ID])).replace(str(_ID), r"(\d+)")
+    return list(dict.fromkeys(int(match) for match in re.findall(pattern, html)))
+
+
+def _hidden_input(html, name):
+    match = re.search(rf'name="{name}" value="([^"]*)"', html)
+    return match[1] if match else None
+
+
+class Recorder:
+    """
+    Collects the requests and journey outcomes of every virtual user.
+
+    :ivar samples: Every request sent, in the order they finished.
+    :ivar journeys: Journey counts by role and outcome.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.samples = []
+        self.journeys = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def record(self, sample):
+        with self._lock:
+            self.samples.append(sample)
+
+    def journey(self, role, outcome):
+        with self._lock:
+            self.journeys[role][outcome] += 1
+
+
+class Session:
+    """
+    A browser-like HTTP client: one keep-alive connection and a cookie jar.
+
+    Redirects are not followed, so journeys can tell from the ``Location``
+    where the site sent them.
+    """
+
+    def __init__(self, base_url, recorder, timeout=30):
+        """
+        :param base_url: The server's address, such as ``http://127.0.0.1:8000``.
+        :type base_url: str
+        :param recorder: Where to record each request.
+        :type recorder: Recorder
+        :param timeout: Seconds to wait for a response.
+        :type timeout: float
+        """
+        parts = urlsplit(base_url)
+        connection_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self._connect = lambda: connection_class(
+            parts.hostname, parts.port, timeout=timeout
+        )
+        self._connection = None
+        self.recorder = recorder
+        self.cookies = {}
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def get(self, step, path):
+        """
+        Sends a ``GET`` and records it under ``step``.
+
+        :return: The response status, ``Location`` header and body.
+        :rtype: tuple[int, str | None, str]
+        """
+        return self._request(step, "GET", path)
+
+    def post(self, step, path, data=None):
+        """
+        Submits a form, with the CSRF token, and records it under ``step``.
+
+        :return: The response status, ``Location`` header and body.
+        :rtype: tuple[int, str | None, str]
+        """
+        data = dict(data or {})
+        data["csrfmiddlewaretoken"] = self.cookies.get("csrftoken", "")
+        return self._request(step, "POST", path, urlencode(data))
+
+    def _request(self, step, method, path, body=None):
+        headers = {"Cookie": "; ".join(f"{k}={v}" for k, v in self.cookies.items())}
+        if body is not None:
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        started = self.recorder.elapsed()
+        try:
+            response, content = self._send(method, path, body, headers)
+        except (OSError, http.client.HTTPException) as exc:
+            self.close()
+            self.recorder.record(
+                Sample(
+                    started,
+                    step,
+                    self.recorder.elapsed() - started,
+                    None,
+                    f"{type(exc).__name__}: {exc}",
+                )
+            )
+            raise
+        self.recorder.record(
+            Sample(started, step, self.recorder.elapsed() - started, response.status)
+        )
+        for header in response.headers.get_all("Set-Cookie") or ():
+            for name, morsel in SimpleCookie(header).items():
+                if morsel.value and morsel["max-age"] != "0":
+                    self.cookies[name] = morsel.value
+                else:
+                    self.cookies.pop(name, None)
+
+        location = response.getheader("Location")
+        if location and urlsplit(location).path == resolve_url(settings.LOGIN_URL):
+            raise LoggedOut(step)
+        return response.status, location, content.decode("utf-8", "replace")
+
+    def _send(self, method, path, body, headers):
+        """
+        Sends a request, reconnecting once if the server closed an idle connection.
+        """
+        reused = self._connection is not None
+        if not reused:
+            self._connection = self._connect()
+        try:
+            self._connection.request(method, path, body, headers)
+            response = self._connection.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionError):
+            self.close()
+            if not reused:
+                raise
+            self._connection = self._connect()
+            self._connection.request(method, path, body, headers)
+            response = self._connection.getresponse()
+        content = response.read()
+        if response.will_close:
+            self.close()
+        return response, content
+
+
+def log_in(session, email, password):
+    """
+    Logs a session in through the login form.
+
+    :raises JourneyRejected: If the site does not accept the account.
+    """
+    session.cookies.clear()
+    session.get("login page", reverse("login"))
+    status, location, _ = session.post(
+        "log in", reverse("login"), {"email": email, "password": password}
+    )
+    if status != 302 or location is None:
+        raise JourneyRejected(f"could not log in as {email}")
+
+
+def buyer_journey(session, rng):
+    """
+    Browses the catalogue, opens a book, adds it to the cart and checks out.
+
+    A book from a different shop than the cart's is not added, and the cart is
+    checked out as it is. If checkout is refused, for example because another
+    buyer bought a book first, the cart is emptied for the next journey.
+    """
+    _, _, html = session.get("buyer landing", reverse("buyer-landing"))
+    books = _url_ids(html, "buyer-book-details")
+    if not books:
+        raise JourneyRejected("no books for sale")
+    book = reverse("buyer-book-details", args=[rng.choice(books[:100])])
+    session.get("buyer book details", book)
+    session.post("buyer add to cart", book)
+    session.get("buyer cart", reverse("buyer-cart"))
+
+    _, _, html = session.get("buyer checkout page", reverse("buyer-checkout"))
+    form_token = _hidden_input(html, "form_token")
+    if form_token is None:
+        raise JourneyRejected("empty cart")
+    _, location, _ = session.post(
+        "buyer checkout",
+        reverse("buyer-checkout"),
+        {
+            "form_token": form_token,
+            "address": f"{rng.randint(1, 200)}, Jalan Beban",
+            "city": "Cyberjaya",
+            "state": "Selangor",
+            "postal_code": "63000",
+            "country": "Malaysia",
+            "card_number": "4111111111111111",
+            "expiry_date": "12/30",
+            "cvv": "123",
+        },
+    )
+    if location is None or urlsplit(location).path != reverse("buyer-orders"):
+        _, _, html = session.get("buyer cart", reverse("buyer-cart"))
+        for item_id in re.findall(r'name="item_id" value="(\d+)"', html):
+            session.post(
+                "buyer remove from cart",
+                reverse("buyer-cart"),
+                {"item_id": item_id, "action": "remove"},
+            )
+        raise JourneyRejected("checkout refused")
+    session.get("buyer orders", reverse("buyer-orders"))
+
+
+def seller_journey(session, rng):
+    """
+    Lists the shop's pending orders and marks the newest one as ready to ship.
+    """
+    _, _, html = session.get(
+        "seller pending orders", f"{reverse('seller-orders')}?status=pending"
+    )
+    orders = _url_ids(html, "mark-order-ready")
+    if not orders:
+        raise Idle("no pending orders")
+    session.post("seller mark ready", reverse("mark-order-ready", args=[orders[0]]))
+    session.get("seller orders", reverse("seller-orders"))
+
+
+def courier_journey(session, rng):
+    """
+    Accepts one of the first available orders, then completes an open delivery.
+
+    Couriers pick from the same first page of orders, so some lose the race for
+    an order to another courier; those journeys count as rejected.
+    """
+    _, _, html = session.get("courier deliveries", reverse("courier-deliveries"))
+    available = _url_ids(html, "courier-accept-order")
+    if not available:
+        raise Idle("no orders to deliver")
+    session.post(
+        "courier accept order",
+        reverse("courier-accept-order", args=[rng.choice(available[:10])]),
+    )
+    _, _, html = session.get("courier deliveries", reverse("courier-deliveries"))
+    if "no longer available" in html:
+        raise JourneyRejected("order claimed by another courier")
+    assignments = _url_ids(html, "courier-update-assignment")
+    if not assignments:
+        raise JourneyRejected("no deliveries to complete")
+    session.post(
+        "courier complete delivery",
+        reverse("courier-update-assignment", args=[assignments[0]]),
+        {"action": "complete"},
+    )
+
+
+JOURNEYS = {
+    "buyer": buyer_journey,
+    "seller": seller_journey,
+    "courier": courier_journey,
+}
+
+
+def run_user(role, email, password, base_url, recorder, deadline, think_time, seed):
+    """
+    Logs in and repeats a role's journey until ``deadline``.
+
+    The user logs in again whenever the site sends it back to the login page,
+    for example when its session expires. With nothing to do, it waits
+    ``IDLE_WAIT`` seconds before looking again, as a person would.
+
+    :param role: ``"buyer"``, ``"seller"`` or ``"courier"``.
+    :type role: str
+    :param deadline: The ``Recorder.elapsed()`` value to stop at.
+    :type deadline: float
+    :param think_time: Mean seconds to pause between journeys.
+    :type think_time: float
+    :param seed: Seed for the user's random choices.
+    :type seed: int
+    """
+    rng = random.Random(seed)
+    session = Session(base_url, recorder)
+    logged_in = False
+    try:
+        while recorder.elapsed() < deadline:
+            try:
+                if not logged_in:
+                    log_in(session, email, password)
+                    logged_in = True
+                JOURNEYS[role](session, rng)
+                recorder.journey(role, "completed")
+            except Idle as exc:
+                recorder.journey(role, f"idle: {exc}")
+                time.sleep(min(IDLE_WAIT, max(0, deadline - recorder.elapsed())))
+            except LoggedOut:
+                logged_in = False
+                recorder.journey(role, "logged out")
+            except JourneyRejected as exc:
+                recorder.journey(role, f"rejected: {exc}")
+                if not logged_in:
+                    return
+            except (OSError, http.client.HTTPException):
+                recorder.journey(role, "failed")
+            if think_time:
+                time.sleep(rng.expovariate(1 / think_time))
+    finally:
+        session.close()
+
+
+def summarise(samples, duration):
+    """
+    Returns the request count, error rate, throughput and latency percentiles.
+
+    :param samples: The requests to summarise.
+    :type samples: list[Sample]
+    :param duration: The seconds they were sent over.
+    :type duration: float
+    :rtype: dict
+    """
+    durations = [sample.duration * 1000 for sample in samples]
+    errors = sum(sample.failed for sample in samples)
+    summary = {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / duration, 2) if duration else 0.0,
+    }
+    if durations:
+        summary.update(
+            p50_ms=round(percentile(durations, 50), 3),
+            p95_ms=round(percentile(durations, 95), 3),
+            p99_ms=round(percentile(durations, 99), 3),
+            max_ms=round(max(durations), 3),
+        )
+    return summary
+
+
+def build_report(recorder, duration, interval):
+    """
+    Summarises a run overall, per step and per ``interval`` seconds.
+
+    Requests fall in the timeline window they finished in, so a window is
+    complete as soon as its time has passed.
+
+    :param recorder: The finished run.
+    :type recorder: Recorder
+    :param duration: The length of the run in seconds.
+    :type duration: float
+    :param interval: The width of each timeline window in seconds.
+    :type interval: float
+    :rtype: dict
+    """
+    by_step = defaultdict(list)
+    windows = defaultdict(list)
+    errors = Counter()
+    for sample in recorder.samples:
+        by_step[sample.step].append(sample)
+        windows[int((sample.started + sample.duration) // interval)].append(sample)
+        if sample.failed:
+            errors[sample.error or f"{sample.step}: HTTP {sample.status}"] += 1
+
+    timeline = []
+    for window in range(int(duration // interval) + 1):
+        start = window * interval
+        width = min(interval, duration - start)
+        if width <= 0:
+            break
+        timeline.append(
+            {"start_s": round(start, 3), **summarise(windows[window], width)}
+        )
+    return {
+        "total": summarise(recorder.samples, duration),
+        "steps": {
+            step: summarise(samples, duration)
+            for step, samples in sorted(by_step.items())
+        },
+        "journeys": {
+            role: dict(outcomes) for role, outcomes in recorder.journeys.items()
+        },
+        "errors": dict(errors.most_common()),
+        "timeline": timeline,
+    }
@@ -0,0 +1,158 @@
+"""
+Per-view request metrics in Prometheus format.
+
+:class:`core.middleware.RequestMetricsMiddleware` records, for every request,
+the resolved URL name (for example ``buyer-landing``) with its latency, number
+of database queries and time spent in the database. The ``/metrics/`` endpoint
+exposes them for Prometheus to scrape.
+
+The instrumentation has to stay well under 1% of request time, including the
+~2 ms ``304 Not Modified`` responses. So database queries are timed by one
+wrapper installed permanently on each connection, which only does work while a
+request is being measured. The labelled metric children are looked up once per
+view, and only latency is recorded as a histogram; query counts and database
+time are counters, from which Prometheus derives per-request averages.
+
+Each worker process keeps its own metrics. When several workers serve the site
+(for example gunicorn with ``--workers 4``), point the ``PROMETHEUS_MULTIPROC_DIR``
+environment variable at an empty directory that every worker can write to. The
+metrics are then shared through files there, and a scrape of any worker returns
+the totals of all of them. Clear the directory whenever the server restarts.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+UNRESOLVED_VIEW = "<unresolved>"
+
+REQUESTS = Counter(
+    "bookstore_http_requests_total",
+    "HTTP requests handled, by view, method and status code.",
+    ["view", "method", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "bookstore_http_request_duration_seconds",
+    "Time to produce a response, by view.",
+    ["view"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+DB_QUERIES = Counter(
+    "bookstore_db_queries_total",
+    "Database queries run while handling requests, by view.",
+    ["view"],
+)
+DB_DURATION = Counter(
+    "bookstore_db_duration_seconds_total",
+    "Time spent in database queries while handling requests, by view.",
+    ["view"],
+)
+
+_children = {}
+_current_timer = ContextVar("current_query_timer", default=None)
+
+
+class QueryTimer:
+    """
+    Counts the database queries of one request and the time spent in them.
+
+    :ivar count: Number of queries run.
+    :ivar duration: Seconds spent running them.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __enter__(self):
+        self._token = _current_timer.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _current_timer.reset(self._token)
+
+
+def time_query(execute, sql, params, many, context):
+    """
+    ``execute_wrapper`` adding each query to the active :class:`QueryTimer`, if any.
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.duration += time.perf_counter() - started
+        timer.count += 1
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """
+    ``connection_created`` receiver installing :func:`time_query` on a connection.
+
+    The wrapper goes first in the list: ``execute_wrapper()`` blocks that are
+    already open remove their own wrapper from the end when they exit.
+
+    :param sender: The database wrapper class.
+    :param connection: The new database connection wrapper.
+    :type connection: django.db.backends.base.base.BaseDatabaseWrapper
+    """
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_query)
+
+
+def record_request(view, method, status, duration, timer):
+    """
+    Records the metrics of one handled request.
+
+    :param view: The resolved URL name, or ``UNRESOLVED_VIEW``.
+    :type view: str
+    :param method: The HTTP method.
+    :type method: str
+    :param status: The response status code.
+    :type status: int
+    :param duration: Seconds taken to produce the response.
+    :type duration: float
+    :param timer: The request's database query timer.
+    :type timer: QueryTimer
+    """
+    key = (view, method, status)
+    children = _children.get(key)
+    if children is None:
+        children = _children[key] = (
+            REQUESTS.labels(view, method, status),
+            REQUEST_DURATION.labels(view),
+            DB_QUERIES.labels(view),
+            DB_DURATION.labels(view),
+        )
+    requests, request_duration, db_queries, db_duration = children
+    requests.inc()
+    request_duration.observe(duration)
+    db_queries.inc(timer.count)
+    db_duration.inc(timer.duration)
+
+
+def render_metrics():
+    """
+    Renders every metric in the Prometheus text exposition format.
+
+    :return: The exposition and its content type.
+    :rtype: tuple[bytes, str]
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,158 @@
+"""
+Pagination helpers for large tables.
+
+Unlike offset pagination, keyset pagination never counts rows or skips over
+earlier pages: each page is a single indexed range query starting after the
+last row of the previous page. That keeps deep pages as fast as the first one
+and keeps pages stable while new rows are being inserted.
+
+Where page numbers are needed, such as admin changelists, the
+:class:`CachedCountPaginator` avoids running an exact ``COUNT(*)`` on every
+request instead.
+"""
+
+import hashlib
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class KeysetPage(NamedTuple):
+    """
+    One page of a keyset-paginated queryset.
+
+    :ivar items: The rows on this page.
+    :ivar next_cursor: Cursor for the following page, or ``None`` on the last page.
+    """
+
+    items: list
+    next_cursor: str | None
+
+
+def _encode_cursor(value, pk):
+    """Encodes the ordering value and primary key of the last row on a page."""
+    return f"{value.isoformat() if hasattr(value, 'isoformat') else value}|{pk}"
+
+
+def _decode_cursor(queryset, field, cursor):
+    """
+    Decodes a cursor into ``(value, pk)``.
+
+    :return: The decoded pair, or ``None`` if the cursor is missing or malformed.
+    :rtype: tuple | None
+    """
+    if not cursor or "|" not in cursor:
+        return None
+    raw_value, _, raw_pk = cursor.rpartition("|")
+    try:
+        value = queryset.model._meta.get_field(field).to_python(raw_value)
+        pk = queryset.model._meta.pk.to_python(raw_pk)
+    except ValidationError:
+        return None
+    if value is None or pk is None:
+        return None
+    return value, pk
+
+
+def keyset_paginate(queryset, field, cursor=None, page_size=20, descending=False):
+    """
+    Returns one page of ``queryset`` ordered by ``field`` and then primary key.
+
+    :param queryset: The queryset to paginate. Any existing ordering is replaced.
+    :type queryset: django.db.models.QuerySet
+    :param field: Name of a non-null model field to order by, such as ``"placed_at"``.
+    :type field: str
+    :param cursor: The ``next_cursor`` of the previous page, or ``None`` for the
+        first page. Malformed cursors are treated as ``None``.
+    :type cursor: str | None
+    :param page_size: Maximum number of rows on the page.
+    :type page_size: int
+    :param descending: Whether to return the newest/largest values first.
+    :type descending: bool
+    :return: The rows on the page and the cursor for the next one.
+    :rtype: KeysetPage
+    """
+    decoded = _decode_cursor(queryset, field, cursor)
+    if decoded is not None:
+        value, pk = decoded
+        op = "lt" if descending else "gt"
+        queryset = queryset.filter(
+            Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"pk__{op}": pk})
+        )
+
+    prefix = "-" if descending else ""
+    rows = list(queryset.order_by(f"{prefix}{field}", f"{prefix}pk")[: page_size + 1])
+    if len(rows) <= page_size:
+        return KeysetPage(items=rows, next_cursor=None)
+
+    rows = rows[:page_size]
+    last = rows[-1]
+    return KeysetPage(
+        items=rows, next_cursor=_encode_cursor(getattr(last, field), last.pk)
+    )
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that avoids an exact ``COUNT(*)`` on every page view.
+
+    On PostgreSQL, unfiltered querysets over large tables use the planner's row
+    estimate, which is read from the catalogue in constant time. Other counts
+    are cached briefly per query, so paging through a filtered changelist counts
+    the matching rows once rather than on every page.
+
+    :cvar count_timeout: Seconds an exact count is cached for.
+    :cvar estimate_threshold: Tables estimated to hold fewer rows are counted exactly.
+    """
+
+    count_timeout = 60
+    estimate_threshold = 100_000
+
+    def _estimated_count(self):
+        """
+        Returns PostgreSQL's row estimate for an unfiltered queryset, if available.
+
+        :return: The estimated row count, or ``None`` if no usable estimate exists.
+        :rtype: int | None
+        """
+        queryset = self.object_list
+        if not hasattr(queryset, "query") or queryset.query.where:
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < self.estimate_threshold:
+            return None
+        return row[0]
+
+    @cached_property
+    def count(self):
+        """The exact, cached or estimated number of objects across all pages."""
+        estimate = self._estimated_count()
+        if estimate is not None:
+            return estimate
+
+        queryset = self.object_list
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except (AttributeError, EmptyResultSet):
+            return super().count
+        digest = hashlib.md5(
+            f"{queryset.db}:{sql}:{params}".encode(), usedforsecurity=False
+        ).hexdigest()
+        return cache.get_or_set(
+            f"pagination:count:{digest}",
+            lambda: super(CachedCountPaginator, self).count,
+            self.count_timeout,
+        )
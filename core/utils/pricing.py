@@ -0,0 +1,129 @@
+"""
+Shared pricing engine for carts and orders.
+
+Every page that shows a subtotal, tax amount or total price should get those
+figures from here, so the 6% tax rule and rounding live in exactly one place.
+Cart totals are computed with a single aggregate query and cached per cart
+version; order totals are stored on the order when it is placed.
+"""
+
+from decimal import Decimal
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, F, Sum
+
+from core.models.cart_item import CartItem
+
+TAX_RATE = Decimal("0.06")
+CENTS = Decimal("0.01")
+# Cart versions change on every edit, so this timeout only bounds memory use
+CART_QUOTE_TIMEOUT = 60 * 60
+
+
+class PriceBreakdown(NamedTuple):
+    """
+    Immutable price summary for a cart or an order.
+
+    :ivar subtotal: Sum of item prices multiplied by their quantities.
+    :ivar tax_amount: Tax charged on the subtotal, rounded to cents.
+    :ivar total_price: Subtotal plus tax, rounded to cents.
+    :ivar item_count: Number of distinct line items that were priced.
+    """
+
+    subtotal: Decimal
+    tax_amount: Decimal
+    total_price: Decimal
+    item_count: int
+
+
+def calculate_tax(subtotal):
+    """
+    Calculates the tax owed on a subtotal.
+
+    :param subtotal: The pre-tax amount.
+    :type subtotal: decimal.Decimal
+    :return: The tax amount rounded to cents.
+    :rtype: decimal.Decimal
+    """
+    return (subtotal * TAX_RATE).quantize(CENTS)
+
+
+def build_breakdown(subtotal, item_count=0):
+    """
+    Builds a :class:`PriceBreakdown` from a pre-tax subtotal.
+
+    :param subtotal: The pre-tax amount, or ``None`` when nothing was priced.
+    :type subtotal: decimal.Decimal | None
+    :param item_count: Number of line items that make up the subtotal.
+    :type item_count: int
+    :return: The full price breakdown.
+    :rtype: PriceBreakdown
+    """
+    subtotal = (subtotal or Decimal("0.00")).quantize(CENTS)
+    tax_amount = calculate_tax(subtotal)
+    return PriceBreakdown(
+        subtotal=subtotal,
+        tax_amount=tax_amount,
+        total_price=(subtotal + tax_amount).quantize(CENTS),
+        item_count=item_count,
+    )
+
+
+def _cart_cache_key(cart):
+    """Returns the cache key for a cart quote at the cart's current version."""
+    return f"pricing:cart:{cart.pk}:v{cart.version}"
+
+
+def price_cart(cart, use_cache=True):
+    """
+    Prices every purchasable item in a cart with one aggregate query.
+
+    Items whose book listing has already been bought are ignored. The result is
+    cached under the cart's ``version``, which is bumped whenever the cart's
+    items or the listings inside it change, so a cached quote is never stale.
+
+    :param cart: The cart to price, or ``None`` for a user without a cart.
+    :type cart: core.models.cart.Cart | None
+    :param use_cache: Whether a cached quote may be returned. Pass ``False``
+        when placing an order so the totals are always read fresh.
+    :type use_cache: bool
+    :return: The cart's price breakdown.
+    :rtype: PriceBreakdown
+    """
+    if cart is None:
+        return build_breakdown(None)
+
+    key = _cart_cache_key(cart)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    totals = CartItem.objects.filter(cart=cart, book_listing__bought=False).aggregate(
+        subtotal=Sum(
+            F("book_listing__price") * F("quantity"),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+        item_count=Count("id"),
+    )
+    breakdown = build_breakdown(totals["subtotal"], totals["item_count"])
+    cache.set(key, breakdown, CART_QUOTE_TIMEOUT)
+    return breakdown
+
+
+def price_order(order):
+    """
+    Returns the price breakdown that was stored on an order when it was placed.
+
+    :param order: The order whose totals should be returned.
+    :type order: core.models.order.Order
+    :return: The order's price breakdown. ``item_count`` is always 0 as it is not stored.
+    :rtype: PriceBreakdown
+    """
+    return PriceBreakdown(
+        subtotal=order.subtotal,
+        tax_amount=order.tax_amount,
+        total_price=order.total_price,
+        item_count=0,
+    )
@@ -0,0 +1,218 @@
+"""
+Opt-in profiling of individual requests.
+
+:class:`core.middleware.RequestProfilingMiddleware` profiles a request when:
+
+- a staff user asks for it with an ``X-Profile`` header or a ``_profile`` query
+  parameter, set to ``cprofile`` (the default) or ``sample``;
+- or the request is picked at random, with probability
+  ``settings.PROFILING_SAMPLE_RATE``. Those requests use the stack sampler,
+  which is cheap enough to leave enabled in production.
+
+``cprofile`` records every function call with :mod:`cProfile` and saves a
+``.prof`` file for ``pstats``, snakeviz and similar tools. It is exact but slows
+the request down noticeably. ``sample`` records the request thread's stack every
+``settings.PROFILING_SAMPLE_INTERVAL`` seconds and saves the counts as
+``.collapsed`` folded stacks, the input format of ``flamegraph.pl`` and
+speedscope. Only the thread handling the request is profiled. Only one
+``cprofile`` request runs at a time per process; a concurrent one is sampled
+instead.
+
+Results are written to ``settings.PROFILING_DIR``, keeping the newest
+``settings.PROFILING_MAX_FILES``, and are listed on the staff profiles page.
+"""
+
+import cProfile
+import random
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+MODES = ("cprofile", "sample")
+EXTENSIONS = {"cprofile": ".prof", "sample": ".collapsed"}
+
+# 20261019-143005.123456-buyer-landing-123ms-1a2b3c.prof
+_FILENAME = re.compile(
+    r"^(?P<stamp>\d{8}-\d{6}\.\d{6})-(?P<view>[\w.-]+?)-(?P<ms>\d+)ms-[0-9a-f]{6}"
+    r"(?P<ext>\.prof|\.collapsed)$"
+)
+
+# cProfile installs a process-wide hook, so two profilers cannot run at once
+_cprofile_lock = threading.Lock()
+
+
+def requested_mode(request):
+    """
+    Returns the profiling mode a request should run with, if any.
+
+    :param request: The HTTP request object, after authentication.
+    :type request: django.http.HttpRequest
+    :return: ``"cprofile"``, ``"sample"`` or ``None``.
+    :rtype: str | None
+    """
+    flag = request.headers.get("X-Profile") or request.GET.get("_profile")
+    if flag and request.user.is_staff:
+        return flag if flag in MODES else "cprofile"
+    rate = settings.PROFILING_SAMPLE_RATE
+    if rate and random.random() < rate:
+        return "sample"
+    return None
+
+
+class StackSampler:
+    """
+    Samples one thread's call stack at a fixed interval from a background thread.
+
+    :ivar stacks: Counts of each sampled stack, outermost frame first.
+    """
+
+    def __init__(self, interval, thread_id=None):
+        """
+        :param interval: Seconds between samples.
+        :type interval: float
+        :param thread_id: The thread to sample; defaults to the calling thread.
+        :type thread_id: int | None
+        """
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                module = frame.f_globals.get("__name__", "?")
+                stack.append(f"{module}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self):
+        """
+        Returns the samples as folded stacks, one ``frame;frame;frame count`` per line.
+
+        :rtype: str
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+def profile_call(mode, func, *args):
+    """
+    Calls ``func`` under the given profiler.
+
+    Falls back to the stack sampler when another thread is already running
+    under ``cprofile``, rather than waiting for it or failing.
+
+    :param mode: ``"cprofile"`` or ``"sample"``.
+    :type mode: str
+    :param func: The callable to profile.
+    :return: The callable's result, the mode actually used and the profile data
+        to save.
+    :rtype: tuple
+    """
+    if mode == "cprofile" and _cprofile_lock.acquire(blocking=False):
+        try:
+            profiler = cProfile.Profile()
+            result = profiler.runcall(func, *args)
+            return result, mode, profiler
+        finally:
+            _cprofile_lock.release()
+    with StackSampler(settings.PROFILING_SAMPLE_INTERVAL) as sampler:
+        result = func(*args)
+    return result, "sample", sampler
+
+
+def save_profile(mode, data, view, duration):
+    """
+    Writes a profile to ``PROFILING_DIR`` and prunes the oldest beyond the limit.
+
+    :param mode: ``"cprofile"`` or ``"sample"``.
+    :type mode: str
+    :param data: The profiler returned by :func:`profile_call`.
+    :param view: The resolved URL name of the request.
+    :type view: str
+    :param duration: Seconds the request took.
+    :type duration: float
+    :return: The path of the saved profile.
+    :rtype: pathlib.Path
+    """
+    directory = Path(settings.PROFILING_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    view = re.sub(r"[^\w.-]", "_", view)
+    name = (
+        f"{timezone.localtime():%Y%m%d-%H%M%S.%f}-{view}-"
+        f"{round(duration * 1000)}ms-{uuid.uuid4().hex[:6]}{EXTENSIONS[mode]}"
+    )
+    path = directory / name
+    if mode == "cprofile":
+        data.dump_stats(path)
+    else:
+        path.write_text(data.collapsed())
+
+    for old in list_profiles()[settings.PROFILING_MAX_FILES :]:
+        old["path"].unlink(missing_ok=True)
+    return path
+
+
+def list_profiles():
+    """
+    Lists the saved profiles, newest first.
+
+    :return: One dict per profile with its ``name``, ``path``, ``view``,
+        ``duration_ms``, ``mode``, ``size`` and ``created_at``.
+    :rtype: list[dict]
+    """
+    directory = Path(settings.PROFILING_DIR)
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for path in directory.iterdir():
+        match = _FILENAME.match(path.name)
+        if not match:
+            continue
+        profiles.append(
+            {
+                "name": path.name,
+                "path": path,
+                "view": match["view"],
+                "duration_ms": int(match["ms"]),
+                "mode": "cprofile" if match["ext"] == ".prof" else "sample",
+                "size": path.stat().st_size,
+                "created_at": datetime.strptime(match["stamp"], "%Y%m%d-%H%M%S.%f"),
+            }
+        )
+    profiles.sort(key=lambda profile: profile["created_at"], reverse=True)
+    return profiles
+
+
+def profile_path(name):
+    """
+    Returns the path of a saved profile, refusing anything else.
+
+    :param name: A file name as listed by :func:`list_profiles`.
+    :type name: str
+    :return: The profile's path, or ``None`` if the name is not a saved profile.
+    :rtype: pathlib.Path | None
+    """
+    if not _FILENAME.match(name):
+        return None
+    path = Path(settings.PROFILING_DIR) / name
+    return path if path.is_file() else None
@@ -0,0 +1,77 @@
+"""
+SQLite connection tuning.
+
+Stock SQLite uses a rollback journal, in which a writer blocks every reader
+while it commits and a busy database fails immediately with "database is
+locked". Each new connection is therefore configured with the pragmas in the
+``SQLITE_PRAGMAS`` setting, typically:
+
+- ``journal_mode=WAL`` so readers and the single writer no longer block each other;
+- ``synchronous=NORMAL``, which is durable across application crashes in WAL mode
+  and avoids an fsync on every commit;
+- ``busy_timeout`` so a connection waits for the write lock instead of failing;
+- ``mmap_size`` and ``cache_size`` so hot pages are read from memory.
+
+Pair this with ``"transaction_mode": "IMMEDIATE"`` in the database ``OPTIONS``,
+so transactions take the write lock when they start. A deferred transaction that
+reads first and then writes can otherwise fail with "database is locked" even
+with a busy timeout.
+"""
+
+import re
+
+from django.conf import settings
+
+# Pragma values are interpolated into SQL, so only plain words and integers are allowed
+_PRAGMA_NAME = re.compile(r"^[a-z_]+$")
+_PRAGMA_VALUE = re.compile(r"^(-?\d+|[A-Za-z]+)$")
+
+
+def pragma_statements(pragmas):
+    """
+    Builds the ``PRAGMA`` statements for a mapping of pragma names to values.
+
+    :param pragmas: Pragma names mapped to integer or keyword values.
+    :type pragmas: dict
+    :return: One ``PRAGMA name = value`` statement per entry.
+    :rtype: list[str]
+    :raises ValueError: If a name or value is not a plain word or integer.
+    """
+    statements = []
+    for name, value in pragmas.items():
+        value = str(value)
+        if not _PRAGMA_NAME.match(name) or not _PRAGMA_VALUE.match(value):
+            raise ValueError(f"Invalid SQLite pragma: {name}={value}")
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+def apply_pragmas(cursor, pragmas):
+    """
+    Runs the given pragmas on a DB-API cursor.
+
+    :param cursor: A cursor on an SQLite connection.
+    :param pragmas: Pragma names mapped to values.
+    :type pragmas: dict
+    """
+    for statement in pragma_statements(pragmas):
+        cursor.execute(statement)
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    ``connection_created`` receiver applying ``settings.SQLITE_PRAGMAS`` to new SQLite connections.
+
+    Connections to other database backends are left untouched.
+
+    :param sender: The database wrapper class.
+    :param connection: The new database connection wrapper.
+    :type connection: django.db.backends.base.base.BaseDatabaseWrapper
+    """
+    if connection.vendor != "sqlite":
+        return
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", None)
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, pragmas)
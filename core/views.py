@@ -1,3 +1,35 @@
-from django.shortcuts import render
+import hmac
 
-# Create your views here.
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from core.utils.metrics import render_metrics
+
+
+@require_GET
+def metrics(request):
+    """
+    Serves the per-view request metrics in the Prometheus text format.
+
+    Scrapers authenticate with an ``Authorization: Bearer <token>`` header
+    matching the ``METRICS_TOKEN`` setting. Without a token configured, the
+    endpoint only exists in ``DEBUG`` mode.
+
+    :param request: The HTTP request object.
+    :type request: django.http.HttpRequest
+    :return: The metrics exposition.
+    :rtype: django.http.HttpResponse
+    :raises Http404: If no token is configured outside ``DEBUG`` mode.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            raise Http404
+    elif not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponseForbidden("Invalid metrics token.")
+
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
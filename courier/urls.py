@@ -1,10 +1,19 @@
 from django.urls import path
-from .views import deliveries_page, accept_order, update_assignment, report_issue
+from .views import (
+    deliveries_page,
+    accept_order,
+    accept_batch,
+    update_assignment,
+    report_issue,
+    delivery_events,
+)
 from courier.views.profile import profile_page
 
 urlpatterns = [
     path("deliveries/", deliveries_page, name="courier-deliveries"),
+    path("deliveries/events/", delivery_events, name="courier-delivery-events"),
     path("accept/<int:order_id>/", accept_order, name="courier-accept-order"),
+    path("batches/<int:batch_id>/accept/", accept_batch, name="courier-accept-batch"),
     path(
         "update/<int:assignment_id>/",
         update_assignment,
@@ -1 +1,8 @@
-from .deliveries import deliveries_page, accept_order, update_assignment, report_issue
+from .deliveries import (
+    deliveries_page,
+    accept_order,
+    accept_batch,
+    update_assignment,
+    report_issue,
+)
+from .events import delivery_events
@@ -4,22 +4,41 @@ Views for managing courier deliveries.
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from core.models.delivery_issue import DeliveryIssue
 from core.models.order import Order
 from core.models.order_assignment import OrderAssignment
+from core.models.shop_daily_sales import ShopDailySales
 from core.models.user import User
+from core.utils.batching import claim_batch, open_batches_page
 from core.utils.decorators import allowed_roles
+from core.utils.dispatch import available_orders_page, claim_order, release_order
+from core.utils.events import (
+    ORDER_AVAILABLE,
+    ORDER_CLAIMED,
+    order_event_data,
+    publish_on_commit,
+)
+from core.utils.pagination import keyset_paginate
 import uuid
 
+HISTORY_PAGE_SIZE = 20
+
 
 @login_required
 @allowed_roles(["courier"])
 def deliveries_page(request):
     """
     Renders a page showing available orders (ready to ship with no assignment)
-    and the logged-in courier's assignments.
+    and the logged-in courier's active and completed assignments.
+
+    Available orders are listed oldest first and keyset-paginated through the
+    ``after`` query parameter, so frequent polling stays cheap. Open delivery
+    batches are listed the same way through ``batches_after``, and completed
+    deliveries newest first through ``history_after``, so a courier with a long
+    history loads as fast as a new one.
     """
     # Try to get the email from request.user; if not present, assume request.user is the email string.
     try:
@@ -31,18 +50,37 @@ def deliveries_page(request):
     current_user = get_object_or_404(User, email=user_email)
 
     # Available orders: orders that are ready_to_ship and have no assignment.
-    available_orders = Order.objects.filter(
-        status="ready_to_ship", order_assignment__isnull=True
-    ).order_by("-placed_at")
+    available_page = available_orders_page(request.GET.get("after"))
+
+    # Open delivery batches: nearby ready orders that can be claimed in one go.
+    batches_page = open_batches_page(request.GET.get("batches_after"))
 
     # My deliveries: order assignments for which the courier is the logged-in user.
-    my_assignments = OrderAssignment.objects.filter(courier=current_user).order_by(
+    # The order and any reported issue are read in the same query as the assignment.
+    my_assignments = OrderAssignment.objects.filter(
+        courier=current_user
+    ).select_related("order", "delivery_issue")
+    active_assignments = my_assignments.exclude(order__status="completed").order_by(
         "-updated_at"
     )
+    history_page = keyset_paginate(
+        my_assignments.filter(order__status="completed"),
+        "updated_at",
+        request.GET.get("history_after"),
+        HISTORY_PAGE_SIZE,
+        descending=True,
+    )
 
     context = {
-        "pending_orders": available_orders,  # Keep the template variable name for now
-        "my_assignments": my_assignments,
+        "pending_orders": available_page.items,  # Keep the template variable name for now
+        "next_cursor": available_page.next_cursor,
+        "is_first_page": not request.GET.get("after"),
+        "open_batches": batches_page.items,
+        "batches_next_cursor": batches_page.next_cursor,
+        "my_assignments": active_assignments,
+        "completed_assignments": history_page.items,
+        "history_next_cursor": history_page.next_cursor,
+        "is_first_history_page": not request.GET.get("history_after"),
     }
     return render(request, "courier/deliveries.html", context)
 
@@ -51,13 +89,11 @@ def deliveries_page(request):
 @allowed_roles(["courier"])
 def accept_order(request, order_id):
     """
-    Handles accepting an order. Creates an OrderAssignment for the order
-    and updates its status to 'shipped'.
+    Handles accepting an order. Atomically claims the order for the courier,
+    creating an OrderAssignment and updating its status to 'shipped'. If another
+    courier claimed it first, the courier is told the order is no longer available.
+    Connected couriers are told the order has been claimed.
     """
-    order = get_object_or_404(
-        Order, id=order_id, status="ready_to_ship", order_assignment__isnull=True
-    )
-
     # Retrieve a proper User instance using the email from request.user
     try:
         user_email = request.user.email
@@ -65,9 +101,41 @@ def accept_order(request, order_id):
         user_email = request.user  # Fallback if request.user is a string
     current_user = get_object_or_404(User, email=user_email)
 
-    OrderAssignment.objects.create(order=order, courier=current_user)
-    order.status = "shipped"
-    order.save()
+    if request.method != "POST":
+        return redirect(reverse("courier-deliveries"))
+
+    if claim_order(order_id, current_user) is None:
+        messages.info(request, "Sorry, this order is no longer available.")
+    else:
+        publish_on_commit(ORDER_CLAIMED, {"order_id": order_id})
+    return redirect(reverse("courier-deliveries"))
+
+
+@login_required
+@allowed_roles(["courier"])
+def accept_batch(request, batch_id):
+    """
+    Handles claiming a whole delivery batch. Atomically assigns every order still
+    in the batch to the courier, or tells them another courier got there first.
+    """
+    try:
+        user_email = request.user.email
+    except AttributeError:
+        user_email = request.user  # Fallback if request.user is a string
+    current_user = get_object_or_404(User, email=user_email)
+
+    if request.method != "POST":
+        return redirect(reverse("courier-deliveries"))
+
+    claimed = claim_batch(batch_id, current_user)
+    if claimed is None:
+        messages.info(request, "Sorry, this batch is no longer available.")
+    else:
+        for order_id in claimed:
+            publish_on_commit(ORDER_CLAIMED, {"order_id": order_id})
+        messages.success(
+            request, f"Batch accepted: {len(claimed)} orders assigned to you."
+        )
     return redirect(reverse("courier-deliveries"))
 
 
@@ -77,7 +145,8 @@ def update_assignment(request, assignment_id):
     """
     Handles updating an existing assignment.
     If the action is 'unaccept', it deletes the assignment and sets the order status to 'ready_to_ship'.
-    If the action is 'complete', it updates the order status to 'completed'.
+    If the action is 'complete', it updates the order status to 'completed' if it
+    is still shipped.
     """
     # Retrieve a proper User instance using request.user.email, similar to the buyer view
     try:
@@ -96,12 +165,18 @@ def update_assignment(request, assignment_id):
         action = request.POST.get("action")
         order = assignment.order
         if action == "unaccept":
-            assignment.delete()
-            order.status = "ready_to_ship"
-            order.save()
+            if release_order(assignment):
+                publish_on_commit(ORDER_AVAILABLE, order_event_data(order))
         elif action == "complete":
-            order.status = "completed"
-            order.save()
+            # Conditional on the status, so a delivery unaccepted meanwhile stays released
+            with transaction.atomic():
+                if Order.objects.filter(pk=order.pk, status="shipped").update(
+                    status="completed"
+                ):
+                    order.status = "completed"
+                    ShopDailySales.record_status_change(order, "shipped", order.status)
+                    # Touch the assignment so the delivery history is ordered by completion
+                    assignment.save(update_fields=["updated_at"])
     return redirect(reverse("courier-deliveries"))
 
 
@@ -0,0 +1,66 @@
+"""
+Live event feed for the courier deliveries page.
+"""
+
+import asyncio
+
+from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+
+from core.utils.decorators import allowed_roles
+from core.utils.events import broker, format_sse
+
+HEARTBEAT_INTERVAL = 15  # seconds
+RECONNECT_DELAY = 5000  # milliseconds, sent to the browser as the SSE retry hint
+
+
+async def _event_stream():
+    """
+    Yields server-sent events for one connected courier until they disconnect.
+
+    A comment line is sent whenever nothing happened for a while so proxies keep
+    the connection open and dead clients are noticed.
+
+    :return: An async generator of encoded SSE messages.
+    :rtype: collections.abc.AsyncIterator[str]
+    """
+    queue = broker.subscribe()
+    try:
+        yield f"retry: {RECONNECT_DELAY}\n\n"
+        while True:
+            try:
+                event, data = await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(event, data)
+    finally:
+        broker.unsubscribe(queue)
+
+
+@login_required
+@allowed_roles(["courier"])
+async def delivery_events(request):
+    """
+    Streams order-available, order-claimed and order-withdrawn events to a courier.
+
+    The view is async, so each open connection is just a suspended coroutine on
+    the ASGI event loop rather than a blocked worker thread. Under WSGI a stream
+    would pin a thread for its whole lifetime, so there the view answers
+    ``204 No Content``, which tells the browser not to reconnect; the
+    deliveries page then simply works without live updates.
+
+    :param request: The HTTP request object.
+    :type request: django.http.HttpRequest
+    :return: A ``text/event-stream`` response, or an empty response under WSGI.
+    :rtype: django.http.StreamingHttpResponse | django.http.HttpResponse
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    response = StreamingHttpResponse(_event_stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx and similar proxies from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import profiles_page, download_profile
+
+urlpatterns = [
+    path("profiles/", profiles_page, name="portal-admin-profiles"),
+    path(
+        "profiles/<str:name>/",
+        download_profile,
+        name="portal-admin-download-profile",
+    ),
+]
@@ -0,0 +1 @@
+from .profiles import profiles_page, download_profile
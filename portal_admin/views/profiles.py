@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+
+from core.utils.profiling import list_profiles, profile_path
+
+
+@staff_member_required
+def profiles_page(request):
+    """
+    Lists the saved request profiles, newest first, for staff to download.
+
+    :param request: The HTTP request object.
+    :type request: django.http.HttpRequest
+    :return: Rendered profiles page.
+    :rtype: django.http.HttpResponse
+    """
+    context = {
+        **admin.site.each_context(request),
+        "title": "Request profiles",
+        "profiles": list_profiles(),
+        "sample_rate": settings.PROFILING_SAMPLE_RATE,
+        "max_files": settings.PROFILING_MAX_FILES,
+    }
+    return render(request, "portal_admin/profiles.html", context)
+
+
+@staff_member_required
+def download_profile(request, name):
+    """
+    Sends a saved request profile as a file download.
+
+    :param request: The HTTP request object.
+    :type request: django.http.HttpRequest
+    :param name: The profile's file name.
+    :type name: str
+    :return: The profile file.
+    :rtype: django.http.FileResponse
+    :raises Http404: If no saved profile has that name.
+    """
+    path = profile_path(name)
+    if path is None:
+        raise Http404("No such profile.")
+    return FileResponse(path.open("rb"), as_attachment=True, filename=name)
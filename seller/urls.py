@@ -6,6 +6,12 @@ from .views.orders import orders_page, mark_order_ready
 urlpatterns = [
     path("book-listings/", book_listings_page, name="seller-book-listings"),
     path("book-listings/add/", add_book_listing, name="seller-add-book"),
+    path("book-listings/import/", import_book_listings, name="seller-import-books"),
+    path(
+        "book-listings/bulk/",
+        bulk_update_book_listings,
+        name="seller-bulk-update-books",
+    ),
     path(
         "book-listings/delete/<int:listing_id>/",
         delete_book_listing,
@@ -19,6 +25,7 @@ urlpatterns = [
     path("profile/", profile_page, name="seller-profile"),
     path("update-shop-name/", update_shop_name, name="update-shop-name"),
     path("orders/", orders_page, name="seller-orders"),
+    path("orders/export/", export_sales_history, name="seller-export-sales"),
     path("orders/<int:order_id>/ready/", mark_order_ready, name="mark-order-ready"),
     path("dashboard/", seller_dashboard, name="seller-dashboard"),
 ]
@@ -1,6 +1,9 @@
 from .dashboard import seller_dashboard
 from .orders import orders_page
+from .export_sales import export_sales_history
 from .book_listings import add_book_listing
 from .book_listings import book_listings_page, delete_book_listing, edit_book_listing
+from .book_listings import bulk_update_book_listings
+from .import_listings import import_book_listings
 from .profile import profile_page
 from .update_shop_name import update_shop_name
@@ -1,13 +1,23 @@
+from decimal import Decimal, InvalidOperation
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.db.models import DecimalField, F, Value
+from django.db.models.functions import Round
 from django.shortcuts import render, redirect, get_object_or_404
+from django.utils import timezone
 import os
 import uuid
 
 from core.constants import CONDITION_CHOICES
 from core.models.book_listing import BookListing
+from core.models.cart import Cart
 from core.models.shop import Shop
 from core.utils.decorators import allowed_roles
+from core.utils.listing_import import clean_price
+
+BULK_ACTIONS = ("set_price", "discount", "set_condition", "delete")
 
 
 def is_valid_image(image):
@@ -26,9 +36,13 @@ def book_listings_page(request):
     """
     Displays all book listings (that are not bought) for the logged-in seller.
     Also avoids duplicating the "No shop found..." message if it was already set.
+    Listings can be narrowed with the ``q`` (title search) and ``condition``
+    query parameters, which the bulk actions form can then target as a whole.
     """
     current_user = request.user
     shop = Shop.objects.filter(user__email=current_user.email).first()
+    search_query = request.GET.get("q", "").strip()
+    condition_filter = request.GET.get("condition", "")
 
     if not shop:
         # Check if "No shop found" was already in the messages queue
@@ -39,15 +53,153 @@ def book_listings_page(request):
             )
         listings = []
     else:
-        listings = BookListing.objects.filter(shop=shop, bought=False)
+        listings = _filter_listings(
+            BookListing.objects.filter(shop=shop, bought=False).select_related("shop"),
+            search_query,
+            condition_filter,
+        )
 
     context = {
         "listings": listings,
         "CONDITION_CHOICES": CONDITION_CHOICES,
+        "search_query": search_query,
+        "condition_filter": condition_filter,
+        "BULK_ACTIONS": BULK_ACTIONS,
     }
     return render(request, "seller/book_listings.html", context)
 
 
+def _filter_listings(listings, search_query, condition):
+    """
+    Narrows a listing queryset by title search and condition.
+
+    :param listings: The queryset to filter.
+    :type listings: django.db.models.QuerySet
+    :param search_query: Case-insensitive title fragment, or an empty string.
+    :type search_query: str
+    :param condition: A condition key from ``CONDITION_CHOICES``, or an empty string.
+    :type condition: str
+    :return: The filtered queryset.
+    :rtype: django.db.models.QuerySet
+    """
+    if search_query:
+        listings = listings.filter(title__icontains=search_query)
+    if condition in dict(CONDITION_CHOICES):
+        listings = listings.filter(condition=condition)
+    return listings
+
+
+def _parse_bulk_value(action, raw_value):
+    """
+    Validates the value submitted with a bulk action.
+
+    :param action: One of ``BULK_ACTIONS``.
+    :type action: str
+    :param raw_value: The raw form value.
+    :type raw_value: str
+    :return: The parsed value (a price, a percentage or a condition key).
+        Prices follow the same rules, and upper bound, as listing imports.
+    :raises ValueError: If the value is not valid for the action.
+    """
+    if action == "set_condition":
+        if raw_value not in dict(CONDITION_CHOICES):
+            raise ValueError("Please choose a valid condition.")
+        return raw_value
+    if action == "set_price":
+        return clean_price(raw_value)
+    if action == "discount":
+        try:
+            value = Decimal(raw_value)
+        except (InvalidOperation, TypeError):
+            raise ValueError("Please enter a valid number.")
+        if not value.is_finite():
+            raise ValueError("Please enter a valid number.")
+        if not 0 < value < 100:
+            raise ValueError("Discount must be between 0 and 100 percent.")
+        return value
+    return None
+
+
+@login_required
+@allowed_roles(["seller"])
+def bulk_update_book_listings(request):
+    """
+    Applies one action to many of the seller's listings with a single statement.
+
+    The target is either the listings ticked on the listings page
+    (``listing_ids``) or, when ``apply_to`` is ``"filter"``, every unsold listing
+    matching the ``q`` and ``condition`` filters. Supported actions are setting a
+    price, applying a percentage discount, changing the condition and deleting.
+    Each runs as one set-based ``UPDATE`` or ``DELETE`` scoped to the seller's
+    shop, and the number of affected listings is reported back.
+
+    :param request: The HTTP request object.
+    :type request: django.http.HttpRequest
+    :return: Redirect back to the listings page.
+    :rtype: django.http.HttpResponse
+    """
+    if request.method != "POST":
+        messages.error(request, "Invalid request.")
+        return redirect("seller-book-listings")
+
+    shop = Shop.objects.filter(user__email=request.user.email).first()
+    if not shop:
+        messages.error(
+            request, "No shop found for this seller. Please set up your shop first."
+        )
+        return redirect("seller-book-listings")
+
+    action = request.POST.get("action")
+    if action not in BULK_ACTIONS:
+        messages.error(request, "Please choose a bulk action.")
+        return redirect("seller-book-listings")
+
+    try:
+        value = _parse_bulk_value(action, request.POST.get("value", "").strip())
+    except ValueError as exc:
+        messages.error(request, str(exc))
+        return redirect("seller-book-listings")
+
+    listings = BookListing.objects.filter(shop=shop, bought=False)
+    if request.POST.get("apply_to") == "filter":
+        listings = _filter_listings(
+            listings,
+            request.POST.get("q", "").strip(),
+            request.POST.get("condition", ""),
+        )
+    else:
+        listing_ids = [i for i in request.POST.getlist("listing_ids") if i.isdigit()]
+        if not listing_ids:
+            messages.error(request, "Please select at least one listing.")
+            return redirect("seller-book-listings")
+        listings = listings.filter(id__in=listing_ids)
+
+    with transaction.atomic():
+        # Prices and availability feed cart totals, so expire quotes of affected carts
+        Cart.bump_versions(cart_items__book_listing__in=listings)
+        # update() skips auto_now, and cached book cards are keyed on updated_at
+        now = timezone.now()
+        if action == "set_price":
+            affected = listings.update(price=value, updated_at=now)
+        elif action == "discount":
+            affected = listings.update(
+                price=Round(
+                    F("price") * Value((100 - value) / 100),
+                    2,
+                    output_field=DecimalField(max_digits=10, decimal_places=2),
+                ),
+                updated_at=now,
+            )
+        elif action == "set_condition":
+            affected = listings.update(condition=value, updated_at=now)
+        else:
+            affected = listings.delete()[1].get(BookListing._meta.label, 0)
+
+    verb = "Deleted" if action == "delete" else "Updated"
+    messages.success(request, f"{verb} {affected} book listings.")
+    return redirect("seller-book-listings")
+
+
 @login_required
 @allowed_roles(["seller"])
 def add_book_listing(request):
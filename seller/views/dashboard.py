@@ -1,8 +1,10 @@
+from decimal import Decimal
+
 from django.contrib.auth.decorators import login_required
-from django.db.models import Sum, F, DecimalField
+from django.db.models import Sum
 from django.shortcuts import render
 from core.models.order import Order
-from core.models.order_item import OrderItem
+from core.models.shop_daily_sales import ShopDailySales
 from core.models.user import User as CustomUser
 
 
@@ -14,40 +16,24 @@ def seller_dashboard(request):
     # Get the custom user model instance for the logged-in user
     custom_user = CustomUser.objects.get(email=request.user.email)
 
-    # Get all order items for the current seller's listings
-    seller_order_items = OrderItem.objects.filter(book_listing__shop__user=custom_user)
-
-    # Get completed order items for revenue calculation
-    completed_order_items = seller_order_items.filter(order__status="completed")
-
-    # Calculate total revenue (80% of sales)
-    total_revenue = (
-        completed_order_items.aggregate(
-            revenue=Sum(
-                F("quantity") * F("purchase_price") * 0.8,
-                output_field=DecimalField(max_digits=10, decimal_places=2),
-            )
-        )["revenue"]
-        or 0
-    )
-
-    # Count total orders (distinct orders containing seller's items)
-    total_orders = seller_order_items.values("order").distinct().count()
-
-    # Count pending orders
-    pending_orders = (
-        seller_order_items.filter(order__status="pending")
-        .values("order")
-        .distinct()
-        .count()
+    # Sum the shop's daily sales rollup rows instead of scanning every order item
+    totals = ShopDailySales.objects.filter(shop__user=custom_user).aggregate(
+        total_orders=Sum("orders"),
+        pending_orders=Sum("pending_orders"),
+        books_sold=Sum("items_sold"),
+        gross_revenue=Sum("revenue"),
     )
 
-    # Count total books sold
-    books_sold = completed_order_items.aggregate(total=Sum("quantity"))["total"] or 0
+    # Total revenue is the seller's 80% share of completed sales
+    total_revenue = (totals["gross_revenue"] or Decimal("0")) * Decimal("0.8")
+    total_orders = totals["total_orders"] or 0
+    pending_orders = totals["pending_orders"] or 0
+    books_sold = totals["books_sold"] or 0
 
     # Get recent orders containing seller's items
     recent_orders = (
         Order.objects.filter(order_items__book_listing__shop__user=custom_user)
+        .select_related("user")
         .distinct()
         .order_by("-placed_at")[:5]
     )
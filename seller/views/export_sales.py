@@ -0,0 +1,141 @@
+import csv
+from datetime import date, datetime, time, timedelta
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import StreamingHttpResponse
+from django.shortcuts import redirect
+from django.utils import timezone
+
+from core.models.order_item import OrderItem
+from core.models.shop import Shop
+from core.utils.decorators import allowed_roles
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_HEADER = [
+    "order_id",
+    "placed_at",
+    "status",
+    "buyer_email",
+    "listing_id",
+    "title",
+    "author",
+    "quantity",
+    "purchase_price",
+    "line_total",
+]
+
+
+class Echo:
+    """
+    File-like object whose ``write`` returns the value instead of storing it.
+
+    Lets :mod:`csv` format one row at a time for a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _parse_date(value):
+    """
+    Parses a ``YYYY-MM-DD`` query parameter.
+
+    :param value: The raw query parameter, possibly empty.
+    :type value: str
+    :return: The parsed date, or ``None`` if the value is empty.
+    :rtype: datetime.date | None
+    :raises ValueError: If the value is not a valid date.
+    """
+    return date.fromisoformat(value) if value else None
+
+
+def _iter_sales_rows(items):
+    """
+    Yields the CSV lines of a sales export, starting with the header.
+
+    :param items: A ``values()`` queryset of the shop's order items.
+    :type items: django.db.models.QuerySet
+    :return: A generator of encoded CSV lines.
+    :rtype: collections.abc.Iterator[str]
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for item in items.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield writer.writerow(
+            [
+                item["order_id"],
+                timezone.localtime(item["order__placed_at"]).isoformat(),
+                item["order__status"],
+                item["order__user__email"],
+                item["book_listing_id"],
+                item["book_listing__title"],
+                item["book_listing__author"],
+                item["quantity"],
+                item["purchase_price"],
+                item["purchase_price"] * item["quantity"],
+            ]
+        )
+
+
+@login_required
+@allowed_roles(["seller"])
+def export_sales_history(request):
+    """
+    Streams the seller's full sales history as a CSV download.
+
+    Rows are read from the database in chunks with ``values()`` projections and
+    written to the response one at a time, so memory use stays flat regardless
+    of how many order items the shop has. Optional ``start`` and ``end`` query
+    parameters (``YYYY-MM-DD``, both inclusive) limit the export by order date.
+
+    :param request: The HTTP request object.
+    :type request: django.http.HttpRequest
+    :return: A streaming CSV response, or a redirect to the orders page on bad input.
+    :rtype: django.http.StreamingHttpResponse | django.http.HttpResponse
+    """
+    shop = Shop.objects.filter(user__email=request.user.email).first()
+    if not shop:
+        messages.error(
+            request, "No shop found for this seller. Please set up your shop first."
+        )
+        return redirect("seller-orders")
+
+    try:
+        start = _parse_date(request.GET.get("start", "").strip())
+        end = _parse_date(request.GET.get("end", "").strip())
+    except ValueError:
+        messages.error(request, "Dates must be in YYYY-MM-DD format.")
+        return redirect("seller-orders")
+
+    items = OrderItem.objects.filter(book_listing__shop=shop)
+    # Compare against timestamps rather than __date, which would cast every placed_at
+    # and keep its index from serving the range.
+    # The first and last calendar days exclude nothing, and their bounds cannot be
+    # converted to UTC, so they are left out.
+    if start and start > date.min:
+        items = items.filter(
+            order__placed_at__gte=timezone.make_aware(datetime.combine(start, time.min))
+        )
+    if end and end < date.max:
+        items = items.filter(
+            order__placed_at__lt=timezone.make_aware(
+                datetime.combine(end + timedelta(days=1), time.min)
+            )
+        )
+    items = items.order_by("order__placed_at", "id").values(
+        "order_id",
+        "order__placed_at",
+        "order__status",
+        "order__user__email",
+        "book_listing_id",
+        "book_listing__title",
+        "book_listing__author",
+        "quantity",
+        "purchase_price",
+    )
+
+    filename = f"sales-{shop.id}-{start or 'all'}-{end or 'latest'}.csv"
+    response = StreamingHttpResponse(_iter_sales_rows(items), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,80 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render, redirect
+import uuid
+
+from core.constants import CONDITION_CHOICES
+from core.models.shop import Shop
+from core.utils.decorators import allowed_roles
+from core.utils.listing_import import detect_format, import_listings
+
+
+@login_required
+@allowed_roles(["seller"])
+def import_book_listings(request):
+    """
+    Displays a form for bulk importing book listings from a CSV or JSONL file,
+    optionally with a zip of cover images. On POST, streams the file into the
+    seller's shop and shows how many listings were created and which rows failed.
+
+    :param request: The HTTP request object.
+    :type request: django.http.HttpRequest
+    :return: Rendered import page, including the result of the last import on POST.
+    :rtype: django.http.HttpResponse
+    """
+    current_user = request.user
+    shop = Shop.objects.filter(user__email=current_user.email).first()
+    if not shop:
+        messages.error(
+            request, "No shop found for this seller. Please set up your shop first."
+        )
+        return redirect("seller-book-listings")
+
+    result = None
+    if request.method == "POST":
+        # Verify the form token
+        form_token = request.POST.get("form_token")
+        session_token = request.session.get("import_books_form_token")
+
+        if not form_token or not session_token or form_token != session_token:
+            # Silently ignore duplicate/invalid submissions
+            return redirect("seller-book-listings")
+
+        # Clear the token to prevent reuse
+        request.session.pop("import_books_form_token", None)
+
+        listings_file = request.FILES.get("listings_file")
+        images_file = request.FILES.get("images_file")  # may be None
+        fmt = request.POST.get("format") or detect_format(
+            listings_file.name if listings_file else ""
+        )
+
+        if not listings_file:
+            messages.error(request, "Please choose a CSV or JSONL file to import.")
+        elif fmt not in ("csv", "jsonl"):
+            messages.error(request, "Listings must be a .csv or .jsonl file.")
+        else:
+            try:
+                result = import_listings(shop, listings_file, fmt, images_file)
+            except ValueError as exc:
+                messages.error(request, str(exc))
+            else:
+                if result.created:
+                    messages.success(
+                        request, f"Imported {result.created} book listings."
+                    )
+                if result.error_count:
+                    messages.warning(
+                        request, f"{result.error_count} rows could not be imported."
+                    )
+
+    # Generate a new token for the form
+    form_token = str(uuid.uuid4())
+    request.session["import_books_form_token"] = form_token
+
+    context = {
+        "CONDITION_CHOICES": CONDITION_CHOICES,
+        "form_token": form_token,
+        "result": result,
+    }
+    return render(request, "seller/import_book_listings.html", context)
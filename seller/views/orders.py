@@ -1,55 +1,128 @@
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch
 from django.shortcuts import render, redirect, get_object_or_404
+from core.constants import STATUS_CHOICES
 from core.models.order import Order
 from core.models.order_assignment import OrderAssignment
+from core.models.order_item import OrderItem
 from core.models.shop import Shop
+from core.models.shop_daily_sales import ShopDailySales
+from core.utils.batching import add_to_batch, remove_from_batch
 from core.utils.decorators import allowed_roles
+from core.utils.events import (
+    ORDER_AVAILABLE,
+    ORDER_WITHDRAWN,
+    order_event_data,
+    publish_on_commit,
+)
+
+ORDERS_PER_PAGE = 25
 
 
 @login_required
 @allowed_roles(["seller"])
 def orders_page(request):
-    """Renders a page displaying orders containing books from the current seller's shop."""
+    """
+    Renders a paginated page of orders containing books from the current seller's shop.
+
+    Each order is annotated with whether a courier has accepted it, and only the
+    items belonging to this shop are prefetched, so the page costs a fixed number
+    of queries however many orders it shows.
+
+    :param request: The HTTP request object. Accepts optional ``status`` and
+        ``page`` query parameters.
+    :type request: django.http.HttpRequest
+    :return: Rendered seller orders page.
+    :rtype: django.http.HttpResponse
+    """
     current_user = request.user
     shop = Shop.objects.filter(user__email=current_user.email).first()
+    status = request.GET.get("status", "")
+    if status not in dict(STATUS_CHOICES):
+        status = ""
 
     if not shop:
-        context = {"orders": [], "assigned_orders": []}
+        context = {
+            "orders": [],
+            "page_obj": None,
+            "status": status,
+            "STATUS_CHOICES": STATUS_CHOICES,
+        }
         return render(request, "seller/orders.html", context)
 
-    # Get orders that have items from this seller's shop
+    shop_items = OrderItem.objects.filter(book_listing__shop=shop)
+
+    # Get orders that have items from this seller's shop, flagging courier-accepted ones
     orders_with_my_books = (
-        Order.objects.filter(order_items__book_listing__shop=shop)
-        .distinct()
-        .order_by("-placed_at")
+        Order.objects.filter(Exists(shop_items.filter(order=OuterRef("pk"))))
+        .annotate(
+            is_assigned=Exists(OrderAssignment.objects.filter(order=OuterRef("pk")))
+        )
+        .select_related("user")
+        .prefetch_related(
+            Prefetch(
+                "order_items",
+                queryset=shop_items.only("id", "order_id", "book_listing_id"),
+                to_attr="shop_items",
+            )
+        )
+        .order_by("-placed_at", "-id")
     )
+    if status:
+        orders_with_my_books = orders_with_my_books.filter(status=status)
 
-    assigned_orders = OrderAssignment.objects.values_list(
-        "order_id", flat=True
-    )  # Get assigned orders
+    page_obj = Paginator(orders_with_my_books, ORDERS_PER_PAGE).get_page(
+        request.GET.get("page")
+    )
 
-    context = {"orders": orders_with_my_books, "assigned_orders": assigned_orders}
+    context = {
+        "orders": page_obj.object_list,
+        "page_obj": page_obj,
+        "status": status,
+        "STATUS_CHOICES": STATUS_CHOICES,
+    }
     return render(request, "seller/orders.html", context)
 
 
 @login_required
 @allowed_roles(["seller"])
 def mark_order_ready(request, order_id):
-    """Toggles order status between 'Pending' and 'Ready to Ship' unless courier accepted it."""
+    """
+    Toggles order status between 'Pending' and 'Ready to Ship' unless courier accepted it.
+    Orders that become ready are grouped into a delivery batch, and leave it when unmarked.
+    Connected couriers are told about the change once it is committed.
+
+    Each toggle is a conditional ``UPDATE`` on the status the page showed, like a
+    courier's claim, so an order claimed in the meantime is left shipped and in
+    its courier's batch. The shop's daily sales rollup is moved along with the
+    status, as :meth:`Order.save` would.
+    """
     if request.method == "POST":
         order = get_object_or_404(Order, id=order_id)
 
-        # Prevent modification if courier has already accepted
-        if OrderAssignment.objects.filter(order=order).exists():
-            return redirect("seller-orders")
-
-        # Toggle logic: 'Pending' → 'Ready to Ship', 'Ready to Ship' → 'Pending'
-        if order.status == "pending":
-            order.status = "ready_to_ship"
-        elif order.status == "ready_to_ship":
-            order.status = "pending"
-
-        order.save()
+        # Toggle logic: 'Pending' → 'Ready to Ship', 'Ready to Ship' → 'Pending'.
+        # Accepted orders are shipped or completed, so neither update matches them.
+        with transaction.atomic():
+            if order.status == "pending":
+                if Order.objects.filter(pk=order.pk, status="pending").update(
+                    status="ready_to_ship"
+                ):
+                    order.status = "ready_to_ship"
+                    ShopDailySales.record_status_change(order, "pending", order.status)
+                    add_to_batch(order)
+                    publish_on_commit(ORDER_AVAILABLE, order_event_data(order))
+            elif order.status == "ready_to_ship":
+                if Order.objects.filter(pk=order.pk, status="ready_to_ship").update(
+                    status="pending"
+                ):
+                    order.status = "pending"
+                    ShopDailySales.record_status_change(
+                        order, "ready_to_ship", order.status
+                    )
+                    remove_from_batch(order)
+                    publish_on_commit(ORDER_WITHDRAWN, {"order_id": order.id})
         return redirect("seller-orders")
 
     return redirect("seller-orders")